@@ -9,6 +9,7 @@ from airport.models import (
     Flight,
     Order,
     Ticket,
+    SeatHold,
 )
 
 
@@ -29,3 +30,9 @@ admin.site.register(Airplane)
 admin.site.register(Crew)
 admin.site.register(Flight)
 admin.site.register(Ticket)
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("flight", "row", "seat", "user", "expires_at")
+    raw_id_fields = ("flight", "user")
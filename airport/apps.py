@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AirportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "airport"
+
+    def ready(self):
+        from airport import signals  # noqa: F401
+        from airport.metrics import instrument_serializers
+
+        instrument_serializers()
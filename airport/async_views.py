@@ -0,0 +1,304 @@
+import functools
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import (
+    JWTStatelessUserAuthentication,
+)
+
+from airport.fast_serializers import (
+    FlightListingValuesSerializer,
+    FlightValuesSerializer,
+    datetime_field,
+)
+from airport.filters import FlightFilter, FlightListingFilter
+from airport.holds import aget_taken_seats
+from airport.models import Crew, Flight, FlightListing
+from airport.pagination import CustomPagination
+from airport.seatmap import (
+    build_seat_bitmap,
+    encode_seat_bitmap,
+    seat_bitmap_etag,
+)
+from airport.serializers import FlightSearchSerializer
+from airport.views import (
+    airport_suggestions,
+    search_itineraries,
+    serialize_itineraries,
+)
+
+jwt_authentication = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]()
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+async def authenticate(request):
+    header = jwt_authentication.get_header(request)
+    raw_token = header and jwt_authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+
+    validated_token = jwt_authentication.get_validated_token(raw_token)
+    if isinstance(jwt_authentication, JWTStatelessUserAuthentication):
+        return jwt_authentication.get_user(validated_token)
+
+    return await sync_to_async(jwt_authentication.get_user)(validated_token)
+
+
+def check_throttles(request, throttle_scope):
+    view = SimpleNamespace(throttle_scope=throttle_scope)
+    durations = [
+        throttle.wait()
+        for throttle in (
+            throttle_class()
+            for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES
+        )
+        if not throttle.allow_request(request, view)
+    ]
+    if durations:
+        raise Throttled(max(durations))
+
+
+def async_read_view(view=None, *, throttle_scope=None):
+    """
+    Run an async read-only endpoint with the API's JWT authentication,
+    ``IsAuthenticated`` semantics, throttles and DRF-style JSON errors.
+    The views render the same bodies as their synchronous counterparts.
+    """
+
+    if view is None:
+        return functools.partial(
+            async_read_view, throttle_scope=throttle_scope
+        )
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return json_response(
+                {"detail": f'Method "{request.method}" not allowed.'},
+                status.HTTP_405_METHOD_NOT_ALLOWED,
+                headers={"Allow": "GET"},
+            )
+
+        try:
+            user = await authenticate(request)
+            if user is None:
+                return json_response(
+                    {
+                        "detail": "Authentication credentials were not "
+                        "provided."
+                    },
+                    status.HTTP_401_UNAUTHORIZED,
+                )
+            request.user = user
+            await sync_to_async(check_throttles, thread_sensitive=False)(
+                request, throttle_scope
+            )
+
+            return await view(request, *args, **kwargs)
+        except ObjectDoesNotExist:
+            return json_response(
+                {"detail": "No Flight matches the given query."},
+                status.HTTP_404_NOT_FOUND,
+            )
+        except APIException as error:
+            headers = None
+            if getattr(error, "wait", None):
+                headers = {"Retry-After": "%d" % error.wait}
+
+            return json_response(error.detail, error.status_code, headers)
+
+    return wrapper
+
+
+@async_read_view
+async def flight_list(request):
+    if settings.FLIGHT_LISTING_READ_MODEL:
+        filterset = FlightListingFilter(
+            request.GET,
+            queryset=FlightListing.objects.with_tickets_available().order_by(
+                "pk"
+            ),
+        )
+        values_serializer_class = FlightListingValuesSerializer
+    else:
+        filterset = FlightFilter(
+            request.GET, queryset=Flight.objects.with_tickets_available()
+        )
+        values_serializer_class = FlightValuesSerializer
+    if not filterset.is_valid():
+        return json_response(filterset.errors, status.HTTP_400_BAD_REQUEST)
+
+    queryset = values_serializer_class.get_queryset(filterset.qs)
+    page_size = CustomPagination().get_page_size(Request(request))
+    count = await queryset.acount()
+    last_page = max(1, -(-count // page_size))
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 0
+    if not 1 <= page <= last_page:
+        return json_response(
+            {"detail": "Invalid page."}, status.HTTP_404_NOT_FOUND
+        )
+
+    url = request.build_absolute_uri()
+    previous_url = None
+    if page == 2:
+        previous_url = remove_query_param(url, "page")
+    elif page > 2:
+        previous_url = replace_query_param(url, "page", page - 1)
+
+    offset = (page - 1) * page_size
+    results = await values_serializer_class().adata(
+        queryset[offset : offset + page_size]
+    )
+
+    return json_response(
+        {
+            "count": count,
+            "next": (
+                replace_query_param(url, "page", page + 1)
+                if page < last_page
+                else None
+            ),
+            "previous": previous_url,
+            "results": results,
+        }
+    )
+
+
+@async_read_view
+async def flight_detail(request, pk):
+    flight = await Flight.objects.values(
+        "id",
+        "route__source__name",
+        "route__source__closest_big_city",
+        "route__destination__name",
+        "route__destination__closest_big_city",
+        "route__distance",
+        "airplane__name",
+        "airplane__airplane_type__name",
+        "departure_time",
+        "arrival_time",
+    ).aget(pk=pk)
+    crew = [
+        crew_member
+        async for crew_member in Crew.objects.filter(flights=pk)
+        .order_by("id")
+        .values("first_name", "last_name")
+    ]
+    taken_seats = await aget_taken_seats(pk)
+
+    return json_response(
+        {
+            "id": flight["id"],
+            "route": {
+                "source": {
+                    "name": flight["route__source__name"],
+                    "closest_big_city": flight[
+                        "route__source__closest_big_city"
+                    ],
+                },
+                "destination": {
+                    "name": flight["route__destination__name"],
+                    "closest_big_city": flight[
+                        "route__destination__closest_big_city"
+                    ],
+                },
+                "distance": flight["route__distance"],
+            },
+            "airplane": {
+                "name": flight["airplane__name"],
+                "airplane_type": flight["airplane__airplane_type__name"],
+            },
+            "departure_time": datetime_field.to_representation(
+                flight["departure_time"]
+            ),
+            "arrival_time": datetime_field.to_representation(
+                flight["arrival_time"]
+            ),
+            "crew": crew,
+            "taken_seats": taken_seats,
+        }
+    )
+
+
+@async_read_view
+async def flight_seatmap(request, pk):
+    airplane = await Flight.objects.values(
+        "airplane__rows", "airplane__seats_in_row"
+    ).aget(pk=pk)
+    rows, seats_in_row = (
+        airplane["airplane__rows"],
+        airplane["airplane__seats_in_row"],
+    )
+    bitmap = build_seat_bitmap(
+        rows,
+        seats_in_row,
+        await aget_taken_seats(pk),
+    )
+    etag = seat_bitmap_etag(pk, bitmap)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        return HttpResponse(
+            status=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    if request.GET.get("encoding") == "binary":
+        return HttpResponse(
+            bitmap,
+            content_type="application/octet-stream",
+            headers={
+                **headers,
+                "X-Seatmap-Rows": rows,
+                "X-Seatmap-Seats-In-Row": seats_in_row,
+            },
+        )
+
+    return json_response(
+        {
+            "flight": pk,
+            "rows": rows,
+            "seats_in_row": seats_in_row,
+            "encoding": "base64",
+            "bitmap": encode_seat_bitmap(bitmap),
+        },
+        headers=headers,
+    )
+
+
+@async_read_view(throttle_scope="search")
+async def flight_search(request):
+    params = FlightSearchSerializer(data=request.GET)
+    params.is_valid(raise_exception=True)
+    params = params.validated_data
+
+    itineraries, flights = await sync_to_async(search_itineraries)(params)
+
+    return json_response(serialize_itineraries(itineraries, flights))
+
+
+@async_read_view(throttle_scope="search")
+async def airport_autocomplete(request):
+    return json_response(
+        [airport async for airport in airport_suggestions(request.GET)]
+    )
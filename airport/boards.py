@@ -0,0 +1,124 @@
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from airport.cache import get_response_cache
+from airport.fast_serializers import datetime_field
+from airport.models import Airport, FlightListing
+
+# kind: (airport column, time column, other airport key, its column)
+BOARDS = {
+    "departures": (
+        "source_id",
+        "departure_time",
+        "destination",
+        "destination_name",
+    ),
+    "arrivals": ("destination_id", "arrival_time", "source", "source_name"),
+}
+
+
+def board_resource(airport_id: int) -> str:
+    return f"board:{airport_id}"
+
+
+def invalidate_boards(airport_ids):
+    """Drop the cached boards of ``airport_ids`` once the write commits."""
+
+    resources = [board_resource(airport_id) for airport_id in airport_ids]
+    if resources:
+        transaction.on_commit(
+            lambda: get_response_cache().invalidate(*resources)
+        )
+
+
+def get_time_bucket(now=None) -> tuple[datetime, int]:
+    """Return the start of the current bucket and the seconds left in it."""
+
+    bucket_seconds = settings.AIRPORT_BOARDS["BUCKET_SECONDS"]
+    timestamp = (now or timezone.now()).timestamp()
+    offset = timestamp % bucket_seconds
+    start = datetime.fromtimestamp(timestamp - offset, tz=dt_timezone.utc)
+
+    return start, max(1, int(bucket_seconds - offset))
+
+
+def build_board(airport_id: int, kind: str, start, end) -> list[dict]:
+    airport_field, time_field, other_key, other_field = BOARDS[kind]
+    rows = (
+        FlightListing.objects.filter(
+            **{
+                airport_field: airport_id,
+                f"{time_field}__gte": start,
+                f"{time_field}__lt": end,
+            }
+        )
+        .order_by(time_field, "pk")
+        .values_list(
+            "flight_id",
+            other_field,
+            "airplane",
+            "departure_time",
+            "arrival_time",
+        )
+    )
+
+    return [
+        {
+            "id": flight_id,
+            other_key: other_airport,
+            "airplane": airplane,
+            "departure_time": datetime_field.to_representation(departure),
+            "arrival_time": datetime_field.to_representation(arrival),
+        }
+        for flight_id, other_airport, airplane, departure, arrival in rows
+    ]
+
+
+def get_board(airport_id: int, kind: str, hours: int):
+    """
+    Return ``(entry, hit)`` for the ``kind`` board of ``airport_id``
+    covering ``hours`` from the start of the current time bucket, or
+    ``(None, False)`` for an unknown airport.
+
+    Every request within a bucket gets the same board, so it is built
+    once per bucket and served from the response cache afterwards. The
+    entry is keyed by the airport's board version too, which writes to
+    its flights bump. ``entry["digest"]`` identifies the board content.
+    """
+
+    response_cache = get_response_cache()
+    start, expires_in = get_time_bucket()
+    version = response_cache.backend.get_version(board_resource(airport_id))
+    key = (
+        f"board:{airport_id}:{version}:{kind}:{hours}:"
+        f"{int(start.timestamp())}"
+    )
+
+    entry = response_cache.get("boards", key)
+    if entry is not None:
+        return entry, True
+
+    if not Airport.objects.filter(pk=airport_id).exists():
+        return None, False
+
+    end = start + timedelta(hours=hours)
+    board = {
+        "airport": airport_id,
+        "from": datetime_field.to_representation(start),
+        "to": datetime_field.to_representation(end),
+        "flights": build_board(airport_id, kind, start, end),
+    }
+    entry = {
+        "board": board,
+        "digest": hashlib.blake2b(
+            JSONRenderer().render(board), digest_size=8
+        ).hexdigest(),
+    }
+    response_cache.set(key, entry, timeout=expires_in)
+
+    return entry, False
@@ -0,0 +1,106 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from airport.exceptions import SeatsTaken
+from airport.holds import active_holds, find_held_seats
+from airport.models import Flight, Order, SeatHold, Ticket
+
+
+def find_taken_seats(seats: set[tuple[int, int, int]]) -> set:
+    flight_ids = {flight_id for flight_id, _, _ in seats}
+    rows = {row for _, row, _ in seats}
+
+    booked = Ticket.objects.filter(
+        flight_id__in=flight_ids, row__in=rows
+    ).values_list("flight_id", "row", "seat")
+
+    return seats.intersection(booked)
+
+
+def book_tickets(order: Order, tickets: list[dict]) -> list[Ticket]:
+    """
+    Book ``tickets`` for ``order`` or raise ``SeatsTaken``.
+
+    Seats the order's user holds are converted into tickets and their
+    holds deleted; they need no flight lock because nobody else can hold
+    or book them. Flights with seats booked without a hold are locked to
+    serialize those bookings, and seats held by other users count as
+    taken. The ``tickets_sold`` counters are bumped last, as their rows
+    stay locked until commit and every booking of the flight waits on
+    them.
+    """
+
+    seats = {
+        (ticket["flight_id"], ticket["row"], ticket["seat"])
+        for ticket in tickets
+    }
+    seats_per_flight = Counter(flight_id for flight_id, _, _ in seats)
+
+    with transaction.atomic():
+        holds = {
+            (flight_id, row, seat): hold_id
+            for hold_id, flight_id, row, seat in active_holds()
+            .select_for_update()
+            .filter(user_id=order.user_id, flight_id__in=seats_per_flight)
+            .order_by("id")
+            .values_list("id", "flight_id", "row", "seat")
+            if (flight_id, row, seat) in seats
+        }
+        unheld_seats = seats.difference(holds)
+
+        if unheld_seats:
+            list(
+                Flight.objects.select_for_update()
+                .filter(id__in={flight_id for flight_id, _, _ in unheld_seats})
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+
+            taken_seats = find_taken_seats(unheld_seats) | find_held_seats(
+                unheld_seats, order.user_id
+            )
+            if taken_seats:
+                raise SeatsTaken(taken_seats)
+
+        try:
+            with transaction.atomic():
+                created = Ticket.objects.bulk_create(
+                    Ticket(
+                        flight_id=flight_id, row=row, seat=seat, order=order
+                    )
+                    for flight_id, row, seat in sorted(seats)
+                )
+        except IntegrityError:
+            raise SeatsTaken(find_taken_seats(seats))
+
+        if holds:
+            SeatHold.objects.filter(id__in=holds.values()).delete()
+
+        for flight_id, count in seats_per_flight.items():
+            Flight.update_tickets_sold(flight_id, count)
+
+    return created
+
+
+def checkout_holds(user_id: int, flight_id: int | None = None) -> Order:
+    """Book every seat ``user_id`` holds (on ``flight_id``) as one order."""
+
+    holds = active_holds().filter(user_id=user_id)
+    if flight_id is not None:
+        holds = holds.filter(flight_id=flight_id)
+    tickets = [
+        {"flight_id": flight_id, "row": row, "seat": seat}
+        for flight_id, row, seat in holds.values_list(
+            "flight_id", "row", "seat"
+        )
+    ]
+    if not tickets:
+        raise ValidationError("There are no active seat holds to check out.")
+
+    with transaction.atomic():
+        order = Order.objects.create(user_id=user_id)
+        book_tickets(order, tickets)
+
+    return order
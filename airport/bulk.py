@@ -0,0 +1,190 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from airport.cache import get_response_cache
+from airport.listing import (
+    refresh_changed_flight_listings,
+    refresh_flight_listings,
+)
+from airport.models import Crew, Flight
+from airport.route_graph import route_graph
+
+FLIGHT_FIELDS = ("route_id", "airplane_id", "departure_time", "arrival_time")
+CREW_FIELDS = ("first_name", "last_name")
+
+
+def load_flight_crew_ids(flights: list[Flight]):
+    crew_ids = {flight.id: [] for flight in flights}
+    rows = (
+        Flight.crew.through.objects.filter(flight_id__in=crew_ids)
+        .order_by("crew_id")
+        .values_list("flight_id", "crew_id")
+    )
+    for flight_id, crew_id in rows:
+        crew_ids[flight_id].append(crew_id)
+
+    for flight in flights:
+        flight.crew_ids = crew_ids[flight.id]
+
+
+def replace_flight_crew(crew_ids: dict[int, list[int]]):
+    flight_crew = Flight.crew.through
+
+    flight_crew.objects.filter(flight_id__in=crew_ids).delete()
+    flight_crew.objects.bulk_create(
+        [
+            flight_crew(flight_id=flight_id, crew_id=crew_id)
+            for flight_id, flight_crew_ids in crew_ids.items()
+            for crew_id in flight_crew_ids
+        ]
+    )
+
+
+def refresh_flight_projections(flights: list[Flight]):
+    flight_ids = [flight.id for flight in flights]
+    refresh_flight_listings(Flight.objects.filter(id__in=flight_ids))
+    transaction.on_commit(lambda: route_graph.refresh_flights(flight_ids))
+
+
+def create_flights(items: list[dict]) -> list[Flight]:
+    with transaction.atomic():
+        flights = Flight.objects.bulk_create(
+            [
+                Flight(**{field: item[field] for field in FLIGHT_FIELDS})
+                for item in items
+            ]
+        )
+        replace_flight_crew(
+            {
+                flight.id: item.get("crew_ids", [])
+                for flight, item in zip(flights, items)
+            }
+        )
+        refresh_flight_projections(flights)
+
+    for flight, item in zip(flights, items):
+        flight.crew_ids = item.get("crew_ids", [])
+
+    return flights
+
+
+def update_flights(
+    flights_by_id: dict[int, Flight], items: list[dict]
+) -> list[Flight]:
+    """
+    Apply partial updates with one ``bulk_update`` of the changed columns
+    and one delete/insert pair for the replaced crew lists. Neither runs
+    model signals, so ``updated_at``, the flight listings and the route
+    graph are kept up to date here.
+    """
+
+    now = timezone.now()
+    fields = {"updated_at"}
+    crew_ids = {}
+    flights = []
+
+    for item in items:
+        flight = flights_by_id[item["id"]]
+        for field in FLIGHT_FIELDS:
+            if field in item:
+                setattr(flight, field, item[field])
+                fields.add(field)
+        if "crew_ids" in item:
+            crew_ids[flight.id] = item["crew_ids"]
+        flight.updated_at = now
+        flights.append(flight)
+
+    with transaction.atomic():
+        Flight.objects.bulk_update(flights, sorted(fields))
+        if crew_ids:
+            replace_flight_crew(crew_ids)
+        refresh_flight_projections(flights)
+
+    load_flight_crew_ids(flights)
+
+    return flights
+
+
+def invalidate_crews():
+    transaction.on_commit(lambda: get_response_cache().invalidate("crews"))
+
+
+def create_crews(items: list[dict]) -> list[Crew]:
+    with transaction.atomic():
+        crews = Crew.objects.bulk_create(
+            [
+                Crew(**{field: item[field] for field in CREW_FIELDS})
+                for item in items
+            ]
+        )
+        invalidate_crews()
+
+    return crews
+
+
+def update_crews(crews_by_id: dict[int, Crew], items: list[dict]) -> list:
+    now = timezone.now()
+    fields = {"updated_at"}
+    crews = []
+
+    for item in items:
+        crew = crews_by_id[item["id"]]
+        for field in CREW_FIELDS:
+            if field in item:
+                setattr(crew, field, item[field])
+                fields.add(field)
+        crew.updated_at = now
+        crews.append(crew)
+
+    with transaction.atomic():
+        Crew.objects.bulk_update(crews, sorted(fields))
+        if fields & set(CREW_FIELDS):
+            refresh_changed_flight_listings(
+                Flight.objects.filter(crew__in=crews).distinct()
+            )
+        invalidate_crews()
+
+    return crews
+
+
+class BulkWriteMixin:
+    """
+    ``POST`` a list to ``bulk/`` to create objects, ``PATCH`` a list of
+    objects with their ``id`` to partially update them. The whole list is
+    validated by ``bulk_serializer_class`` before anything is written.
+    """
+
+    bulk_serializer_class = None
+
+    @action(
+        detail=False,
+        methods=["post", "patch"],
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def bulk(self, request):
+        options = {
+            "data": request.data,
+            "many": True,
+            "allow_empty": False,
+            "max_length": settings.BULK_MAX_ITEMS,
+            "context": self.get_serializer_context(),
+        }
+
+        if request.method == "PATCH":
+            serializer = self.bulk_serializer_class(
+                self.get_queryset(), partial=True, **options
+            )
+            response_status = status.HTTP_200_OK
+        else:
+            serializer = self.bulk_serializer_class(**options)
+            response_status = status.HTTP_201_CREATED
+
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=response_status)
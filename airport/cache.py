@@ -0,0 +1,225 @@
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+
+from airport.conditional import is_not_modified, validator_headers
+
+
+class LocMemLRUBackend:
+    """
+    Per-process store bounded to ``MAX_ENTRIES`` with LRU eviction.
+
+    Versions live in the process too unless ``versions_alias`` names a
+    Django cache shared by the workers. Without it, a write only drops
+    the entries of the worker that handled it, and the others serve
+    stale responses until they time out. Shared versions are random
+    tokens rather than counters, so a version evicted from the shared
+    cache never comes back as one an old entry was stored under.
+    """
+
+    def __init__(self, max_entries=1024, versions_alias=None):
+        self.max_entries = max_entries
+        self.versions = caches[versions_alias] if versions_alias else None
+        self._entries = OrderedDict()
+        self._versions = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, resource):
+        if self.versions is not None:
+            return self.versions.get_or_set(
+                f"response-version:{resource}", lambda: uuid.uuid4().hex, None
+            )
+
+        return self._versions[resource]
+
+    def bump_version(self, resource):
+        if self.versions is not None:
+            self.versions.set(
+                f"response-version:{resource}", uuid.uuid4().hex, None
+            )
+            return
+
+        with self._lock:
+            self._versions[resource] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class DjangoCacheBackend:
+    """
+    Store entries in a configured Django cache, e.g. Redis.
+
+    Versions are shared between workers and bumped with the backend's
+    atomic ``incr``; eviction is left to the cache server.
+    """
+
+    def __init__(self, alias="default"):
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+    def get_version(self, resource):
+        return self.cache.get_or_set(f"response-version:{resource}", 0, None)
+
+    def bump_version(self, resource):
+        key = f"response-version:{resource}"
+        self.cache.add(key, 0, None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, None)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class ResponseCache:
+    def __init__(self, backend, timeout=300):
+        self.backend = backend
+        self.timeout = timeout
+        self.hits = Counter()
+        self.misses = Counter()
+        self._stats_lock = threading.Lock()
+
+    def make_key(self, resource, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        version = self.backend.get_version(resource)
+        url = request.build_absolute_uri(request.path)
+        return f"response:{resource}:{version}:{url}?{query}"
+
+    def get(self, resource, key):
+        data = self.backend.get(key)
+
+        with self._stats_lock:
+            if data is None:
+                self.misses[resource] += 1
+            else:
+                self.hits[resource] += 1
+
+        return data
+
+    def set(self, key, data, timeout=None):
+        self.backend.set(key, data, timeout or self.timeout)
+
+    def invalidate(self, *resources):
+        for resource in resources:
+            self.backend.bump_version(resource)
+
+    def stats(self):
+        """Hit and miss counts of this worker process."""
+
+        with self._stats_lock:
+            return {
+                resource: {
+                    "hits": self.hits[resource],
+                    "misses": self.misses[resource],
+                }
+                for resource in sorted(set(self.hits) | set(self.misses))
+            }
+
+    def clear(self):
+        self.backend.clear()
+        with self._stats_lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    global _response_cache
+
+    if _response_cache is None:
+        config = settings.RESPONSE_CACHE
+        backend = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+        _response_cache = ResponseCache(backend, config.get("TIMEOUT", 300))
+
+    return _response_cache
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list`` and ``retrieve`` from the response cache.
+
+    Entries are keyed by ``cache_resource``, its current version, the
+    URL and the sorted query string; bumping the version from model
+    signals invalidates every cached response of the resource at once.
+    Put it before ``ConditionalGetMixin``: the validators are cached with
+    the body, so a hit answers 200 or 304 without touching the database.
+    """
+
+    cache_resource = None
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        response_cache = get_response_cache()
+        key = response_cache.make_key(self.cache_resource, request)
+        entry = response_cache.get(self.cache_resource, key)
+
+        if entry is not None:
+            headers = {"X-Cache": "HIT"}
+            if entry["validators"] is not None:
+                headers.update(validator_headers(*entry["validators"]))
+                if is_not_modified(request, *entry["validators"]):
+                    return Response(
+                        status=status.HTTP_304_NOT_MODIFIED, headers=headers
+                    )
+
+            return Response(entry["data"], headers=headers)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(
+                key,
+                {
+                    "data": response.data,
+                    "validators": getattr(response, "validators", None),
+                },
+            )
+        response["X-Cache"] = "MISS"
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,142 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def validator_headers(etag, last_modified) -> dict:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+    return headers
+
+
+def is_not_modified(request, etag, last_modified) -> bool:
+    headers = request.headers
+
+    if "If-None-Match" in headers:
+        client_etags = {
+            client_etag.removeprefix("W/")
+            for client_etag in parse_etags(headers["If-None-Match"])
+        }
+        return "*" in client_etags or etag.removeprefix("W/") in client_etags
+
+    if last_modified is not None and "If-Modified-Since" in headers:
+        if_modified_since = parse_http_date_safe(headers["If-Modified-Since"])
+        return (
+            if_modified_since is not None
+            and int(last_modified.timestamp()) <= if_modified_since
+        )
+
+    return False
+
+
+class ConditionalGetMixin:
+    """
+    Answer ``list`` and ``retrieve`` with ETag and Last-Modified.
+
+    Validators come from one aggregate over the filtered queryset: the
+    latest of ``last_modified_fields`` and the row count. They should be
+    columns of the queryset's own table or of rows it points to, never
+    of to-many relations, so the aggregate stays as cheap as the count.
+    Timestamps of to-many rows the body includes are returned by
+    ``get_related_last_modified`` from queries of their own. State that
+    changes without touching those columns, such as seat holds lapsing,
+    goes into the ETag through ``get_extra_validators``; Last-Modified
+    cannot express it and is left out then. The body is only serialized
+    when the client's copy is stale; otherwise 304 is returned straight
+    away.
+    """
+
+    last_modified_fields = ("updated_at",)
+
+    def get_extra_validators(self) -> tuple:
+        return ()
+
+    def get_related_last_modified(self, queryset) -> tuple:
+        return ()
+
+    def get_validators(self, queryset):
+        aggregates = queryset.order_by().aggregate(
+            count=Count("pk"),
+            **{
+                f"modified_{index}": Max(field)
+                for index, field in enumerate(self.last_modified_fields)
+            },
+        )
+        related_last_modified = self.get_related_last_modified(queryset)
+        extra_validators = self.get_extra_validators()
+        timestamps = [
+            timestamp
+            for name, timestamp in aggregates.items()
+            if name.startswith("modified_") and timestamp is not None
+        ]
+        timestamps += [
+            timestamp
+            for timestamp in related_last_modified
+            if timestamp is not None
+        ]
+        last_modified = (
+            max(timestamps) if timestamps and not extra_validators else None
+        )
+
+        fingerprint = "|".join(
+            [
+                self.request.accepted_renderer.format,
+                *(str(value) for value in aggregates.values()),
+                *(str(value) for value in related_last_modified),
+                *(str(value) for value in extra_validators),
+            ]
+        )
+        etag = hashlib.blake2b(fingerprint.encode(), digest_size=8)
+
+        return f'W/"{etag.hexdigest()}"', last_modified
+
+    def is_not_modified(self, etag, last_modified):
+        return is_not_modified(self.request, etag, last_modified)
+
+    def conditional_response(
+        self, queryset, handler, request, *args, **kwargs
+    ):
+        etag, last_modified = self.get_validators(queryset)
+        headers = validator_headers(etag, last_modified)
+
+        if self.is_not_modified(etag, last_modified):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+            response.validators = (etag, last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.filter_queryset(self.get_queryset()),
+            super().list,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            return super().retrieve(request, *args, **kwargs)
+
+        return self.conditional_response(
+            queryset, super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,122 @@
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+from airport.fast_serializers import datetime_field
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+FLIGHT_EXPORT_COLUMNS = {
+    "id": "id",
+    "source": "route__source__name",
+    "destination": "route__destination__name",
+    "airplane": "airplane__name",
+    "airplane_type": "airplane__airplane_type__name",
+    "departure_time": "departure_time",
+    "arrival_time": "arrival_time",
+    "tickets_available": "tickets_available",
+}
+MANIFEST_EXPORT_COLUMNS = {
+    "row": "row",
+    "seat": "seat",
+    "order": "order_id",
+    "passenger": "order__user__email",
+    "booked_at": "order__created_at",
+}
+
+
+class Echo:
+    """File-like object handing each written CSV line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def get_export_output(request):
+    output = request.query_params.get("output", "ndjson")
+    if output not in EXPORT_CONTENT_TYPES:
+        raise ValidationError(
+            {"output": f"Choose one of: {', '.join(EXPORT_CONTENT_TYPES)}."}
+        )
+
+    return output
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return datetime_field.to_representation(value)
+
+    return value
+
+
+def iterate_rows(queryset, columns):
+    """
+    Yield one dict per row, fetched with a server-side cursor in chunks of
+    ``EXPORT_CHUNK_SIZE`` rows so memory use does not grow with the export.
+    """
+
+    rows = queryset.values_list(*columns.values()).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+    for row in rows:
+        yield {name: export_value(value) for name, value in zip(columns, row)}
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def csv_lines(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+async def aiterate_chunks(lines):
+    """
+    Drain the sync ``lines`` in chunks of ``EXPORT_CHUNK_SIZE`` through
+    ``sync_to_async``. Under ASGI, Django serves a sync iterator by reading
+    it into a list first, which would buffer the whole export.
+    """
+
+    next_chunk = sync_to_async(
+        lambda: "".join(islice(lines, settings.EXPORT_CHUNK_SIZE))
+    )
+    try:
+        while chunk := await next_chunk():
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
+
+
+def streaming_export(request, queryset, columns, output, filename):
+    """
+    Stream ``queryset`` as NDJSON or CSV. ``columns`` maps output names to
+    the lookups passed to ``values_list``.
+    """
+
+    rows = iterate_rows(queryset, columns)
+    lines = csv_lines(rows, columns) if output == "csv" else ndjson_lines(rows)
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        lines = aiterate_chunks(lines)
+
+    return StreamingHttpResponse(
+        lines,
+        content_type=EXPORT_CONTENT_TYPES[output],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{output}"'
+            ),
+        },
+    )
@@ -0,0 +1,319 @@
+from collections import defaultdict
+
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from airport.metrics import measure_serialization
+from airport.models import Flight, FlightListing, Ticket
+
+datetime_field = serializers.DateTimeField()
+
+
+def crew_names_queryset(flight_ids):
+    return (
+        Flight.crew.through.objects.filter(flight_id__in=flight_ids)
+        .order_by("crew_id")
+        .values_list("flight_id", "crew__first_name", "crew__last_name")
+    )
+
+
+def get_crew_names(flight_ids):
+    crew_names = defaultdict(list)
+    for flight_id, first_name, last_name in crew_names_queryset(flight_ids):
+        crew_names[flight_id].append(f"{first_name} {last_name}")
+
+    return crew_names
+
+
+async def aget_crew_names(flight_ids):
+    crew_names = defaultdict(list)
+    async for flight_id, first_name, last_name in crew_names_queryset(
+        flight_ids
+    ):
+        crew_names[flight_id].append(f"{first_name} {last_name}")
+
+    return crew_names
+
+
+class ValuesSerializer:
+    """
+    Read-only list serializer working on ``.values()`` rows.
+
+    ``values`` names the lookups fetched for each row; ``to_representation``
+    turns a row into the same dict, in the same key order, as the
+    matching model serializer, so the rendered JSON is identical while
+    no model instances or serializer fields are built per row.
+    """
+
+    values = ()
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    @classmethod
+    def get_queryset(cls, queryset):
+        return queryset.prefetch_related(None).values(*cls.values)
+
+    def load_related(self):
+        pass
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    @property
+    def data(self):
+        with measure_serialization():
+            self.load_related()
+            return [self.to_representation(row) for row in self.rows]
+
+    async def aload_related(self):
+        pass
+
+    async def adata(self, queryset):
+        """Fetch ``queryset`` rows with the async ORM and serialize them."""
+
+        self.rows = [row async for row in queryset]
+        await self.aload_related()
+        with measure_serialization():
+            return [self.to_representation(row) for row in self.rows]
+
+
+class RouteValuesSerializer(ValuesSerializer):
+    values = (
+        "id",
+        "source__name",
+        "destination__name",
+        "distance",
+    )
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "source": row["source__name"],
+            "destination": row["destination__name"],
+            "distance": row["distance"],
+        }
+
+
+class FlightValuesSerializer(ValuesSerializer):
+    values = (
+        "id",
+        "route__source__name",
+        "route__destination__name",
+        "airplane__name",
+        "airplane__airplane_type__name",
+        "departure_time",
+        "arrival_time",
+        "tickets_available",
+    )
+
+    def load_related(self):
+        self.crew_names = get_crew_names([row["id"] for row in self.rows])
+
+    async def aload_related(self):
+        self.crew_names = await aget_crew_names(
+            [row["id"] for row in self.rows]
+        )
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "route": f"{row['route__source__name']} - "
+            f"{row['route__destination__name']}",
+            "airplane": f"{row['airplane__name']} "
+            f"{row['airplane__airplane_type__name']}",
+            "departure_time": datetime_field.to_representation(
+                row["departure_time"]
+            ),
+            "arrival_time": datetime_field.to_representation(
+                row["arrival_time"]
+            ),
+            "crew": self.crew_names.get(row["id"], []),
+            "tickets_available": row["tickets_available"],
+        }
+
+
+class FlightListingValuesSerializer(ValuesSerializer):
+    """Render ``FlightListing`` rows, which already hold the crew names."""
+
+    values = (
+        "flight_id",
+        "route",
+        "airplane",
+        "departure_time",
+        "arrival_time",
+        "crew",
+        "tickets_available",
+    )
+
+    def to_representation(self, row):
+        return {
+            "id": row["flight_id"],
+            "route": row["route"],
+            "airplane": row["airplane"],
+            "departure_time": datetime_field.to_representation(
+                row["departure_time"]
+            ),
+            "arrival_time": datetime_field.to_representation(
+                row["arrival_time"]
+            ),
+            "crew": row["crew"],
+            "tickets_available": row["tickets_available"],
+        }
+
+
+class OrderValuesSerializer(ValuesSerializer):
+    values = ("id", "created_at")
+    ticket_values = (
+        "order_id",
+        "row",
+        "seat",
+        "flight_id",
+        "flight__route__source__name",
+        "flight__route__destination__name",
+        "flight__airplane__name",
+        "flight__airplane__airplane_type__name",
+        "flight__departure_time",
+        "flight__arrival_time",
+    )
+
+    def load_related(self):
+        self.tickets = defaultdict(list)
+        tickets = Ticket.objects.filter(
+            order_id__in=[row["id"] for row in self.rows]
+        ).values(*self.ticket_values)
+        for ticket in tickets:
+            self.tickets[ticket["order_id"]].append(ticket)
+
+        self.crew_names = get_crew_names(
+            {
+                ticket["flight_id"]
+                for order_tickets in self.tickets.values()
+                for ticket in order_tickets
+            }
+        )
+
+    def ticket_representation(self, ticket):
+        return {
+            "row": ticket["row"],
+            "seat": ticket["seat"],
+            "flight": {
+                "route": f"{ticket['flight__route__source__name']} - "
+                f"{ticket['flight__route__destination__name']}",
+                "airplane": f"{ticket['flight__airplane__name']} "
+                f"{ticket['flight__airplane__airplane_type__name']}",
+                "departure_time": datetime_field.to_representation(
+                    ticket["flight__departure_time"]
+                ),
+                "arrival_time": datetime_field.to_representation(
+                    ticket["flight__arrival_time"]
+                ),
+                "crew": self.crew_names.get(ticket["flight_id"], []),
+            },
+        }
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "created_at": datetime_field.to_representation(row["created_at"]),
+            "tickets": [
+                self.ticket_representation(ticket)
+                for ticket in self.tickets[row["id"]]
+            ],
+        }
+
+
+class OrderSummaryValuesSerializer(ValuesSerializer):
+    """
+    Order history without the tickets: every figure comes from a
+    correlated subquery on the order's tickets, so a page is a single
+    query however many tickets its orders hold.
+    """
+
+    values = (
+        "id",
+        "created_at",
+        "tickets_count",
+        "flights_count",
+        "first_route",
+        "first_departure_time",
+        "last_arrival_time",
+    )
+
+    @classmethod
+    def get_queryset(cls, queryset):
+        def tickets(aggregate):
+            return Subquery(
+                Ticket.objects.filter(order=OuterRef("pk"))
+                .order_by()
+                .values("order")
+                .annotate(value=aggregate)
+                .values("value")
+            )
+
+        return (
+            queryset.prefetch_related(None)
+            .annotate(
+                tickets_count=tickets(Count("id")),
+                flights_count=tickets(Count("flight", distinct=True)),
+                first_route=Subquery(
+                    FlightListing.objects.filter(
+                        flight__tickets__order=OuterRef("pk")
+                    )
+                    .order_by("departure_time", "pk")
+                    .values("route")[:1]
+                ),
+                first_departure_time=tickets(Min("flight__departure_time")),
+                last_arrival_time=tickets(Max("flight__arrival_time")),
+            )
+            .values(*cls.values)
+        )
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "created_at": datetime_field.to_representation(row["created_at"]),
+            "tickets_count": row["tickets_count"],
+            "flights_count": row["flights_count"],
+            "first_route": row["first_route"],
+            "first_departure_time": datetime_field.to_representation(
+                row["first_departure_time"]
+            ),
+            "last_arrival_time": datetime_field.to_representation(
+                row["last_arrival_time"]
+            ),
+        }
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` through ``values_serializer_class`` when the request
+    asks for it with ``?fast=1``. The response body is the same as the
+    regular one, so ETags stay valid across both modes.
+    """
+
+    values_serializer_class = None
+
+    def uses_values_serializer(self):
+        return self.request.query_params.get("fast") in ("1", "true")
+
+    def get_values_serializer_class(self):
+        return self.values_serializer_class
+
+    def list(self, request, *args, **kwargs):
+        if not self.uses_values_serializer():
+            return super().list(request, *args, **kwargs)
+
+        values_serializer_class = self.get_values_serializer_class()
+        queryset = values_serializer_class.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                values_serializer_class(page).data
+            )
+
+        return Response(values_serializer_class(queryset).data)
@@ -1,6 +1,13 @@
-from django.db.models import F, Count
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Greatest
 from django_filters import rest_framework as filters
-from airport.models import Flight, Airport, Order
+from airport.models import Flight, FlightListing, Airport, Order
+
+
+def supports_trigram_search(queryset):
+    return connections[queryset.db].vendor == "postgresql"
 
 
 class FlightFilter(filters.FilterSet):
@@ -16,6 +23,8 @@ class FlightFilter(filters.FilterSet):
     route__destination = filters.CharFilter(
         field_name="route__destination__name", lookup_expr="icontains"
     )
+    source = filters.NumberFilter(field_name="route__source_id")
+    destination = filters.NumberFilter(field_name="route__destination_id")
     tickets_available = filters.NumberFilter(method="filter_tickets_available")
 
     class Meta:
@@ -25,26 +34,75 @@ class FlightFilter(filters.FilterSet):
             "arrival_time",
             "route__source",
             "route__destination",
+            "source",
+            "destination",
             "tickets_available",
         ]
 
     def filter_tickets_available(self, queryset, name, value):
-        return queryset.annotate(
-            tickets_available=(
-                F("airplane__rows") * F("airplane__seats_in_row")
-                - Count("tickets")
-            )
-        ).filter(tickets_available__gte=value)
+        return queryset.with_tickets_available().filter(
+            tickets_available__gte=value
+        )
+
+
+class FlightListingFilter(filters.FilterSet):
+    """``FlightFilter`` over the flattened ``FlightListing`` columns."""
+
+    departure_time = filters.DateTimeFilter(
+        field_name="departure_time", lookup_expr="gte"
+    )
+    arrival_time = filters.DateTimeFilter(
+        field_name="arrival_time", lookup_expr="lte"
+    )
+    route__source = filters.CharFilter(
+        field_name="source_name", lookup_expr="icontains"
+    )
+    route__destination = filters.CharFilter(
+        field_name="destination_name", lookup_expr="icontains"
+    )
+    source = filters.NumberFilter(field_name="source_id")
+    destination = filters.NumberFilter(field_name="destination_id")
+    tickets_available = filters.NumberFilter(method="filter_tickets_available")
+
+    class Meta:
+        model = FlightListing
+        fields = list(FlightFilter.Meta.fields)
+
+    def filter_tickets_available(self, queryset, name, value):
+        return queryset.with_tickets_available().filter(
+            tickets_available__gte=value
+        )
 
 
 class AirportFilter(filters.FilterSet):
     closest_big_city = filters.CharFilter(lookup_expr="icontains")
     name = filters.CharFilter(lookup_expr="icontains")
     routes = filters.NumberFilter(field_name="routes_from__id")
+    search = filters.CharFilter(method="filter_search")
 
     class Meta:
         model = Airport
-        fields = ["closest_big_city", "name", "routes"]
+        fields = ["closest_big_city", "name", "routes", "search"]
+
+    def filter_search(self, queryset, name, value):
+        if not supports_trigram_search(queryset):
+            return queryset.filter(
+                Q(name__icontains=value) | Q(closest_big_city__icontains=value)
+            )
+
+        return (
+            queryset.filter(
+                Q(name__trigram_word_similar=value)
+                | Q(closest_big_city__trigram_word_similar=value)
+            )
+            .annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(value, "name"),
+                    TrigramWordSimilarity(value, "closest_big_city"),
+                )
+            )
+            .order_by("-similarity", "name")
+        )
 
 
 class OrderFilter(filters.FilterSet):
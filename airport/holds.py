@@ -0,0 +1,155 @@
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Now
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from airport.exceptions import SeatsTaken
+from airport.models import Flight, SeatHold, Ticket
+
+
+def active_holds():
+    return SeatHold.objects.filter(expires_at__gt=Now())
+
+
+def seats_filter(seats: set[tuple[int, int]]) -> Q:
+    return reduce(or_, (Q(row=row, seat=seat) for row, seat in seats))
+
+
+def find_held_seats(seats: set[tuple[int, int, int]], user_id: int) -> set:
+    """Return the ``seats`` actively held by anyone but ``user_id``."""
+
+    flight_ids = {flight_id for flight_id, _, _ in seats}
+    rows = {row for _, row, _ in seats}
+
+    held = (
+        active_holds()
+        .filter(flight_id__in=flight_ids, row__in=rows)
+        .exclude(user_id=user_id)
+        .values_list("flight_id", "row", "seat")
+    )
+
+    return seats.intersection(held)
+
+
+def get_taken_seats(flight_id: int) -> list[tuple[int, int]]:
+    """Sold and actively held seats of a flight, ordered by row and seat."""
+
+    sold = (
+        Ticket.objects.filter(flight_id=flight_id)
+        .order_by()
+        .values_list("row", "seat")
+    )
+    held = (
+        active_holds()
+        .filter(flight_id=flight_id)
+        .order_by()
+        .values_list("row", "seat")
+    )
+
+    return sorted(set(sold).union(held))
+
+
+async def aget_taken_seats(flight_id: int) -> list[tuple[int, int]]:
+    sold = [
+        seat
+        async for seat in Ticket.objects.filter(flight_id=flight_id)
+        .order_by()
+        .values_list("row", "seat")
+    ]
+    held = [
+        seat
+        async for seat in active_holds()
+        .filter(flight_id=flight_id)
+        .order_by()
+        .values_list("row", "seat")
+    ]
+
+    return sorted(set(sold).union(held))
+
+
+def place_holds(
+    user_id: int, flight: Flight, seats: set[tuple[int, int]]
+) -> list:
+    """
+    Hold ``seats`` of ``flight`` for ``user_id`` for ``SEAT_HOLDS["TTL"]``
+    seconds, all or nothing.
+
+    Each held seat is one row guarded by the (flight, row, seat) unique
+    constraint, so concurrent holds on different seats of a flight never
+    wait for each other and competing holds on one seat are decided by
+    the index. Lapsed holds on the seats and the user's own holds (which
+    are renewed) are deleted first.
+    """
+
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.SEAT_HOLDS["TTL"])
+
+    with transaction.atomic():
+        SeatHold.objects.filter(flight=flight).filter(
+            seats_filter(seats)
+        ).filter(Q(expires_at__lte=now) | Q(user_id=user_id)).delete()
+
+        sold_seats = {
+            (flight.id, row, seat)
+            for row, seat in Ticket.objects.filter(flight=flight)
+            .filter(seats_filter(seats))
+            .values_list("row", "seat")
+        }
+        if sold_seats:
+            raise SeatsTaken(sold_seats)
+
+        try:
+            with transaction.atomic():
+                holds = SeatHold.objects.bulk_create(
+                    SeatHold(
+                        flight=flight,
+                        row=row,
+                        seat=seat,
+                        user_id=user_id,
+                        expires_at=expires_at,
+                    )
+                    for row, seat in sorted(seats)
+                )
+        except IntegrityError:
+            raise SeatsTaken(
+                find_held_seats(
+                    {(flight.id, row, seat) for row, seat in seats}, user_id
+                )
+                or {(flight.id, row, seat) for row, seat in seats}
+            )
+
+        held_count = (
+            active_holds().filter(flight=flight, user_id=user_id).count()
+        )
+        if held_count > settings.SEAT_HOLDS["MAX_SEATS"]:
+            raise ValidationError(
+                {
+                    "seats": "You can hold at most "
+                    f"{settings.SEAT_HOLDS['MAX_SEATS']} seats of a flight."
+                }
+            )
+
+    return holds
+
+
+def delete_expired_holds(batch_size: int) -> int:
+    deleted = 0
+
+    while True:
+        ids = list(
+            SeatHold.objects.filter(expires_at__lte=Now())
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+
+        deleted += SeatHold.objects.filter(
+            id__in=ids, expires_at__lte=Now()
+        ).delete()[0]
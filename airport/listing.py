@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Now
+
+from airport.boards import invalidate_boards
+from airport.fast_serializers import get_crew_names
+from airport.models import Flight, FlightListing
+
+LISTING_VALUES = (
+    "id",
+    "route__source_id",
+    "route__destination_id",
+    "route__source__name",
+    "route__destination__name",
+    "airplane__name",
+    "airplane__airplane_type__name",
+    "airplane__rows",
+    "airplane__seats_in_row",
+    "departure_time",
+    "arrival_time",
+    "tickets_sold",
+)
+# tickets_sold is only written on insert. Existing rows are kept in step
+# by Flight.update_tickets_sold; copying the value read here back could
+# overwrite a booking committed in between with a stale count.
+LISTING_UPDATE_FIELDS = [
+    field.name
+    for field in FlightListing._meta.concrete_fields
+    if not field.primary_key and field.name != "tickets_sold"
+]
+
+
+def build_listings(flight_ids) -> list[FlightListing]:
+    rows = Flight.objects.filter(id__in=flight_ids).values(*LISTING_VALUES)
+    crew_names = get_crew_names(flight_ids)
+
+    return [
+        FlightListing(
+            flight_id=row["id"],
+            source_id=row["route__source_id"],
+            destination_id=row["route__destination_id"],
+            source_name=row["route__source__name"],
+            destination_name=row["route__destination__name"],
+            route=f"{row['route__source__name']} - "
+            f"{row['route__destination__name']}",
+            airplane=f"{row['airplane__name']} "
+            f"{row['airplane__airplane_type__name']}",
+            departure_time=row["departure_time"],
+            arrival_time=row["arrival_time"],
+            crew=crew_names.get(row["id"], []),
+            capacity=row["airplane__rows"] * row["airplane__seats_in_row"],
+            tickets_sold=row["tickets_sold"],
+        )
+        for row in rows
+    ]
+
+
+def refresh_flight_listings(flights=None) -> int:
+    """
+    Rebuild the listing rows of ``flights`` (a ``Flight`` queryset, all
+    flights by default) from the source tables, upserting them in chunks
+    of ``EXPORT_CHUNK_SIZE``. Listings of deleted flights go away with
+    them through the cascade. Call it inside the transaction writing the
+    source rows so that readers never see the two disagree. Ticket counts
+    of existing rows are left alone; ``rebuild_flight_counters``
+    recalculates them. The boards of the airports the flights leave from
+    or arrive at, before and after the refresh, are invalidated.
+    """
+
+    if flights is None:
+        flights = Flight.objects.all()
+    flight_ids = list(flights.order_by("id").values_list("id", flat=True))
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    airport_ids = set()
+
+    for offset in range(0, len(flight_ids), chunk_size):
+        chunk = flight_ids[offset : offset + chunk_size]
+        for source_id, destination_id in FlightListing.objects.filter(
+            pk__in=chunk
+        ).values_list("source_id", "destination_id"):
+            airport_ids.update((source_id, destination_id))
+
+        listings = build_listings(chunk)
+        for listing in listings:
+            airport_ids.update((listing.source_id, listing.destination_id))
+
+        FlightListing.objects.bulk_create(
+            listings,
+            update_conflicts=True,
+            unique_fields=["flight"],
+            update_fields=LISTING_UPDATE_FIELDS,
+        )
+
+    invalidate_boards(airport_ids)
+
+    return len(flight_ids)
+
+
+def refresh_changed_flight_listings(flights) -> None:
+    """
+    Rebuild the listings of ``flights`` after a row they copy names from
+    changed. Flights that have not landed are rebuilt in the current
+    transaction. Landed ones, most of a long schedule, are rebuilt once
+    it commits, in a transaction of their own, so the write does not hold
+    its locks while the history is rewritten.
+    """
+
+    refresh_flight_listings(flights.filter(arrival_time__gte=Now()))
+    landed = flights.filter(arrival_time__lt=Now())
+
+    def refresh_landed():
+        with transaction.atomic():
+            refresh_flight_listings(landed)
+
+    transaction.on_commit(refresh_landed)
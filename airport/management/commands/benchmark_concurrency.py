@@ -0,0 +1,149 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management import BaseCommand, CommandError
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("The server closed the connection.")
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+
+    return int(status_line.split()[1]), headers.get("connection") == "close"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server with many concurrent keep-alive clients and "
+        "report throughput and latency percentiles. Run it once against a "
+        "WSGI server and once against an ASGI server (or once against a "
+        "sync and once against an async/ endpoint) to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url",
+            help="For example "
+            "http://localhost:8000/api/v1/airports/async/flights/",
+        )
+        parser.add_argument("--clients", type=int, default=1000)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Requests sent by each client.",
+        )
+        parser.add_argument("--token", help="JWT access token.")
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def build_request(self, url, token):
+        request = (
+            f"GET {url.path or '/'}"
+            f"{'?' + url.query if url.query else ''} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            "Accept: application/json\r\n"
+        )
+        if token:
+            request += f"Authorization: Bearer {token}\r\n"
+
+        return (request + "\r\n").encode("latin-1")
+
+    async def client(self, url, request, requests, timeout, results):
+        port = url.port or 80
+        reader = writer = None
+
+        for _ in range(requests):
+            started = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(url.hostname, port), timeout
+                    )
+                writer.write(request)
+                status, closed = await asyncio.wait_for(
+                    read_response(reader), timeout
+                )
+            except (OSError, asyncio.TimeoutError, ValueError) as error:
+                results["errors"][type(error).__name__] = (
+                    results["errors"].get(type(error).__name__, 0) + 1
+                )
+                closed = True
+            else:
+                results["latencies"].append(time.perf_counter() - started)
+                results["statuses"][status] = (
+                    results["statuses"].get(status, 0) + 1
+                )
+
+            if closed and writer is not None:
+                writer.close()
+                reader = writer = None
+
+        if writer is not None:
+            writer.close()
+
+    async def run(self, url, options):
+        request = self.build_request(url, options["token"])
+        results = {"latencies": [], "statuses": {}, "errors": {}}
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self.client(
+                    url,
+                    request,
+                    options["requests"],
+                    options["timeout"],
+                    results,
+                )
+                for _ in range(options["clients"])
+            )
+        )
+
+        return results, time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http":
+            raise CommandError("Only plain http:// URLs are supported.")
+
+        results, elapsed = asyncio.run(self.run(url, options))
+        latencies = sorted(results["latencies"])
+        if not latencies:
+            raise CommandError(f"Every request failed: {results['errors']}")
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{options['clients']} clients, {len(latencies)} responses in "
+            f"{elapsed:.1f}s: {len(latencies) / elapsed:.0f} req/s"
+        )
+        self.stdout.write(
+            f"latency p50 {percentiles[49] * 1000:.0f} ms  "
+            f"p95 {percentiles[94] * 1000:.0f} ms  "
+            f"p99 {percentiles[98] * 1000:.0f} ms  "
+            f"max {latencies[-1] * 1000:.0f} ms"
+        )
+        self.stdout.write(
+            "statuses "
+            + ", ".join(
+                f"{status}: {count}"
+                for status, count in sorted(results["statuses"].items())
+            )
+        )
+        if results["errors"]:
+            self.stdout.write(
+                self.style.WARNING(f"errors {results['errors']}")
+            )
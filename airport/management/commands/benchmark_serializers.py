@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.core.management import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airport.models import Order
+from airport.views import FlightViewSet, OrderViewSet, RouteViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the regular list serializers of flights, routes and orders "
+        "with their values-based fast path (?fast=1) and the flight list "
+        "with the FlightListing read model: check that both render "
+        "byte-identical JSON and time query, serialization and rendering."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Number of rows serialized per endpoint.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="How many times each serializer is timed.",
+        )
+
+    def get_view(self, viewset_class, user, query=None, **initkwargs):
+        request = Request(APIRequestFactory().get("/", query))
+        request.user = user
+
+        return viewset_class(
+            request=request,
+            action="list",
+            format_kwarg=None,
+            kwargs={},
+            **initkwargs,
+        )
+
+    def render_regular(self, view, rows):
+        queryset = view.get_queryset().order_by("pk")[:rows]
+        serializer = view.get_serializer_class()(queryset, many=True)
+
+        return JSONRenderer().render(serializer.data)
+
+    def render_fast(self, view, rows):
+        serializer_class = view.get_values_serializer_class()
+        queryset = serializer_class.get_queryset(
+            view.get_queryset().order_by("pk")[:rows]
+        )
+
+        return JSONRenderer().render(serializer_class(queryset).data)
+
+    def measure(self, render, view, rows, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = render(view, rows)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        return content, statistics.median(timings)
+
+    def handle(self, *args, **options):
+        order = Order.objects.order_by("id").select_related("user").first()
+        if order is None:
+            raise CommandError(
+                "No orders found; run seed_benchmark_data first."
+            )
+
+        flights = {"use_flight_listing": False}
+        orders = {"query": {"expand": "tickets"}}
+        for name, viewset_class, regular_kwargs, fast_kwargs in (
+            ("flights", FlightViewSet, flights, flights),
+            ("listings", FlightViewSet, flights, {"use_flight_listing": True}),
+            ("routes", RouteViewSet, {}, {}),
+            ("orders", OrderViewSet, orders, orders),
+        ):
+            regular, regular_ms = self.measure(
+                self.render_regular,
+                self.get_view(viewset_class, order.user, **regular_kwargs),
+                options["rows"],
+                options["repeat"],
+            )
+            fast, fast_ms = self.measure(
+                self.render_fast,
+                self.get_view(viewset_class, order.user, **fast_kwargs),
+                options["rows"],
+                options["repeat"],
+            )
+
+            if regular != fast:
+                raise CommandError(
+                    f"The fast {name} serializer renders different JSON."
+                )
+
+            self.stdout.write(
+                f"{name:<10}{len(regular) // 1024:>8} KiB  regular "
+                f"{regular_ms:>9.1f} ms  fast {fast_ms:>9.1f} ms  "
+                f"x{regular_ms / fast_ms:.1f}"
+            )
@@ -0,0 +1,216 @@
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from airport.cache import CachedResponseMixin
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.pagination import KeysetPaginationMixin
+from airport.urls import router
+
+# Small enough to seed in a couple of seconds, large enough for pages of 10.
+FIXTURE_OPTIONS = {
+    "airports": 6,
+    "routes_per_airport": 3,
+    "airplanes": 4,
+    "crews": 12,
+    "flights": 40,
+    "users": 3,
+}
+
+
+def bypass_response_cache(self, handler, request, *args, **kwargs):
+    return handler(request, *args, **kwargs)
+
+
+def detail_querysets(user):
+    """
+    The objects whose detail routes are compared, ordered from the fewest
+    to the most related rows the serializers walk.
+    """
+
+    return {
+        "airport": Airport.objects.annotate(related=Count("routes_from")),
+        "route": Route.objects.annotate(related=Count("flights")),
+        "airplane-type": AirplaneType.objects.annotate(
+            related=Count("airplanes")
+        ),
+        "airplane": Airplane.objects.annotate(related=Count("flights")),
+        "crew": Crew.objects.annotate(related=Count("flights")),
+        "flight": Flight.objects.annotate(related=Count("crew")),
+        "order": Order.objects.filter(user=user).annotate(
+            related=Count("tickets")
+        ),
+        "ticket": Ticket.objects.filter(order__user=user).annotate(
+            related=Count("flight__crew")
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every GET route of the airport router and fail when the "
+        "number of SQL queries depends on the data (an N+1 regression): "
+        "lists are requested with a small and a large page size, detail "
+        "routes for the objects with the fewest and the most related rows. "
+        "On a database without flights a small dataset is seeded first and "
+        "rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--small",
+            type=int,
+            default=1,
+            help="Page size of the baseline request.",
+        )
+        parser.add_argument(
+            "--large",
+            type=int,
+            default=10,
+            help="Page size compared against the baseline.",
+        )
+
+    def get_clients(self):
+        order = Order.objects.order_by("id").select_related("user").first()
+        if order is None:
+            raise CommandError(
+                "No orders found; run seed_benchmark_data first."
+            )
+        staff_user = (
+            get_user_model().objects.filter(is_staff=True).first()
+            or order.user
+        )
+
+        clients = {}
+        for staff, user in ((False, order.user), (True, staff_user)):
+            clients[staff] = APIClient(SERVER_NAME="localhost")
+            clients[staff].force_authenticate(user)
+
+        return clients, order.user
+
+    def get_checks(self, user, small, large):
+        """
+        Yield ``(name, staff, [(url, params), (url, params)])``: the two
+        requests of each check, which must run the same number of queries.
+        """
+
+        querysets = detail_querysets(user)
+
+        for pattern in router.urls:
+            actions = getattr(pattern.callback, "actions", None)
+            groups = pattern.pattern.regex.groupindex
+            if not actions or "get" not in actions or "format" in groups:
+                continue
+
+            view = pattern.callback
+            staff = IsAdminUser in view.initkwargs.get(
+                "permission_classes", ()
+            )
+
+            if "pk" in groups:
+                basename = pattern.name.rsplit("-", 1)[0]
+                pks = list(
+                    querysets[basename]
+                    .order_by("related", "pk")
+                    .values_list("pk", flat=True)
+                )
+                if len(pks) < 2:
+                    continue
+                yield pattern.name, staff, [
+                    (reverse(f"airports:{pattern.name}", args=[pk]), {})
+                    for pk in (pks[0], pks[-1])
+                ]
+            elif actions["get"] == "list" and view.cls.pagination_class:
+                url = reverse(f"airports:{pattern.name}")
+                variants = [(pattern.name, {})]
+                if issubclass(view.cls, KeysetPaginationMixin):
+                    variants.append(
+                        (f"{pattern.name} (cursor)", {"pagination": "cursor"})
+                    )
+                for name, params in variants:
+                    yield name, staff, [
+                        (url, {**params, "page_size": page_size})
+                        for page_size in (small, large)
+                    ]
+
+    def count_queries(self, client, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+
+        if response.status_code != 200:
+            raise CommandError(f"{url} answered {response.status_code}")
+
+        rows = None
+        if not response.streaming and isinstance(response.data, dict):
+            rows = len(response.data.get("results", ())) or None
+
+        return len(queries), rows
+
+    def run_checks(self, options):
+        clients, user = self.get_clients()
+        failures = []
+
+        for name, staff, requests in self.get_checks(
+            user, options["small"], options["large"]
+        ):
+            (small_queries, small_rows), (large_queries, large_rows) = [
+                self.count_queries(clients[staff], url, params)
+                for url, params in requests
+            ]
+            line = (
+                f"{name:<28}{small_queries:>4} vs {large_queries:>3} queries"
+            )
+            if small_rows is not None:
+                line += f" ({small_rows} vs {large_rows} rows)"
+
+            if large_queries != small_queries:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            elif small_rows is not None and large_rows <= small_rows:
+                self.stdout.write(
+                    self.style.WARNING(f"{line}  (not enough data)")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+
+        return failures
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"]
+        ), mock.patch.object(APIView, "check_throttles"), mock.patch.object(
+            CachedResponseMixin, "cached_response", bypass_response_cache
+        ):
+            if not Flight.objects.exists():
+                call_command(
+                    "seed_benchmark_data", stdout=StringIO(), **FIXTURE_OPTIONS
+                )
+            failures = self.run_checks(options)
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(
+                "Query count depends on the data for: " + ", ".join(failures)
+            )
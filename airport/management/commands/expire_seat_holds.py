@@ -0,0 +1,31 @@
+import time
+
+from django.core.management import BaseCommand
+
+from airport.holds import delete_expired_holds
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired seat holds in batches. Expired holds already stop "
+        "counting as taken seats; sweeping keeps the table small and lets "
+        "flight ETags pick up the freed seats. Run it from cron, or with "
+        "--interval as a long-running process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            help="Keep running and sweep every that many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = delete_expired_holds(options["batch_size"])
+            self.stdout.write(f"Deleted {deleted} expired seat holds.")
+
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
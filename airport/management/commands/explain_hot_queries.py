@@ -0,0 +1,140 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from airport.models import Flight, FlightListing, Order, Route, Ticket
+
+# The indexes added by 0006_hot_query_indexes.
+HOT_QUERY_INDEXES = (
+    "flight_departure_idx",
+    "flight_arrival_idx",
+    "flight_route_departure_idx",
+    "order_user_created_idx",
+    "route_source_destination_idx",
+)
+
+
+@contextmanager
+def without_hot_query_indexes():
+    """
+    Drop ``HOT_QUERY_INDEXES`` for the duration of the block, in a
+    transaction that is rolled back at the end, so they come back
+    unchanged. The dropped indexes' tables stay locked until then.
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name in HOT_QUERY_INDEXES:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+        yield
+        transaction.set_rollback(True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Print query plans and timings of the hot flight, order and ticket "
+        "query shapes. Run it against a seeded database with and without "
+        "--without-indexes to compare index usage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="How many times each query is timed.",
+        )
+        parser.add_argument(
+            "--no-plans",
+            action="store_true",
+            help="Only print timings, without EXPLAIN output.",
+        )
+        parser.add_argument(
+            "--without-indexes",
+            action="store_true",
+            help=(
+                "Drop the indexes of 0006_hot_query_indexes for the run and "
+                "restore them by rolling back. The flight, order and route "
+                "tables are locked meanwhile, so prefer a copy of production."
+            ),
+        )
+
+    def get_queries(self):
+        now = timezone.now()
+        route = Route.objects.order_by("id").first()
+        order = Order.objects.order_by("id").first()
+        first_departure = (
+            Flight.objects.aggregate(first=Min("departure_time"))["first"]
+            or now
+        )
+        table_names = connection.introspection.table_names()
+
+        queries = {
+            "flights departing after": Flight.objects.filter(
+                departure_time__gte=first_departure
+            ).order_by("departure_time", "id")[:20],
+            "flights arriving before": Flight.objects.filter(
+                arrival_time__lte=now
+            ).order_by("-arrival_time")[:20],
+        }
+        if route is not None:
+            queries["flights of a source airport by departure"] = (
+                Flight.objects.filter(
+                    route__source_id=route.source_id,
+                    departure_time__gte=first_departure,
+                ).order_by("departure_time")[:20]
+            )
+            # The read model only exists from migration 0008 on.
+            if FlightListing._meta.db_table in table_names:
+                queries["flight listings of a route by departure"] = (
+                    FlightListing.objects.filter(
+                        source_id=route.source_id,
+                        destination_id=route.destination_id,
+                        departure_time__gte=first_departure,
+                    ).order_by("departure_time")[:20]
+                )
+            queries["route between two airports"] = Route.objects.filter(
+                source_id=route.source_id,
+                destination_id=route.destination_id,
+            )
+        if order is not None:
+            queries["orders of a user since a date"] = Order.objects.filter(
+                user_id=order.user_id, created_at__gte=order.created_at
+            ).order_by("-created_at")[:20]
+            queries["tickets of an order"] = Ticket.objects.filter(
+                order_id=order.id
+            )
+
+        return queries
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+
+        if options["without_indexes"]:
+            with without_hot_query_indexes():
+                self.explain_queries(options)
+        else:
+            self.explain_queries(options)
+
+    def explain_queries(self, options):
+        for name, queryset in self.get_queries().items():
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(name)
+                + f"  median {statistics.median(timings):.2f} ms,"
+                f" max {max(timings):.2f} ms"
+            )
+            if not options["no_plans"]:
+                self.stdout.write(queryset.explain())
+            self.stdout.write("")
@@ -0,0 +1,351 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.cache import get_response_cache
+from airport.listing import refresh_flight_listings
+from airport.models import Airplane, Airport, Crew, Flight, Route
+
+COLUMNS = (
+    "source",
+    "destination",
+    "distance",
+    "airplane",
+    "departure_time",
+    "arrival_time",
+    "crew",
+)
+AMBIGUOUS = object()
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(path, input_format):
+    """
+    Yield the rows of ``path``. An NDJSON line that is not valid JSON is
+    yielded as a ``RowError``, so that it is rejected like any other row
+    instead of ending the import.
+    """
+
+    with open(path, newline="") as input_file:
+        if input_format == "csv":
+            yield from csv.DictReader(input_file)
+        elif input_format == "ndjson":
+            for line in input_file:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as error:
+                    yield RowError(f"Invalid JSON: {error}.")
+        else:
+            try:
+                rows = json.load(input_file)
+            except ValueError as error:
+                raise CommandError(f"{path} is not valid JSON: {error}.")
+            if not isinstance(rows, list):
+                raise CommandError(f"{path} does not hold a JSON list.")
+            yield from rows
+
+
+def parse_time(value, column):
+    value = parse_datetime(str(value or ""))
+    if value is None:
+        raise RowError(f"{column} is not an ISO 8601 datetime.")
+
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+def parse_crew(value):
+    if isinstance(value, list):
+        return value
+
+    return [part for part in str(value or "").split(";") if part.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a flight schedule from CSV, JSON (a list of objects) or "
+        "NDJSON. Each row is one flight with the columns "
+        + ", ".join(COLUMNS)
+        + ". Airports and airplanes are matched by name, crew is a "
+        "semicolon-separated list (or JSON list) of crew ids and missing "
+        "routes are created from `distance`. Flights are loaded with COPY "
+        "on PostgreSQL and bulk_create elsewhere, one transaction per "
+        "batch; rejected rows are written to an error file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--input-format",
+            choices=["csv", "json", "ndjson"],
+            help="Defaults to the file extension.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--errors",
+            type=Path,
+            help="Where rejected rows are written, <path>.errors.csv by "
+            "default.",
+        )
+
+    def load_lookups(self):
+        self.airports = {}
+        for airport_id, name in Airport.objects.values_list("id", "name"):
+            self.airports[name] = (
+                AMBIGUOUS if name in self.airports else airport_id
+            )
+
+        self.airplanes = dict(Airplane.objects.values_list("name", "id"))
+        self.crew_ids = set(Crew.objects.values_list("id", flat=True))
+        self.routes = {}
+        for route_id, source_id, destination_id in Route.objects.order_by(
+            "id"
+        ).values_list("id", "source_id", "destination_id"):
+            self.routes.setdefault((source_id, destination_id), route_id)
+
+    def get_airport_id(self, name, column):
+        airport_id = self.airports.get(name) if isinstance(name, str) else None
+        if airport_id is None:
+            raise RowError(f"Unknown {column} airport {name!r}.")
+        if airport_id is AMBIGUOUS:
+            raise RowError(f"Several airports are named {name!r}.")
+
+        return airport_id
+
+    def parse_row(self, row):
+        if isinstance(row, RowError):
+            raise row
+        if not isinstance(row, dict):
+            raise RowError("The row is not an object.")
+
+        source_id = self.get_airport_id(row.get("source"), "source")
+        destination_id = self.get_airport_id(
+            row.get("destination"), "destination"
+        )
+        if source_id == destination_id:
+            raise RowError("source and destination are the same airport.")
+
+        route_key = (source_id, destination_id)
+        distance = None
+        if route_key not in self.routes and route_key not in self.new_routes:
+            try:
+                distance = int(row.get("distance") or 0)
+            except (TypeError, ValueError):
+                distance = 0
+            if distance <= 0:
+                raise RowError(
+                    "The route does not exist and no positive distance "
+                    "is given to create it."
+                )
+
+        airplane = row.get("airplane")
+        airplane_id = (
+            self.airplanes.get(airplane) if isinstance(airplane, str) else None
+        )
+        if airplane_id is None:
+            raise RowError(f"Unknown airplane {airplane!r}.")
+
+        departure_time = parse_time(row.get("departure_time"), "departure")
+        arrival_time = parse_time(row.get("arrival_time"), "arrival")
+        if arrival_time <= departure_time:
+            raise RowError("arrival_time must be after departure_time.")
+
+        try:
+            crew_ids = list(
+                dict.fromkeys(map(int, parse_crew(row.get("crew"))))
+            )
+        except (TypeError, ValueError):
+            raise RowError("crew must be a list of crew ids.") from None
+        unknown_crew = [
+            crew_id for crew_id in crew_ids if crew_id not in self.crew_ids
+        ]
+        if unknown_crew:
+            raise RowError(f"Unknown crew ids: {unknown_crew}.")
+
+        if distance is not None:
+            self.new_routes[route_key] = distance
+
+        return {
+            "route_key": route_key,
+            "airplane_id": airplane_id,
+            "departure_time": departure_time,
+            "arrival_time": arrival_time,
+            "crew_ids": crew_ids,
+        }
+
+    def create_routes(self):
+        routes = Route.objects.bulk_create(
+            [
+                Route(
+                    source_id=source_id,
+                    destination_id=destination_id,
+                    distance=distance,
+                )
+                for (source_id, destination_id), distance in (
+                    self.new_routes.items()
+                )
+            ]
+        )
+        for route in routes:
+            self.routes[(route.source_id, route.destination_id)] = route.id
+
+        return len(routes)
+
+    def copy_flights(self, flights):
+        now = timezone.now()
+        flight_table = connection.ops.quote_name(Flight._meta.db_table)
+        crew_table = connection.ops.quote_name(
+            Flight.crew.through._meta.db_table
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+                "FROM generate_series(1, %s)",
+                [Flight._meta.db_table, len(flights)],
+            )
+            flight_ids = [flight_id for (flight_id,) in cursor.fetchall()]
+
+            with cursor.copy(
+                f"COPY {flight_table} (id, route_id, airplane_id, "
+                "departure_time, arrival_time, tickets_sold, updated_at) "
+                "FROM STDIN"
+            ) as copy:
+                for flight_id, flight in zip(flight_ids, flights):
+                    copy.write_row(
+                        (
+                            flight_id,
+                            self.routes[flight["route_key"]],
+                            flight["airplane_id"],
+                            flight["departure_time"],
+                            flight["arrival_time"],
+                            0,
+                            now,
+                        )
+                    )
+
+            with cursor.copy(
+                f"COPY {crew_table} (flight_id, crew_id) FROM STDIN"
+            ) as copy:
+                for flight_id, flight in zip(flight_ids, flights):
+                    for crew_id in flight["crew_ids"]:
+                        copy.write_row((flight_id, crew_id))
+
+        return flight_ids
+
+    def bulk_create_flights(self, flights):
+        created = Flight.objects.bulk_create(
+            [
+                Flight(
+                    route_id=self.routes[flight["route_key"]],
+                    airplane_id=flight["airplane_id"],
+                    departure_time=flight["departure_time"],
+                    arrival_time=flight["arrival_time"],
+                )
+                for flight in flights
+            ]
+        )
+
+        flight_crew = Flight.crew.through
+        flight_crew.objects.bulk_create(
+            [
+                flight_crew(flight_id=created_flight.id, crew_id=crew_id)
+                for created_flight, flight in zip(created, flights)
+                for crew_id in flight["crew_ids"]
+            ]
+        )
+
+        return [created_flight.id for created_flight in created]
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+
+        input_format = options["input_format"] or path.suffix.lstrip(".")
+        if input_format not in ("csv", "json", "ndjson"):
+            raise CommandError(
+                "Cannot tell the input format from the extension; "
+                "pass --input-format."
+            )
+        errors_path = options["errors"] or path.with_name(
+            f"{path.name}.errors.csv"
+        )
+
+        self.load_lookups()
+        load_flights = (
+            self.copy_flights
+            if connection.vendor == "postgresql"
+            else self.bulk_create_flights
+        )
+        imported = rejected = routes_created = 0
+        started = time.perf_counter()
+
+        with open(errors_path, "w", newline="") as errors_file:
+            errors = csv.DictWriter(
+                errors_file,
+                fieldnames=["row", *COLUMNS, "error"],
+                extrasaction="ignore",
+            )
+            errors.writeheader()
+            rows = enumerate(read_rows(path, input_format), start=1)
+
+            while batch := list(islice(rows, options["batch_size"])):
+                self.new_routes = {}
+                flights = []
+                for number, row in batch:
+                    try:
+                        flights.append(self.parse_row(row))
+                    except RowError as error:
+                        errors.writerow(
+                            {
+                                **(row if isinstance(row, dict) else {}),
+                                "row": number,
+                                "error": str(error),
+                            }
+                        )
+                        rejected += 1
+
+                with transaction.atomic():
+                    routes_created += self.create_routes()
+                    if flights:
+                        refresh_flight_listings(
+                            Flight.objects.filter(id__in=load_flights(flights))
+                        )
+
+                imported += len(flights)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {imported} flights imported, {rejected} rejected "
+                    f"({imported / elapsed:.0f} rows/s)",
+                    ending="\r",
+                )
+
+        if routes_created:
+            get_response_cache().invalidate("routes")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} flights and created {routes_created} "
+                f"routes in {elapsed:.1f}s ({imported / elapsed:.0f} rows/s)."
+            )
+        )
+        if rejected:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Rejected {rejected} rows, see {errors_path}."
+                )
+            )
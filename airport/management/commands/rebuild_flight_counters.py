@@ -0,0 +1,34 @@
+from django.core.management import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from airport.models import Flight, FlightListing, Ticket
+
+
+def tickets_sold_subquery():
+    return Coalesce(
+        Subquery(
+            Ticket.objects.filter(flight=OuterRef("pk"))
+            .order_by()
+            .values("flight")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate the denormalized tickets_sold counter of flights and "
+        "their listings."
+    )
+
+    def handle(self, *args, **options):
+        updated = Flight.objects.update(tickets_sold=tickets_sold_subquery())
+        FlightListing.objects.update(tickets_sold=tickets_sold_subquery())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt ticket counters for {updated} flights"
+            )
+        )
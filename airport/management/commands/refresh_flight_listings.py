@@ -0,0 +1,35 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from airport.listing import refresh_flight_listings
+from airport.models import Flight
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the flight listing read model from the source tables, "
+        "e.g. after writing flights with raw SQL. Writes through the ORM "
+        "rebuild the listings they affect; those of landed flights right "
+        "after the write commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flight",
+            type=int,
+            action="append",
+            dest="flight_ids",
+            help="Only rebuild this flight's listing; may be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        flights = Flight.objects.all()
+        if options["flight_ids"]:
+            flights = flights.filter(id__in=options["flight_ids"])
+
+        with transaction.atomic():
+            refreshed = refresh_flight_listings(flights)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt listings for {refreshed} flights")
+        )
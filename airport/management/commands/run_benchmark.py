@@ -0,0 +1,508 @@
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import NamedTuple
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from airport.management.commands.seed_benchmark_data import (
+    BENCHMARK_PASSWORD,
+)
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    SeatHold,
+    Ticket,
+)
+from airport.urls import router
+
+DETAIL_MODELS = {
+    "airport": Airport,
+    "route": Route,
+    "airplane-type": AirplaneType,
+    "airplane": Airplane,
+    "crew": Crew,
+    "flight": Flight,
+}
+
+
+BULK_ITEMS = 10
+
+
+class Endpoint(NamedTuple):
+    name: str
+    method: str
+    url: str
+    data: dict | list
+    staff: bool = False
+    headers: dict | None = None
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Exercise the endpoints of the airport and user APIs in-process "
+        "and report query counts, latency percentiles and allocated "
+        "memory per request. Seed data with seed_benchmark_data first; "
+        "the first request to each endpoint is a warm-up and is only used "
+        "to measure memory. Writes are rolled back after each request. "
+        "Left out are the single-object create, update and delete routes "
+        "of the router viewsets, whose bulk and booking counterparts are "
+        "measured, and the schema, admin, metrics and health endpoints "
+        "outside the two APIs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Number of requests sent to each endpoint.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            default=[],
+            help="Only benchmark endpoints whose name contains this value.",
+        )
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Also write the results to this JSON file.",
+        )
+
+    def get_user(self):
+        order = Order.objects.order_by("id").select_related("user").first()
+        if order is None:
+            raise CommandError(
+                "No orders found; run seed_benchmark_data first."
+            )
+
+        return order.user, order
+
+    def get_free_seats(self, count):
+        """Return an upcoming flight and ``count`` of its free seats."""
+
+        flights = (
+            Flight.objects.filter(departure_time__gt=timezone.now())
+            .select_related("airplane")
+            .order_by("id")
+        )
+        for flight in flights.iterator():
+            taken = set(
+                Ticket.objects.filter(flight=flight).values_list("row", "seat")
+            ) | set(
+                SeatHold.objects.filter(flight=flight).values_list(
+                    "row", "seat"
+                )
+            )
+            free = [
+                (row, seat)
+                for row in range(1, flight.airplane.rows + 1)
+                for seat in range(1, flight.airplane.seats_in_row + 1)
+                if (row, seat) not in taken
+            ]
+            if len(free) >= count:
+                return flight, free[:count]
+
+        raise CommandError("No upcoming flight has enough free seats.")
+
+    def get_endpoints(self, user, order, hold):
+        flight = Flight.objects.order_by("id").first()
+        route = Route.objects.order_by("id").first()
+        ticket = Ticket.objects.filter(order=order).first()
+        pks = {
+            **{
+                basename: model.objects.order_by("id")
+                .values_list("id", flat=True)
+                .first()
+                for basename, model in DETAIL_MODELS.items()
+            },
+            "order": order.id,
+            "ticket": ticket.id if ticket else None,
+        }
+        query_params = {
+            "flight-search": {
+                "source": route.source_id,
+                "destination": route.destination_id,
+                "departure_after": flight.departure_time.isoformat(),
+                "max_connections": 1,
+            },
+            "airport-autocomplete": {"q": route.source.name[:2]},
+        }
+
+        endpoints = []
+        for pattern in router.urls:
+            actions = getattr(pattern.callback, "actions", None)
+            permission_classes = pattern.callback.initkwargs.get(
+                "permission_classes", ()
+            )
+            if (
+                not actions
+                or "get" not in actions
+                or "format" in pattern.pattern.regex.groupindex
+            ):
+                continue
+
+            kwargs = {}
+            if "pk" in pattern.pattern.regex.groupindex:
+                basename = pattern.name.rsplit("-", 1)[0]
+                if pks.get(basename) is None:
+                    continue
+                kwargs["pk"] = pks[basename]
+
+            endpoints.append(
+                Endpoint(
+                    pattern.name,
+                    "get",
+                    reverse(f"airports:{pattern.name}", kwargs=kwargs),
+                    query_params.get(pattern.name, {}),
+                    staff=IsAdminUser in permission_classes,
+                )
+            )
+
+        refresh = RefreshToken.for_user(user)
+        bearer = {"Authorization": f"Bearer {refresh.access_token}"}
+        endpoints += [
+            Endpoint(
+                "response-cache-stats",
+                "get",
+                reverse("airports:response-cache-stats"),
+                {},
+                staff=True,
+            ),
+            Endpoint(
+                "async-flight-list",
+                "get",
+                reverse("airports:async-flight-list"),
+                {},
+                headers=bearer,
+            ),
+            Endpoint(
+                "async-flight-detail",
+                "get",
+                reverse("airports:async-flight-detail", args=[pks["flight"]]),
+                {},
+                headers=bearer,
+            ),
+            Endpoint(
+                "async-flight-seatmap",
+                "get",
+                reverse("airports:async-flight-seatmap", args=[pks["flight"]]),
+                {},
+                headers=bearer,
+            ),
+            Endpoint(
+                "async-flight-search",
+                "get",
+                reverse("airports:async-flight-search"),
+                query_params["flight-search"],
+                headers=bearer,
+            ),
+            Endpoint(
+                "async-airport-autocomplete",
+                "get",
+                reverse("airports:async-airport-autocomplete"),
+                query_params["airport-autocomplete"],
+                headers=bearer,
+            ),
+            Endpoint(
+                "user-register",
+                "post",
+                reverse("users:user_create"),
+                {
+                    "email": "benchmark-register@example.com",
+                    "password": BENCHMARK_PASSWORD,
+                },
+            ),
+            Endpoint("user-me", "get", reverse("users:user_me"), {}),
+            Endpoint(
+                "user-me-update",
+                "patch",
+                reverse("users:user_me"),
+                {"email": user.email},
+            ),
+            Endpoint(
+                "user-token",
+                "post",
+                reverse("users:token_obtain_pair"),
+                {"email": user.email, "password": BENCHMARK_PASSWORD},
+            ),
+            Endpoint(
+                "user-token-refresh",
+                "post",
+                reverse("users:token_refresh"),
+                {"refresh": str(refresh)},
+            ),
+            Endpoint(
+                "user-token-verify",
+                "post",
+                reverse("users:token_verify"),
+                {"token": str(refresh.access_token)},
+            ),
+        ]
+
+        return endpoints + self.get_write_endpoints(hold)
+
+    def get_write_endpoints(self, hold):
+        """
+        Booking and bulk endpoints, with payloads built from the seeded
+        data. ``hold`` is the user's hold that checkout and release use;
+        the seats booked and held are free ones of the same flight.
+        """
+
+        flight, seats = self.get_free_seats(2)
+        (order_row, order_seat), (hold_row, hold_seat) = seats
+        flights = list(
+            Flight.objects.filter(departure_time__gt=timezone.now())
+            .order_by("id")
+            .values("id", "route_id", "airplane_id", "departure_time")[
+                :BULK_ITEMS
+            ]
+        )
+        crews = list(
+            Crew.objects.order_by("id").values("id", "first_name")[:BULK_ITEMS]
+        )
+        crew_ids = [crew["id"] for crew in crews[:3]]
+
+        return [
+            Endpoint(
+                "order-create",
+                "post",
+                reverse("airports:order-list"),
+                {
+                    "tickets": [
+                        {
+                            "flight": flight.id,
+                            "row": order_row,
+                            "seat": order_seat,
+                        }
+                    ]
+                },
+            ),
+            Endpoint(
+                "seat-hold-create",
+                "post",
+                reverse("airports:seat-hold-list"),
+                {
+                    "flight": flight.id,
+                    "seats": [{"row": hold_row, "seat": hold_seat}],
+                },
+            ),
+            Endpoint(
+                "seat-hold-checkout",
+                "post",
+                reverse("airports:seat-hold-checkout"),
+                {"flight": hold.flight_id},
+            ),
+            Endpoint(
+                "seat-hold-destroy",
+                "delete",
+                reverse("airports:seat-hold-detail", kwargs={"pk": hold.id}),
+                {},
+            ),
+            Endpoint(
+                "flight-bulk-create",
+                "post",
+                reverse("airports:flight-bulk"),
+                [
+                    {
+                        "route": item["route_id"],
+                        "airplane": item["airplane_id"],
+                        "departure_time": item["departure_time"]
+                        + timedelta(days=1),
+                        "arrival_time": item["departure_time"]
+                        + timedelta(days=1, hours=2),
+                        "crew": crew_ids,
+                    }
+                    for item in flights
+                ],
+                staff=True,
+            ),
+            Endpoint(
+                "flight-bulk-update",
+                "patch",
+                reverse("airports:flight-bulk"),
+                [
+                    {
+                        "id": item["id"],
+                        "departure_time": item["departure_time"],
+                    }
+                    for item in flights
+                ],
+                staff=True,
+            ),
+            Endpoint(
+                "crew-bulk-create",
+                "post",
+                reverse("airports:crew-bulk"),
+                [
+                    {"first_name": "Bench", "last_name": f"Crew {index}"}
+                    for index in range(BULK_ITEMS)
+                ],
+                staff=True,
+            ),
+            Endpoint(
+                "crew-bulk-update",
+                "patch",
+                reverse("airports:crew-bulk"),
+                [
+                    {"id": crew["id"], "first_name": crew["first_name"]}
+                    for crew in crews
+                ],
+                staff=True,
+            ),
+        ]
+
+    def create_hold(self, user):
+        flight, [(row, seat)] = self.get_free_seats(1)
+
+        return SeatHold.objects.create(
+            flight=flight,
+            row=row,
+            seat=seat,
+            user=user,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+
+    def request(self, client, endpoint):
+        """
+        Send ``endpoint``'s request and read streamed bodies to the end,
+        so their queries and rendering are measured too. Writes run in a
+        transaction rolled back afterwards, so every repeat books the same
+        seats and the seeded data stays as it is.
+        """
+
+        writes = endpoint.method != "get"
+        with transaction.atomic() if writes else nullcontext():
+            if writes:
+                response = getattr(client, endpoint.method)(
+                    endpoint.url,
+                    endpoint.data,
+                    format="json",
+                    headers=endpoint.headers,
+                )
+            else:
+                response = client.get(
+                    endpoint.url, endpoint.data, headers=endpoint.headers
+                )
+
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+
+            if writes:
+                transaction.set_rollback(True)
+
+        return response
+
+    def benchmark(self, client, endpoint, repeat):
+        tracemalloc.start()
+        response = self.request(client, endpoint)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{endpoint.name} ({endpoint.url}) answered "
+                f"{response.status_code}"
+            )
+
+        timings, query_counts = [], []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                self.request(client, endpoint)
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(queries))
+
+        return {
+            "endpoint": endpoint.name,
+            "url": endpoint.url,
+            "queries": max(query_counts),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "peak_kib": round(peak_memory / 1024, 1),
+        }
+
+    def handle(self, *args, **options):
+        user, order = self.get_user()
+        staff_user = (
+            user
+            if user.is_staff
+            else get_user_model().objects.filter(is_staff=True).first()
+        )
+        clients = {}
+        for staff, client_user in ((False, user), (True, staff_user)):
+            clients[staff] = APIClient(SERVER_NAME="localhost")
+            clients[staff].force_authenticate(client_user)
+
+        hold = self.create_hold(user)
+        try:
+            endpoints = [
+                endpoint
+                for endpoint in self.get_endpoints(user, order, hold)
+                if (staff_user or not endpoint.staff)
+                and (
+                    not options["endpoint"]
+                    or any(
+                        part in endpoint.name for part in options["endpoint"]
+                    )
+                )
+            ]
+
+            results = []
+            with mock.patch.object(
+                APIView, "check_throttles"
+            ), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"]
+            ):
+                for endpoint in endpoints:
+                    results.append(
+                        self.benchmark(
+                            clients[endpoint.staff],
+                            endpoint,
+                            options["requests"],
+                        )
+                    )
+        finally:
+            hold.delete()
+
+        header = (
+            f"{'endpoint':<28}{'queries':>8}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>10}"
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING(header))
+        for result in results:
+            self.stdout.write(
+                f"{result['endpoint']:<28}{result['queries']:>8}"
+                f"{result['p50_ms']:>10}{result['p95_ms']:>10}"
+                f"{result['p99_ms']:>10}{result['peak_kib']:>10}"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as json_file:
+                json.dump(results, json_file, indent=2)
@@ -0,0 +1,296 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import transaction
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+# fmt: off
+SYLLABLES = (
+    "ka", "ro", "mi", "an", "te", "lo", "vi", "sa", "du", "ne",
+    "po", "ri", "ha", "ze", "bu", "la", "to", "ve", "ni", "co",
+)
+FIRST_NAMES = (
+    "Olena", "Taras", "Maria", "John", "Alice", "Pedro", "Yuki", "Omar",
+    "Ingrid", "Chen", "Amara", "Luca", "Sofia", "Ivan", "Noah", "Lea",
+)
+LAST_NAMES = (
+    "Shevchenko", "Smith", "Garcia", "Tanaka", "Haddad", "Berg", "Wang",
+    "Okafor", "Rossi", "Novak", "Kowalski", "Dubois", "Silva", "Kim",
+)
+# fmt: on
+AIRPLANE_TYPES = (
+    ("Airbus A320", 30, 6),
+    ("Boeing 737", 32, 6),
+    ("Embraer E195", 25, 4),
+    ("Boeing 787", 40, 9),
+    ("Airbus A350", 44, 9),
+)
+BENCHMARK_PASSWORD = "benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Deterministically generate a benchmark dataset of airports, "
+        "routes, airplanes, crews, flights, users, orders and tickets "
+        "using bulk inserts. The same options always produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--airports", type=int, default=100)
+        parser.add_argument("--routes-per-airport", type=int, default=8)
+        parser.add_argument("--airplanes", type=int, default=200)
+        parser.add_argument("--crews", type=int, default=1000)
+        parser.add_argument("--flights", type=int, default=20000)
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument(
+            "--occupancy",
+            type=float,
+            default=0.6,
+            help="Average share of seats sold on a flight.",
+        )
+        parser.add_argument(
+            "--start",
+            type=datetime.date.fromisoformat,
+            default=datetime.date(2030, 1, 1),
+            help="Date of the first departure (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Number of days the flight schedule spans.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if Flight.objects.exists():
+            raise CommandError(
+                "The database already contains flights; "
+                "seed an empty database."
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            airports = self.create_airports(options["airports"])
+            routes = self.create_routes(
+                airports, options["routes_per_airport"]
+            )
+            airplanes = self.create_airplanes(options["airplanes"])
+            crews = self.create_crews(options["crews"])
+            flights = self.create_flights(
+                options["flights"],
+                routes,
+                airplanes,
+                crews,
+                options["start"],
+                options["days"],
+            )
+            users = self.create_users(options["users"])
+
+        tickets = self.create_orders_and_tickets(
+            flights, airplanes, users, options["occupancy"]
+        )
+        call_command("rebuild_flight_counters", stdout=self.stdout)
+        call_command("refresh_flight_listings", stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(airports)} airports, {len(routes)} routes, "
+                f"{len(flights)} flights, {len(users)} users and "
+                f"{tickets} tickets in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def bulk_create(self, model, objects):
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def make_word(self, syllables):
+        return "".join(
+            self.rng.choice(SYLLABLES) for _ in range(syllables)
+        ).capitalize()
+
+    def create_airports(self, count):
+        airports = []
+        for index in range(count):
+            city = f"{self.make_word(3)} {index}"
+            airports.append(
+                Airport(
+                    name=f"{self.make_word(2)} {city} International",
+                    closest_big_city=city,
+                )
+            )
+
+        return self.bulk_create(Airport, airports)
+
+    def create_routes(self, airports, routes_per_airport):
+        routes = []
+        for source in airports:
+            destinations = self.rng.sample(
+                [airport for airport in airports if airport is not source],
+                min(routes_per_airport, len(airports) - 1),
+            )
+            routes.extend(
+                Route(
+                    source=source,
+                    destination=destination,
+                    distance=self.rng.randint(200, 9000),
+                )
+                for destination in destinations
+            )
+
+        return self.bulk_create(Route, routes)
+
+    def create_airplanes(self, count):
+        airplane_types = self.bulk_create(
+            AirplaneType,
+            [AirplaneType(name=name) for name, _, _ in AIRPLANE_TYPES],
+        )
+        airplanes = []
+        for index in range(count):
+            type_index = self.rng.randrange(len(AIRPLANE_TYPES))
+            _, rows, seats_in_row = AIRPLANE_TYPES[type_index]
+            airplanes.append(
+                Airplane(
+                    name=f"UR-{index:05d}",
+                    rows=rows,
+                    seats_in_row=seats_in_row,
+                    airplane_type=airplane_types[type_index],
+                )
+            )
+
+        return self.bulk_create(Airplane, airplanes)
+
+    def create_crews(self, count):
+        return self.bulk_create(
+            Crew,
+            [
+                Crew(
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                )
+                for _ in range(count)
+            ],
+        )
+
+    def create_flights(self, count, routes, airplanes, crews, start, days):
+        first_departure = datetime.datetime.combine(
+            start, datetime.time(), tzinfo=datetime.timezone.utc
+        )
+        flights = []
+        for _ in range(count):
+            route = self.rng.choice(routes)
+            departure_time = first_departure + datetime.timedelta(
+                minutes=self.rng.randrange(days * 24 * 60 // 5) * 5
+            )
+            flights.append(
+                Flight(
+                    route=route,
+                    airplane=self.rng.choice(airplanes),
+                    departure_time=departure_time,
+                    arrival_time=departure_time
+                    + datetime.timedelta(minutes=30 + route.distance // 12),
+                )
+            )
+        flights = self.bulk_create(Flight, flights)
+
+        flight_crew = Flight.crew.through
+        self.bulk_create(
+            flight_crew,
+            [
+                flight_crew(flight_id=flight.id, crew_id=crew.id)
+                for flight in flights
+                for crew in self.rng.sample(crews, min(3, len(crews)))
+            ],
+        )
+
+        return flights
+
+    def create_users(self, count):
+        password = make_password(BENCHMARK_PASSWORD)
+        users = [
+            get_user_model()(
+                email=f"bench-user-{index}@example.com",
+                password=password,
+                is_staff=index == 0,
+            )
+            for index in range(count)
+        ]
+
+        return self.bulk_create(get_user_model(), users)
+
+    def create_orders_and_tickets(self, flights, airplanes, users, occupancy):
+        airplanes = {airplane.id: airplane for airplane in airplanes}
+        tickets_created = 0
+
+        for offset in range(0, len(flights), 500):
+            seats_by_order = []
+            for flight in flights[offset : offset + 500]:
+                airplane = airplanes[flight.airplane_id]
+                capacity = airplane.capacity
+                sold = min(
+                    capacity,
+                    max(0, round(self.rng.gauss(occupancy, 0.2) * capacity)),
+                )
+                seats = sorted(self.rng.sample(range(capacity), sold))
+
+                while seats:
+                    size = self.rng.randint(1, 4)
+                    seats_by_order.append(
+                        (
+                            flight.id,
+                            airplane.seats_in_row,
+                            seats[:size],
+                        )
+                    )
+                    seats = seats[size:]
+
+            with transaction.atomic():
+                orders = self.bulk_create(
+                    Order,
+                    [
+                        Order(user=self.rng.choice(users))
+                        for _ in seats_by_order
+                    ],
+                )
+                tickets = self.bulk_create(
+                    Ticket,
+                    [
+                        Ticket(
+                            flight_id=flight_id,
+                            order_id=order.id,
+                            row=seat // seats_in_row + 1,
+                            seat=seat % seats_in_row + 1,
+                        )
+                        for order, (flight_id, seats_in_row, seats) in zip(
+                            orders, seats_by_order
+                        )
+                        for seat in seats
+                    ],
+                )
+            tickets_created += len(tickets)
+            self.stdout.write(
+                f"  {offset + len(flights[offset : offset + 500])} flights, "
+                f"{tickets_created} tickets",
+                ending="\r",
+            )
+
+        self.stdout.write("")
+        return tickets_created
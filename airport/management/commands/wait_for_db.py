@@ -0,0 +1,79 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.utils import OperationalError
+
+from airport.readiness import pending_migrations, wait_for_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Wait until the database accepts connections, retrying with "
+        "exponential backoff, and fail after --timeout seconds. With "
+        "--migrations also fail while migrations are unapplied."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to keep retrying before giving up.",
+        )
+        parser.add_argument(
+            "--initial-delay",
+            type=float,
+            default=0.05,
+            help="Upper bound of the first backoff sleep, doubled per retry.",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=2,
+            help="Upper bound of any single backoff sleep.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--migrations",
+            action="store_true",
+            help="Also require every migration to be applied.",
+        )
+
+    def report_retry(self, attempt, error, sleep):
+        reason = str(error).strip().splitlines()[0] if str(error) else error
+        self.stdout.write(
+            f"Database unavailable (attempt {attempt}: {reason}), "
+            f"retrying in {sleep:.2f}s..."
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.stdout.write("Waiting for database...")
+
+        try:
+            attempts = wait_for_database(
+                options["timeout"],
+                initial_delay=options["initial_delay"],
+                max_delay=options["max_delay"],
+                alias=options["database"],
+                on_retry=self.report_retry,
+            )
+        except OperationalError as error:
+            raise CommandError(
+                f"Database unavailable after {options['timeout']:g}s: {error}"
+            )
+
+        if options["migrations"]:
+            pending = pending_migrations(options["database"])
+            if pending:
+                raise CommandError(
+                    f"{len(pending)} unapplied migrations, e.g. {pending[0]}."
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Database available after {attempts} attempt(s) in "
+                f"{time.monotonic() - started:.2f}s."
+            )
+        )
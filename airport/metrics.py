@@ -0,0 +1,369 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+from airport.cache import get_response_cache
+
+DURATION_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def format_labels(labels):
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+
+
+class Histogram:
+    def __init__(self, name, description, buckets, label_names):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.setdefault(
+                label_values, [[0] * (len(self.buckets) + 1), 0, 0]
+            )
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            series = sorted(
+                (label_values, list(counts), total, count)
+                for label_values, (counts, total, count) in (
+                    self._series.items()
+                )
+            )
+
+        for label_values, counts, total, count in series:
+            labels = list(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels([*labels, ("le", bound)])
+                lines.append(
+                    f"{self.name}_bucket{{{bucket_labels}}} {cumulative}"
+                )
+
+            bucket_labels = format_labels([*labels, ("le", "+Inf")])
+            lines += [
+                f"{self.name}_bucket{{{bucket_labels}}} {count}",
+                f"{self.name}_sum{{{format_labels(labels)}}} {total}",
+                f"{self.name}_count{{{format_labels(labels)}}} {count}",
+            ]
+
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class RequestMetrics:
+    """
+    In-process histograms of the instrumented requests, labelled by view
+    name and method. Each worker process keeps its own figures.
+    """
+
+    label_names = ("view", "method")
+
+    def __init__(self):
+        self.duration = Histogram(
+            "airport_request_duration_seconds",
+            "Time spent handling a request.",
+            DURATION_BUCKETS,
+            self.label_names,
+        )
+        self.queries = Histogram(
+            "airport_request_db_queries",
+            "Number of SQL queries executed per request.",
+            QUERY_COUNT_BUCKETS,
+            self.label_names,
+        )
+        self.db_duration = Histogram(
+            "airport_request_db_duration_seconds",
+            "Time spent executing SQL queries per request.",
+            DURATION_BUCKETS,
+            self.label_names,
+        )
+        self.serialize_duration = Histogram(
+            "airport_request_serialize_duration_seconds",
+            "Time spent in serializers, excluding their SQL queries.",
+            DURATION_BUCKETS,
+            self.label_names,
+        )
+        self.render_duration = Histogram(
+            "airport_request_render_duration_seconds",
+            "Time spent rendering the response body.",
+            DURATION_BUCKETS,
+            self.label_names,
+        )
+        self.response_size = Histogram(
+            "airport_response_size_bytes",
+            "Size of non-streaming response bodies.",
+            SIZE_BUCKETS,
+            self.label_names,
+        )
+
+    @property
+    def histograms(self):
+        return (
+            self.duration,
+            self.queries,
+            self.db_duration,
+            self.serialize_duration,
+            self.render_duration,
+            self.response_size,
+        )
+
+    def observe(self, view, method, timings, response_size):
+        labels = (view, method)
+
+        self.duration.observe(labels, timings.total)
+        self.queries.observe(labels, timings.query_count)
+        self.db_duration.observe(labels, timings.db)
+        self.serialize_duration.observe(labels, timings.serialize)
+        self.render_duration.observe(labels, timings.render)
+        if response_size is not None:
+            self.response_size.observe(labels, response_size)
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines += histogram.render()
+
+        cache_stats = get_response_cache().stats()
+        for outcome in ("hits", "misses"):
+            name = f"airport_response_cache_{outcome}_total"
+            lines += [
+                f"# HELP {name} Response cache {outcome} per resource.",
+                f"# TYPE {name} counter",
+            ]
+            lines += [
+                f"{name}{{{format_labels([('resource', resource)])}}} "
+                f"{stats[outcome]}"
+                for resource, stats in cache_stats.items()
+            ]
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+
+
+request_metrics = RequestMetrics()
+current_timings = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.query_count = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self._render_started = None
+        self._serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.query_count += 1
+
+    @contextmanager
+    def measure_serialization(self):
+        """
+        Add the time spent in the block, minus its SQL time, to
+        ``serialize``. Nested blocks count once, as part of the outer one.
+        """
+
+        if self._serializing:
+            yield
+            return
+
+        self._serializing = True
+        started, db = time.perf_counter(), self.db
+        try:
+            yield
+        finally:
+            self._serializing = False
+            self.serialize += time.perf_counter() - started - (self.db - db)
+
+    def start_render(self, response):
+        self._render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        if self._render_started is not None:
+            self.render += time.perf_counter() - self._render_started
+            self._render_started = None
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;dur={self.db * 1000:.2f};desc="{self.query_count} '
+                f'queries"',
+                f"serialize;dur={self.serialize * 1000:.2f}",
+                f"render;dur={self.render * 1000:.2f}",
+                f"total;dur={self.total * 1000:.2f}",
+            ]
+        )
+
+
+def measure_serialization():
+    timings = current_timings.get()
+
+    return timings.measure_serialization() if timings else nullcontext()
+
+
+def instrument_serializers():
+    """
+    Time the ``.data`` of DRF serializers, which views evaluate before
+    the response is rendered, as serialization.
+    """
+
+    data = BaseSerializer.data.fget
+    if getattr(data, "instrumented", False):
+        return
+
+    def timed_data(self):
+        with measure_serialization():
+            return data(self)
+
+    timed_data.instrumented = True
+    BaseSerializer.data = property(timed_data)
+
+
+class RequestMetricsMiddleware:
+    """
+    Count SQL queries and time SQL, serialization, rendering and the
+    whole request.
+
+    The figures are sent back in a ``Server-Timing`` header and
+    aggregated into ``request_metrics``, which ``/metrics/`` exposes in
+    the Prometheus text format. Place it first in ``MIDDLEWARE`` so the
+    queries of other middleware (sessions, authentication) are counted.
+
+    Under ASGI the query wrappers are installed from the request's
+    thread-sensitive executor, the thread that runs both sync views and
+    the async ORM's queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings = self.start(request)
+        token = current_timings.set(timings)
+        try:
+            with self.wrap_connections(timings):
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = self.start(request)
+        token = current_timings.set(timings)
+        stack = await sync_to_async(self.wrap_connections)(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            current_timings.reset(token)
+
+        return self.finish(request, response, timings)
+
+    def start(self, request):
+        timings = RequestTimings()
+        request.request_timings = timings
+
+        return timings
+
+    def wrap_connections(self, timings):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings))
+
+        return stack
+
+    def finish(self, request, response, timings):
+        timings.finish()
+
+        match = request.resolver_match
+        view = match.view_name if match else "<unmatched>"
+        response_size = None if response.streaming else len(response.content)
+        request_metrics.observe(view, request.method, timings, response_size)
+
+        if settings.REQUEST_METRICS["SERVER_TIMING"]:
+            response["Server-Timing"] = timings.server_timing()
+
+        return response
+
+    def process_template_response(self, request, response):
+        timings = request.request_timings
+        timings.start_render(response)
+        response.add_post_render_callback(timings.finish_render)
+
+        return response
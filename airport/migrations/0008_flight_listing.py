@@ -0,0 +1,98 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:55
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_flight_listings(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    FlightListing = apps.get_model("airport", "FlightListing")
+    flight_ids = list(Flight.objects.order_by("id").values_list("id", flat=True))
+
+    for offset in range(0, len(flight_ids), 2000):
+        chunk = flight_ids[offset : offset + 2000]
+        crew_names = defaultdict(list)
+        for flight_id, first_name, last_name in (
+            Flight.crew.through.objects.filter(flight_id__in=chunk)
+            .order_by("crew_id")
+            .values_list("flight_id", "crew__first_name", "crew__last_name")
+        ):
+            crew_names[flight_id].append(f"{first_name} {last_name}")
+
+        FlightListing.objects.bulk_create(
+            FlightListing(
+                flight_id=flight.id,
+                source_id=flight.route.source_id,
+                destination_id=flight.route.destination_id,
+                source_name=flight.route.source.name,
+                destination_name=flight.route.destination.name,
+                route=f"{flight.route.source.name} - "
+                f"{flight.route.destination.name}",
+                airplane=f"{flight.airplane.name} "
+                f"{flight.airplane.airplane_type.name}",
+                departure_time=flight.departure_time,
+                arrival_time=flight.arrival_time,
+                crew=crew_names[flight.id],
+                capacity=flight.airplane.rows * flight.airplane.seats_in_row,
+                tickets_sold=flight.tickets_sold,
+            )
+            for flight in Flight.objects.filter(id__in=chunk).select_related(
+                "route__source",
+                "route__destination",
+                "airplane__airplane_type",
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0007_seat_hold"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightListing",
+            fields=[
+                (
+                    "flight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="listing",
+                        serialize=False,
+                        to="airport.flight",
+                    ),
+                ),
+                ("source_id", models.BigIntegerField()),
+                ("destination_id", models.BigIntegerField()),
+                ("source_name", models.CharField(max_length=255)),
+                ("destination_name", models.CharField(max_length=255)),
+                ("route", models.CharField(max_length=513)),
+                ("airplane", models.CharField(max_length=511)),
+                ("departure_time", models.DateTimeField()),
+                ("arrival_time", models.DateTimeField()),
+                ("crew", models.JSONField(default=list)),
+                ("capacity", models.IntegerField()),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["departure_time"], name="listing_departure_idx"
+                    ),
+                    models.Index(fields=["arrival_time"], name="listing_arrival_idx"),
+                    models.Index(
+                        fields=["source_id", "destination_id", "departure_time"],
+                        name="listing_route_departure_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_flight_listings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0008_flight_listing"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flightlisting",
+            index=models.Index(
+                fields=["source_id", "departure_time"],
+                name="listing_source_departure_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flightlisting",
+            index=models.Index(
+                fields=["destination_id", "arrival_time"],
+                name="listing_dest_arrival_idx",
+            ),
+        ),
+    ]
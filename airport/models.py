@@ -1,11 +1,14 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
 
 
 class Airport(models.Model):
     name = models.CharField(max_length=255)
     closest_big_city = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -19,13 +22,23 @@ class Route(models.Model):
         "Airport", on_delete=models.CASCADE, related_name="routes_to"
     )
     distance = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.source} - {self.destination}"
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["source", "destination"],
+                name="route_source_destination_idx",
+            ),
+        ]
+
 
 class AirplaneType(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -40,6 +53,7 @@ class Airplane(models.Model):
         on_delete=models.CASCADE,
         related_name="airplanes",
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self):
@@ -52,6 +66,7 @@ class Airplane(models.Model):
 class Crew(models.Model):
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def full_name(self):
@@ -61,6 +76,40 @@ class Crew(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
+def seats_held():
+    """
+    Count the active holds of the outer query's flight with a subquery
+    over the (flight, expires_at) index, so that placing a hold never
+    writes to the flight row. It runs once per row of the outer query.
+    """
+
+    return Coalesce(
+        Subquery(
+            SeatHold.objects.filter(
+                flight=OuterRef("pk"), expires_at__gt=Now()
+            )
+            .order_by()
+            .values("flight")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+class FlightQuerySet(models.QuerySet):
+    def with_tickets_available(self):
+        """Annotate the seats neither sold nor held."""
+
+        return self.annotate(
+            tickets_available=(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - F("tickets_sold")
+                - seats_held()
+            )
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         "Route", on_delete=models.CASCADE, related_name="flights"
@@ -71,16 +120,107 @@ class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, related_name="flights")
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = FlightQuerySet.as_manager()
+
+    @staticmethod
+    def update_tickets_sold(flight_id: int, delta: int):
+        Flight.objects.filter(pk=flight_id).update(
+            tickets_sold=F("tickets_sold") + delta, updated_at=Now()
+        )
+        FlightListing.objects.filter(pk=flight_id).update(
+            tickets_sold=F("tickets_sold") + delta, updated_at=Now()
+        )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["departure_time"], name="flight_departure_idx"
+            ),
+            models.Index(fields=["arrival_time"], name="flight_arrival_idx"),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+        ]
+
+
+class FlightListingQuerySet(models.QuerySet):
+    def with_tickets_available(self):
+        return self.annotate(
+            tickets_available=(
+                F("capacity") - F("tickets_sold") - seats_held()
+            )
+        )
+
+
+class FlightListing(models.Model):
+    """
+    One flattened row per flight with everything the flight list shows,
+    so that listing and filtering flights reads a single table. Rows are
+    kept up to date by ``airport.listing`` on writes to the models they
+    are built from.
+    """
+
+    flight = models.OneToOneField(
+        "Flight",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="listing",
+    )
+    source_id = models.BigIntegerField()
+    destination_id = models.BigIntegerField()
+    source_name = models.CharField(max_length=255)
+    destination_name = models.CharField(max_length=255)
+    route = models.CharField(max_length=513)
+    airplane = models.CharField(max_length=511)
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+    crew = models.JSONField(default=list)
+    capacity = models.IntegerField()
+    tickets_sold = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = FlightListingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["departure_time"], name="listing_departure_idx"
+            ),
+            models.Index(fields=["arrival_time"], name="listing_arrival_idx"),
+            models.Index(
+                fields=["source_id", "destination_id", "departure_time"],
+                name="listing_route_departure_idx",
+            ),
+            models.Index(
+                fields=["source_id", "departure_time"],
+                name="listing_source_departure_idx",
+            ),
+            models.Index(
+                fields=["destination_id", "arrival_time"],
+                name="listing_dest_arrival_idx",
+            ),
+        ]
 
 
 class Order(models.Model):
-    created_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="orders",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created_at"], name="order_user_created_idx"
+            ),
+        ]
+
 
 class Ticket(models.Model):
     row = models.IntegerField()
@@ -123,3 +263,33 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("flight", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class SeatHold(models.Model):
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(
+        "Flight", on_delete=models.CASCADE, related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("flight", "row", "seat")
+        ordering = ["row", "seat"]
+        indexes = [
+            models.Index(
+                fields=["flight", "expires_at"],
+                name="seathold_flight_expires_idx",
+            ),
+            models.Index(
+                fields=["user", "expires_at"],
+                name="seathold_user_expires_idx",
+            ),
+            models.Index(fields=["expires_at"], name="seathold_expires_idx"),
+        ]
@@ -1,8 +1,191 @@
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.response import Response
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPagination(PageNumberPagination):
     page_size = 4
     page_size_query_param = "page_size"
     max_page_size = 10
+
+
+def encode_position_value(value):
+    # Full precision: the cursor must compare equal to the stored value.
+    return value.isoformat() if isinstance(value, date) else value
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination on the composite key ``ordering``.
+
+    Unlike DRF's ``CursorPagination``, which keeps only the first
+    ordering field in the cursor and skips ties with an offset, the
+    cursor carries the value of every ordering field, and a page is the
+    ``page_size`` rows after (or, going back, before) that position. The
+    last field must be unique and none of them nullable, so every row
+    has a distinct position and the query never needs an offset.
+    """
+
+    page_size = settings.KEYSET_PAGINATION["PAGE_SIZE"]
+    page_size_query_param = "page_size"
+    max_page_size = settings.KEYSET_PAGINATION["MAX_PAGE_SIZE"]
+    ordering = ("id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        self.page = rows[: self.page_size]
+        has_more = len(rows) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_keyset_filter(self, position, reverse):
+        """
+        Rows strictly after ``position`` in the ordering, or before it when
+        ``reverse``: ``(a > x) OR (a = x AND b > y)``, plus ``a >= x`` so
+        that the index on the ordering bounds the scan.
+        """
+
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") != reverse else "gte"
+
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & condition
+
+    def get_model_field(self, name):
+        meta = self.model._meta
+        return meta.pk if name == "pk" else meta.get_field(name)
+
+    def get_position(self, row):
+        """Return the ordering values of ``row``, an instance or a dict."""
+
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(row, dict):
+                position.append(row[self.get_model_field(name).attname])
+            else:
+                position.append(getattr(row, name))
+
+        return position
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def encode_cursor(self, position, reverse):
+        tokens = {"p": [encode_position_value(value) for value in position]}
+        if reverse:
+            tokens["r"] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(tokens, separators=(",", ":")).encode()
+        ).decode("ascii")
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request):
+        """Return ``(position, reverse)``, ``(None, False)`` without one."""
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = [
+                self.get_model_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(
+                    self.ordering, tokens["p"], strict=True
+                )
+            ]
+            reverse = bool(tokens.get("r"))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+
+class FlightKeysetPagination(KeysetPagination):
+    # "pk" rather than "id" so that it also orders flight listings.
+    ordering = ("departure_time", "pk")
+
+
+class OrderKeysetPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+
+
+class KeysetPaginationMixin:
+    """
+    Let clients opt in to cursor pagination with ``?pagination=cursor``.
+
+    Following the ``next``/``previous`` links keeps the cursor mode, as
+    they carry the ``cursor`` query parameter.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def uses_keyset_pagination(self):
+        query_params = self.request.query_params
+        return (
+            query_params.get("pagination") == "cursor"
+            or "cursor" in query_params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.uses_keyset_pagination():
+            self._paginator = self.keyset_pagination_class()
+
+        return super().paginator
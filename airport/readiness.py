@@ -0,0 +1,75 @@
+import random
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError
+
+migrations_applied = False
+
+
+def check_database(alias: str = DEFAULT_DB_ALIAS):
+    """Run ``SELECT 1``, raising OperationalError when it cannot."""
+
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def pending_migrations(alias: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """
+    Names of unapplied migrations. Once everything is applied the answer
+    is remembered for the life of the process, so readiness probes stop
+    loading the migration graph.
+    """
+
+    global migrations_applied
+
+    if migrations_applied:
+        return []
+
+    executor = MigrationExecutor(connections[alias])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    pending = [
+        f"{migration.app_label}.{migration.name}" for migration, _ in plan
+    ]
+    migrations_applied = not pending
+
+    return pending
+
+
+def wait_for_database(
+    timeout: float,
+    initial_delay: float = 0.05,
+    max_delay: float = 2.0,
+    alias: str = DEFAULT_DB_ALIAS,
+    on_retry=None,
+) -> int:
+    """
+    Retry ``check_database`` with exponential backoff and full jitter
+    until it succeeds or ``timeout`` seconds have passed, then re-raise
+    the last error. The first attempt is immediate, so a database that
+    is already up costs one round trip. Returns the number of attempts;
+    the connection is left open for the caller to reuse or close.
+    """
+
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    attempts = 0
+
+    while True:
+        attempts += 1
+        try:
+            check_database(alias)
+            return attempts
+        except OperationalError as error:
+            connections[alias].close()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+
+            sleep = min(random.uniform(0, delay), remaining)
+            if on_retry:
+                on_retry(attempts, error, sleep)
+            time.sleep(sleep)
+            delay = min(delay * 2, max_delay)
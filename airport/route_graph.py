@@ -0,0 +1,271 @@
+import bisect
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.functions import Now
+
+from airport.models import Flight
+
+
+@dataclass(frozen=True)
+class FlightLeg:
+    id: int
+    source_id: int
+    destination_id: int
+    departure_time: datetime
+    arrival_time: datetime
+    distance: int
+
+
+@dataclass(frozen=True)
+class Itinerary:
+    legs: tuple[FlightLeg, ...]
+
+    @property
+    def duration(self) -> timedelta:
+        return self.legs[-1].arrival_time - self.legs[0].departure_time
+
+    @property
+    def distance(self) -> int:
+        return sum(leg.distance for leg in self.legs)
+
+
+LEG_FIELDS = (
+    "id",
+    "route__source_id",
+    "route__destination_id",
+    "departure_time",
+    "arrival_time",
+    "route__distance",
+)
+
+
+class RouteGraph:
+    """
+    Time-expanded graph of flights kept in memory.
+
+    Flights are indexed by source airport and sorted by departure time,
+    so the onward connections of a leg are found with a binary search
+    instead of a database query.
+    """
+
+    def __init__(self, max_age: int | None = None):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._legs: dict[int, FlightLeg] = {}
+        self._departures: dict[int, list[FlightLeg]] = {}
+        self._departure_keys: dict[int, list[tuple[datetime, int]]] = {}
+        self._built_at: float | None = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def _is_stale(self) -> bool:
+        max_age = self.max_age
+        if max_age is None:
+            max_age = getattr(settings, "ROUTE_GRAPH_MAX_AGE", 300)
+
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at > max_age
+        )
+
+    def build(self):
+        """Load the flights that have not departed yet."""
+
+        legs = [
+            FlightLeg(*row)
+            for row in Flight.objects.filter(departure_time__gte=Now())
+            .order_by()
+            .values_list(*LEG_FIELDS)
+            .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        ]
+
+        with self._lock:
+            self._legs = {}
+            self._departures = {}
+            self._departure_keys = {}
+            for leg in legs:
+                self._insert(leg)
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        """Forget every flight; the next search builds the graph again."""
+
+        with self._lock:
+            self._legs = {}
+            self._departures = {}
+            self._departure_keys = {}
+            self._built_at = None
+
+    def _rebuild_in_background(self):
+        try:
+            self.build()
+        finally:
+            self._build_lock.release()
+            connection.close()
+
+    def ensure_built(self):
+        """
+        Build the graph on first use, with concurrent callers waiting for
+        that one build. Once built, a stale graph is rebuilt by a single
+        background thread while requests keep searching the current one.
+        """
+
+        if not self._is_stale():
+            return
+
+        if not self.is_built:
+            with self._build_lock:
+                if not self.is_built:
+                    self.build()
+        elif self._build_lock.acquire(blocking=False):
+            if self._is_stale():
+                threading.Thread(
+                    target=self._rebuild_in_background, daemon=True
+                ).start()
+            else:
+                self._build_lock.release()
+
+    def _insert(self, leg: FlightLeg):
+        key = (leg.departure_time, leg.id)
+        keys = self._departure_keys.setdefault(leg.source_id, [])
+        index = bisect.bisect_left(keys, key)
+        keys.insert(index, key)
+        self._departures.setdefault(leg.source_id, []).insert(index, leg)
+        self._legs[leg.id] = leg
+
+    def _remove(self, flight_id: int):
+        leg = self._legs.pop(flight_id, None)
+        if leg is None:
+            return
+
+        keys = self._departure_keys[leg.source_id]
+        index = bisect.bisect_left(keys, (leg.departure_time, leg.id))
+        del keys[index]
+        del self._departures[leg.source_id][index]
+
+    def refresh_flights(self, flight_ids):
+        if not self.is_built:
+            return
+
+        rows = Flight.objects.filter(id__in=flight_ids).values_list(
+            *LEG_FIELDS
+        )
+
+        with self._lock:
+            for flight_id in flight_ids:
+                self._remove(flight_id)
+            for row in rows:
+                self._insert(FlightLeg(*row))
+
+    def refresh_route(self, route_id: int):
+        if not self.is_built:
+            return
+
+        self.refresh_flights(
+            list(
+                Flight.objects.filter(route_id=route_id).values_list(
+                    "id", flat=True
+                )
+            )
+        )
+
+    def remove_flight(self, flight_id: int):
+        with self._lock:
+            self._remove(flight_id)
+
+    def departures(
+        self, airport_id: int, earliest: datetime, latest: datetime
+    ) -> list[FlightLeg]:
+        with self._lock:
+            keys = self._departure_keys.get(airport_id, [])
+            start = bisect.bisect_left(keys, (earliest, 0))
+            end = bisect.bisect_right(keys, (latest, float("inf")))
+
+            return self._departures[airport_id][start:end] if keys else []
+
+    def search(
+        self,
+        source_id: int,
+        destination_id: int,
+        departure_after: datetime,
+        departure_before: datetime,
+        max_connections: int = 1,
+        min_connection: timedelta = timedelta(minutes=45),
+        max_connection: timedelta = timedelta(hours=24),
+        ordering: str = "duration",
+        max_paths: int | None = None,
+    ) -> Iterator[Itinerary]:
+        """
+        Yield itineraries best first by ``ordering`` (``"duration"`` or
+        ``"distance"``, then duration), so callers stop after the ones
+        they need.
+
+        Partial itineraries wait in a priority queue keyed the same way;
+        adding a leg never lowers the key, so an itinerary that reaches
+        the destination comes before every later one. At most
+        ``max_paths`` (``ROUTE_GRAPH_MAX_PATHS``) partial itineraries are
+        queued per search, which bounds its time and memory on dense
+        schedules; what is left unexplored then is dropped.
+        """
+
+        if max_paths is None:
+            max_paths = settings.ROUTE_GRAPH_MAX_PATHS
+        self.ensure_built()
+
+        def key(legs):
+            duration = legs[-1].arrival_time - legs[0].departure_time
+            if ordering == "distance":
+                return sum(leg.distance for leg in legs), duration
+            return duration, duration
+
+        frontier = []
+        tiebreak = itertools.count()
+        pushed = 0
+
+        def push(legs):
+            nonlocal pushed
+            pushed += 1
+            heapq.heappush(frontier, (key(legs), next(tiebreak), legs))
+
+        for leg in self.departures(
+            source_id, departure_after, departure_before
+        ):
+            if pushed >= max_paths:
+                break
+            if leg.destination_id == destination_id or max_connections:
+                push((leg,))
+
+        while frontier:
+            _, _, legs = heapq.heappop(frontier)
+            last = legs[-1]
+            if last.destination_id == destination_id:
+                yield Itinerary(legs)
+                continue
+
+            visited = {source_id, *(leg.destination_id for leg in legs)}
+            last_hop = len(legs) == max_connections
+            for leg in self.departures(
+                last.destination_id,
+                last.arrival_time + min_connection,
+                last.arrival_time + max_connection,
+            ):
+                if pushed >= max_paths:
+                    break
+                if leg.destination_id == destination_id or (
+                    not last_hop and leg.destination_id not in visited
+                ):
+                    push(legs + (leg,))
+
+
+route_graph = RouteGraph()
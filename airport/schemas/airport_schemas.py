@@ -9,24 +9,88 @@ from drf_spectacular.utils import (
 from rest_framework import status
 from airport.serializers import (
     AirportSerializer,
+    AirportBoardSerializer,
     RouteListSerializer,
     RouteRetrieveSerializer,
     FlightListSerializer,
+    FlightSearchSerializer,
+    ItinerarySerializer,
     AirplaneTypeSerializer,
     AirplaneListSerializer,
     CrewSerializer,
     OrderListSerializer,
     OrderSerializer,
+    OrderSummarySerializer,
     TicketSerializer,
     RouteSerializer,
     FlightSerializer,
     AirplaneSerializer,
+    CrewBulkSerializer,
+    FlightBulkSerializer,
+    SeatHoldSerializer,
+    SeatHoldCreateSerializer,
+    SeatHoldCheckoutSerializer,
+)
+
+
+keyset_pagination_parameters = [
+    OpenApiParameter(
+        "pagination",
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Use `cursor` to switch to keyset pagination: the response has "
+            "`next`/`previous` cursor links and no `count`."
+        ),
+        type=OpenApiTypes.STR,
+        enum=["cursor"],
+        required=False,
+    ),
+    OpenApiParameter(
+        "cursor",
+        location=OpenApiParameter.QUERY,
+        description="Opaque cursor taken from a `next`/`previous` link.",
+        type=OpenApiTypes.STR,
+        required=False,
+    ),
+]
+
+fast_list_parameter = OpenApiParameter(
+    "fast",
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Build the page straight from database rows instead of model "
+        "instances; the response body is the same, only faster."
+    ),
+    type=OpenApiTypes.BOOL,
+    required=False,
+)
+
+expand_tickets_parameter = OpenApiParameter(
+    "expand",
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Use `tickets` to list every ticket of each order with its flight "
+        "instead of the order summaries."
+    ),
+    type=OpenApiTypes.STR,
+    enum=["tickets"],
+    required=False,
+)
+
+export_output_parameter = OpenApiParameter(
+    "output",
+    location=OpenApiParameter.QUERY,
+    description="Export format, NDJSON by default.",
+    type=OpenApiTypes.STR,
+    enum=["ndjson", "csv"],
+    required=False,
 )
 
 
 route_schema = extend_schema_view(
     list=extend_schema(
         description="Retrieve a list of routes with optional filtering.",
+        parameters=[fast_list_parameter],
         responses={
             status.HTTP_200_OK: RouteListSerializer(many=True),
         },
@@ -225,6 +289,114 @@ airport_schema = extend_schema_view(
             ),
         ],
     ),
+    autocomplete=extend_schema(
+        description=(
+            "Suggest airports whose name or closest big city starts with "
+            "the given prefix. Results are cached briefly per prefix."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "q",
+                location=OpenApiParameter.QUERY,
+                description="Prefix typed by the user.",
+                type=OpenApiTypes.STR,
+                required=True,
+            ),
+            OpenApiParameter(
+                "limit",
+                location=OpenApiParameter.QUERY,
+                description="Maximum number of suggestions (up to 50).",
+                type=OpenApiTypes.INT,
+                required=False,
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: AirportSerializer(many=True),
+        },
+        examples=[
+            OpenApiExample(
+                name="AutocompleteAirportsResponse",
+                description="Suggestions for the prefix `lo`.",
+                value=[
+                    {
+                        "id": 2,
+                        "name": "LAX Airport",
+                        "closest_big_city": "Los Angeles",
+                    },
+                ],
+                response_only=True,
+            )
+        ],
+    ),
+    departures=extend_schema(
+        description=(
+            "Flights leaving the airport within `hours` from the start of "
+            "the current time bucket, by departure time. Boards are cached "
+            "until the bucket ends or a flight of the airport changes; send "
+            "the returned ETag in If-None-Match to receive 304 meanwhile."
+        ),
+        parameters=[AirportBoardSerializer],
+        responses={
+            status.HTTP_200_OK: OpenApiTypes.OBJECT,
+            status.HTTP_304_NOT_MODIFIED: None,
+            status.HTTP_404_NOT_FOUND: "Airport not found",
+        },
+        examples=[
+            OpenApiExample(
+                name="AirportDeparturesResponse",
+                description="Departures of the next hours.",
+                value={
+                    "airport": 1,
+                    "from": "2023-10-20T08:00:00Z",
+                    "to": "2023-10-20T14:00:00Z",
+                    "flights": [
+                        {
+                            "id": 1,
+                            "destination": "LAX Airport",
+                            "airplane": "UR-00001 Boeing 737",
+                            "departure_time": "2023-10-20T08:15:00Z",
+                            "arrival_time": "2023-10-20T14:30:00Z",
+                        }
+                    ],
+                },
+                response_only=True,
+            )
+        ],
+    ),
+    arrivals=extend_schema(
+        description=(
+            "Flights landing at the airport within `hours` from the start "
+            "of the current time bucket, by arrival time. Cached like the "
+            "departures board."
+        ),
+        parameters=[AirportBoardSerializer],
+        responses={
+            status.HTTP_200_OK: OpenApiTypes.OBJECT,
+            status.HTTP_304_NOT_MODIFIED: None,
+            status.HTTP_404_NOT_FOUND: "Airport not found",
+        },
+        examples=[
+            OpenApiExample(
+                name="AirportArrivalsResponse",
+                description="Arrivals of the next hours.",
+                value={
+                    "airport": 2,
+                    "from": "2023-10-20T08:00:00Z",
+                    "to": "2023-10-20T14:00:00Z",
+                    "flights": [
+                        {
+                            "id": 1,
+                            "source": "JFK Airport",
+                            "airplane": "UR-00001 Boeing 737",
+                            "departure_time": "2023-10-20T08:15:00Z",
+                            "arrival_time": "2023-10-20T14:30:00Z",
+                        }
+                    ],
+                },
+                response_only=True,
+            )
+        ],
+    ),
 )
 
 
@@ -267,6 +439,8 @@ flight_schema = extend_schema_view(
                 type=OpenApiTypes.INT,
                 required=False,
             ),
+            *keyset_pagination_parameters,
+            fast_list_parameter,
         ],
         responses={
             status.HTTP_200_OK: FlightListSerializer(many=True),
@@ -323,6 +497,207 @@ flight_schema = extend_schema_view(
             ),
         ],
     ),
+    search=extend_schema(
+        description=(
+            "Find itineraries between two airports, including connecting "
+            "flights. Every leg must leave at least min_connection_minutes "
+            "after the previous one lands and have enough tickets available "
+            "for the requested number of passengers."
+        ),
+        parameters=[FlightSearchSerializer],
+        responses={
+            status.HTTP_200_OK: ItinerarySerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: "Bad Request",
+        },
+        examples=[
+            OpenApiExample(
+                name="SearchFlightsResponse",
+                description="An itinerary with one connection.",
+                value=[
+                    {
+                        "legs": [
+                            {
+                                "id": 1,
+                                "route": "JFK Airport - ORD Airport",
+                                "departure_time": "2023-10-20T08:00:00Z",
+                                "arrival_time": "2023-10-20T10:30:00Z",
+                                "tickets_available": 42,
+                            },
+                            {
+                                "id": 7,
+                                "route": "ORD Airport - LAX Airport",
+                                "departure_time": "2023-10-20T11:45:00Z",
+                                "arrival_time": "2023-10-20T16:00:00Z",
+                                "tickets_available": 12,
+                            },
+                        ],
+                        "connections": 1,
+                        "duration": "08:00:00",
+                        "distance": 4000,
+                    }
+                ],
+                response_only=True,
+            )
+        ],
+    ),
+    seatmap=extend_schema(
+        description=(
+            "Retrieve seat occupancy of a flight as a packed bitmap. "
+            "Bits are stored row by row, most significant bit first; "
+            "a set bit marks a taken seat. Send the returned ETag in "
+            "If-None-Match to receive 304 while the seat map is unchanged."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Use `binary` to receive the raw bitmap as "
+                    "application/octet-stream instead of base64 JSON."
+                ),
+                type=OpenApiTypes.STR,
+                enum=["base64", "binary"],
+                required=False,
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: OpenApiTypes.OBJECT,
+            status.HTTP_304_NOT_MODIFIED: None,
+            status.HTTP_404_NOT_FOUND: "Flight not found",
+        },
+        examples=[
+            OpenApiExample(
+                name="FlightSeatmapResponse",
+                description=(
+                    "Seat map of a 3x4 airplane with seats 1-1 and 2-3 taken."
+                ),
+                value={
+                    "flight": 1,
+                    "rows": 3,
+                    "seats_in_row": 4,
+                    "encoding": "base64",
+                    "bitmap": "ggA=",
+                },
+                response_only=True,
+            )
+        ],
+    ),
+    export=extend_schema(
+        description=(
+            "Stream every flight matching the list filters, ordered by "
+            "departure time, as NDJSON (one object per line) or CSV. "
+            "Rows are read from the database in chunks, so the export is "
+            "not paginated."
+        ),
+        parameters=[export_output_parameter],
+        responses={
+            (status.HTTP_200_OK, "application/x-ndjson"): OpenApiTypes.STR,
+            (status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR,
+            status.HTTP_400_BAD_REQUEST: "Unknown output format",
+        },
+        examples=[
+            OpenApiExample(
+                name="FlightExportLine",
+                description="One NDJSON line of the export.",
+                value={
+                    "id": 1,
+                    "source": "JFK Airport",
+                    "destination": "LAX Airport",
+                    "airplane": "UR-00001",
+                    "airplane_type": "Boeing 737",
+                    "departure_time": "2023-10-20T15:30:00Z",
+                    "arrival_time": "2023-10-20T18:00:00Z",
+                    "tickets_available": 30,
+                },
+                response_only=True,
+            )
+        ],
+    ),
+    manifest=extend_schema(
+        description=(
+            "Stream the passenger manifest of a flight (admin only): one "
+            "row per ticket, ordered by row and seat, as NDJSON or CSV."
+        ),
+        parameters=[export_output_parameter],
+        responses={
+            (status.HTTP_200_OK, "application/x-ndjson"): OpenApiTypes.STR,
+            (status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR,
+            status.HTTP_400_BAD_REQUEST: "Unknown output format",
+            status.HTTP_403_FORBIDDEN: "Forbidden",
+            status.HTTP_404_NOT_FOUND: "Flight not found",
+        },
+        examples=[
+            OpenApiExample(
+                name="FlightManifestLine",
+                description="One NDJSON line of the manifest.",
+                value={
+                    "row": 1,
+                    "seat": 1,
+                    "order": 1,
+                    "passenger": "user@example.com",
+                    "booked_at": "2023-10-10T12:00:00Z",
+                },
+                response_only=True,
+            )
+        ],
+    ),
+    bulk=[
+        extend_schema(
+            methods=["POST"],
+            description=(
+                "Create a list of flights (admin only). The whole list is "
+                "validated first; routes, airplanes and crew are checked "
+                "with one query each and errors are returned per item."
+            ),
+            request=FlightBulkSerializer(many=True),
+            responses={
+                status.HTTP_201_CREATED: FlightBulkSerializer(many=True),
+                status.HTTP_400_BAD_REQUEST: "Bad Request",
+            },
+            examples=[
+                OpenApiExample(
+                    name="BulkCreateFlightsRequest",
+                    value={
+                        "route": 1,
+                        "airplane": 1,
+                        "departure_time": "2023-10-20T15:30:00Z",
+                        "arrival_time": "2023-10-20T18:00:00Z",
+                        "crew": [1, 2],
+                    },
+                    request_only=True,
+                ),
+                OpenApiExample(
+                    name="BulkCreateFlightsError",
+                    value=[
+                        {},
+                        {"route": ["Route 99 does not exist."]},
+                    ],
+                    status_codes=["400"],
+                    response_only=True,
+                ),
+            ],
+        ),
+        extend_schema(
+            methods=["PATCH"],
+            description=(
+                "Partially update a list of flights (admin only). Every "
+                "item needs the `id` of the flight; a given `crew` "
+                "replaces the current crew."
+            ),
+            request=FlightBulkSerializer(many=True, partial=True),
+            responses={
+                status.HTTP_200_OK: FlightBulkSerializer(many=True),
+                status.HTTP_400_BAD_REQUEST: "Bad Request",
+            },
+            examples=[
+                OpenApiExample(
+                    name="BulkUpdateFlightsRequest",
+                    value={"id": 2, "crew": [3, 4]},
+                    request_only=True,
+                ),
+            ],
+        ),
+    ],
 )
 
 
@@ -464,19 +839,76 @@ crew_schema = extend_schema_view(
             ),
         ],
     ),
+    bulk=[
+        extend_schema(
+            methods=["POST"],
+            description="Create a list of crew members (admin only).",
+            request=CrewBulkSerializer(many=True),
+            responses={
+                status.HTTP_201_CREATED: CrewBulkSerializer(many=True),
+                status.HTTP_400_BAD_REQUEST: "Bad Request",
+            },
+        ),
+        extend_schema(
+            methods=["PATCH"],
+            description=(
+                "Partially update a list of crew members (admin only); "
+                "every item needs the `id` of the crew member."
+            ),
+            request=CrewBulkSerializer(many=True, partial=True),
+            responses={
+                status.HTTP_200_OK: CrewBulkSerializer(many=True),
+                status.HTTP_400_BAD_REQUEST: "Bad Request",
+            },
+            examples=[
+                OpenApiExample(
+                    name="BulkUpdateCrewRequest",
+                    value={"id": 1, "last_name": "Smith"},
+                    request_only=True,
+                ),
+            ],
+        ),
+    ],
 )
 
 
 order_schema = extend_schema_view(
     list=extend_schema(
-        description="Retrieve a list of orders associated with the logged-in user.",
+        description=(
+            "Retrieve the order history of the logged-in user: per order the "
+            "number of tickets and flights, the route of the first flight and "
+            "the first departure and last arrival. With `expand=tickets` each "
+            "order lists its tickets with their flights instead "
+            "(OrderListSerializer); `fast` only applies to that form."
+        ),
+        parameters=[
+            *keyset_pagination_parameters,
+            expand_tickets_parameter,
+            fast_list_parameter,
+        ],
         responses={
-            status.HTTP_200_OK: OrderListSerializer(many=True),
+            status.HTTP_200_OK: OrderSummarySerializer(many=True),
         },
         examples=[
             OpenApiExample(
                 name="ListOrdersResponse",
                 description="An example response for listing user orders.",
+                value=[
+                    {
+                        "id": 1,
+                        "created_at": "2023-10-10T12:00:00Z",
+                        "tickets_count": 2,
+                        "flights_count": 1,
+                        "first_route": "JFK Airport - LAX Airport",
+                        "first_departure_time": "2023-10-20T08:00:00Z",
+                        "last_arrival_time": "2023-10-20T14:30:00Z",
+                    }
+                ],
+                response_only=True,
+            ),
+            OpenApiExample(
+                name="ListOrdersExpandedResponse",
+                description="The same order listed with `expand=tickets`.",
                 value=[
                     {
                         "id": 1,
@@ -487,21 +919,31 @@ order_schema = extend_schema_view(
                     }
                 ],
                 response_only=True,
-            )
+            ),
         ],
     ),
     create=extend_schema(
-        description="Create a new order.",
+        description=(
+            "Create a new order and book all of its tickets atomically. "
+            "If any requested seat is already taken, nothing is booked "
+            "and 409 is returned with the list of taken seats."
+        ),
         request=OrderSerializer,
         responses={
             status.HTTP_201_CREATED: OrderSerializer,
             status.HTTP_400_BAD_REQUEST: "Bad Request",
+            status.HTTP_409_CONFLICT: "Seats already taken",
         },
         examples=[
             OpenApiExample(
                 name="CreateOrderRequest",
                 description="An example request to create a new order.",
-                value={"tickets": [1, 2]},
+                value={
+                    "tickets": [
+                        {"row": 1, "seat": 1, "flight": 1},
+                        {"row": 1, "seat": 2, "flight": 1},
+                    ]
+                },
                 request_only=True,
             ),
             OpenApiExample(
@@ -510,10 +952,23 @@ order_schema = extend_schema_view(
                 value={
                     "id": 2,
                     "created_at": "2023-10-10T12:00:00Z",
-                    "tickets": [],
+                    "tickets": [
+                        {"id": 5, "row": 1, "seat": 1, "flight": 1},
+                        {"id": 6, "row": 1, "seat": 2, "flight": 1},
+                    ],
                 },
                 response_only=True,
             ),
+            OpenApiExample(
+                name="CreateOrderConflictResponse",
+                description="An example response when seats are taken.",
+                value={
+                    "detail": "Some of the requested seats are already taken.",
+                    "taken_seats": [{"flight": 1, "row": 1, "seat": 2}],
+                },
+                response_only=True,
+                status_codes=["409"],
+            ),
         ],
     ),
 )
@@ -522,6 +977,7 @@ order_schema = extend_schema_view(
 ticket_schema = extend_schema_view(
     list=extend_schema(
         description="Retrieve a list of tickets associated with the logged-in user's orders.",
+        parameters=keyset_pagination_parameters,
         responses={
             status.HTTP_200_OK: TicketSerializer(many=True),
         },
@@ -546,3 +1002,79 @@ ticket_schema = extend_schema_view(
         ],
     ),
 )
+
+
+seat_hold_example = {
+    "id": 7,
+    "flight": 1,
+    "row": 4,
+    "seat": 2,
+    "expires_at": "2023-10-10T12:10:00Z",
+}
+
+seat_hold_schema = extend_schema_view(
+    list=extend_schema(
+        description="Retrieve the active seat holds of the logged-in user.",
+        responses={status.HTTP_200_OK: SeatHoldSerializer(many=True)},
+        examples=[
+            OpenApiExample(
+                name="ListSeatHoldsResponse",
+                value=seat_hold_example,
+                response_only=True,
+            )
+        ],
+    ),
+    create=extend_schema(
+        description=(
+            "Hold seats of a flight for the logged-in user, all or nothing. "
+            "Held seats are shown as taken to everybody else until the hold "
+            "is checked out, released or expires (SEAT_HOLD_TTL seconds). "
+            "Holding a seat again renews the hold. If any seat is sold or "
+            "held by someone else, nothing is held and 409 is returned."
+        ),
+        request=SeatHoldCreateSerializer,
+        responses={
+            status.HTTP_201_CREATED: SeatHoldSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: "Bad Request",
+            status.HTTP_409_CONFLICT: "Seats already taken",
+        },
+        examples=[
+            OpenApiExample(
+                name="CreateSeatHoldRequest",
+                value={
+                    "flight": 1,
+                    "seats": [{"row": 4, "seat": 2}, {"row": 4, "seat": 3}],
+                },
+                request_only=True,
+            ),
+            OpenApiExample(
+                name="CreateSeatHoldResponse",
+                value=seat_hold_example,
+                response_only=True,
+                status_codes=["201"],
+            ),
+        ],
+    ),
+    destroy=extend_schema(
+        description="Release one of the logged-in user's seat holds.",
+    ),
+    checkout=extend_schema(
+        description=(
+            "Book every seat the logged-in user holds, or only those of "
+            "`flight`, as one order and release the holds."
+        ),
+        request=SeatHoldCheckoutSerializer,
+        responses={
+            status.HTTP_201_CREATED: OrderSerializer,
+            status.HTTP_400_BAD_REQUEST: "No active seat holds",
+            status.HTTP_409_CONFLICT: "Seats already taken",
+        },
+        examples=[
+            OpenApiExample(
+                name="CheckoutSeatHoldsRequest",
+                value={"flight": 1},
+                request_only=True,
+            ),
+        ],
+    ),
+)
@@ -0,0 +1,32 @@
+import base64
+import hashlib
+from typing import Iterable
+
+
+def build_seat_bitmap(
+    rows: int, seats_in_row: int, taken_seats: Iterable[tuple[int, int]]
+) -> bytes:
+    """
+    Pack ``taken_seats`` into one bit per seat, row by row. Seats outside
+    the layout, left over from tickets sold before the airplane was made
+    smaller, have no bit and are skipped.
+    """
+
+    bitmap = bytearray((rows * seats_in_row + 7) // 8)
+
+    for row, seat in taken_seats:
+        if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+            continue
+        index = (row - 1) * seats_in_row + (seat - 1)
+        bitmap[index // 8] |= 0x80 >> (index % 8)
+
+    return bytes(bitmap)
+
+
+def encode_seat_bitmap(bitmap: bytes) -> str:
+    return base64.b64encode(bitmap).decode("ascii")
+
+
+def seat_bitmap_etag(flight_id: int, bitmap: bytes) -> str:
+    digest = hashlib.blake2b(bitmap, digest_size=8).hexdigest()
+    return f'"seatmap-{flight_id}-{digest}"'
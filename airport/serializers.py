@@ -1,5 +1,18 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from airport.booking import book_tickets
+from airport.holds import get_taken_seats
+from airport.bulk import (
+    create_crews,
+    create_flights,
+    update_crews,
+    update_flights,
+)
 from airport.models import (
     Airport,
     Route,
@@ -9,6 +22,7 @@ from airport.models import (
     Flight,
     Ticket,
     Order,
+    SeatHold,
 )
 
 
@@ -129,6 +143,151 @@ class FlightSerializer(serializers.ModelSerializer):
         ]
 
 
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validate a list payload in one pass. When an ``instance`` queryset is
+    given (bulk partial update) every item needs the ``id`` of one of its
+    objects; the objects are loaded with a single ``in_bulk`` query.
+    Errors are reported per item, in payload order.
+    """
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        errors = [{} for _ in attrs]
+        self.instances = {}
+
+        if self.instance is not None:
+            self.instances = self.instance.in_bulk(
+                {item["id"] for item in attrs if "id" in item}
+            )
+            seen = set()
+            for item, item_errors in zip(attrs, errors):
+                item_id = item.get("id")
+                if item_id is None:
+                    item_errors["id"] = ["This field is required."]
+                elif item_id not in self.instances:
+                    item_errors["id"] = [f"Object {item_id} does not exist."]
+                elif item_id in seen:
+                    item_errors["id"] = [f"Object {item_id} is repeated."]
+                seen.add(item_id)
+
+        self.validate_items(attrs, errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return attrs
+
+    def validate_items(self, attrs, errors):
+        pass
+
+
+class CrewBulkListSerializer(BulkListSerializer):
+    def create(self, validated_data):
+        return create_crews(validated_data)
+
+    def update(self, instance, validated_data):
+        return update_crews(self.instances, validated_data)
+
+
+class CrewBulkSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Crew
+        fields = ["id", "first_name", "last_name"]
+        list_serializer_class = CrewBulkListSerializer
+
+
+class FlightBulkListSerializer(BulkListSerializer):
+    def validate_items(self, attrs, errors):
+        def existing_ids(model, ids):
+            return set(
+                model.objects.filter(id__in=ids).values_list("id", flat=True)
+            )
+
+        routes = existing_ids(
+            Route, {item["route_id"] for item in attrs if "route_id" in item}
+        )
+        airplanes = existing_ids(
+            Airplane,
+            {item["airplane_id"] for item in attrs if "airplane_id" in item},
+        )
+        crew = existing_ids(
+            Crew,
+            {
+                crew_id
+                for item in attrs
+                for crew_id in item.get("crew_ids", [])
+            },
+        )
+
+        for item, item_errors in zip(attrs, errors):
+            if "route_id" in item and item["route_id"] not in routes:
+                item_errors["route"] = [
+                    f"Route {item['route_id']} does not exist."
+                ]
+            if "airplane_id" in item and item["airplane_id"] not in airplanes:
+                item_errors["airplane"] = [
+                    f"Airplane {item['airplane_id']} does not exist."
+                ]
+            unknown_crew = [
+                crew_id
+                for crew_id in item.get("crew_ids", [])
+                if crew_id not in crew
+            ]
+            if unknown_crew:
+                item_errors["crew"] = [
+                    f"Crew {crew_id} does not exist."
+                    for crew_id in unknown_crew
+                ]
+
+            flight = self.instances.get(item.get("id"))
+            departure_time = item.get(
+                "departure_time", flight and flight.departure_time
+            )
+            arrival_time = item.get(
+                "arrival_time", flight and flight.arrival_time
+            )
+            if (
+                departure_time
+                and arrival_time
+                and arrival_time <= departure_time
+            ):
+                item_errors["arrival_time"] = [
+                    "Arrival time must be after departure time."
+                ]
+
+    def create(self, validated_data):
+        return create_flights(validated_data)
+
+    def update(self, instance, validated_data):
+        return update_flights(self.instances, validated_data)
+
+
+class FlightBulkSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    route = serializers.IntegerField(source="route_id", min_value=1)
+    airplane = serializers.IntegerField(source="airplane_id", min_value=1)
+    crew = serializers.ListField(
+        source="crew_ids",
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+    )
+
+    class Meta:
+        model = Flight
+        fields = [
+            "id",
+            "route",
+            "airplane",
+            "departure_time",
+            "arrival_time",
+            "crew",
+        ]
+        list_serializer_class = FlightBulkListSerializer
+
+
 class FlightListSerializer(FlightSerializer):
     route = serializers.StringRelatedField()
     airplane = serializers.StringRelatedField()
@@ -167,10 +326,76 @@ class FlightRetrieveSerializer(FlightSerializer):
         ]
 
     def get_taken_seats(self, obj):
-        return (
-            (ticket.row, ticket.seat)
-            for ticket in obj.tickets.order_by("row", "seat")
+        return get_taken_seats(obj.id)
+
+
+class AirportBoardSerializer(serializers.Serializer):
+    hours = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.AIRPORT_BOARDS["MAX_HOURS"],
+        default=settings.AIRPORT_BOARDS["HOURS"],
+    )
+
+
+class FlightSearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField(min_value=1)
+    destination = serializers.IntegerField(min_value=1)
+    departure_after = serializers.DateTimeField(required=False)
+    departure_before = serializers.DateTimeField(required=False)
+    max_connections = serializers.IntegerField(
+        min_value=0, max_value=3, default=1
+    )
+    min_connection_minutes = serializers.IntegerField(min_value=0, default=45)
+    max_connection_hours = serializers.IntegerField(
+        min_value=1, max_value=48, default=24
+    )
+    passengers = serializers.IntegerField(min_value=1, default=1)
+    ordering = serializers.ChoiceField(
+        choices=["duration", "distance"], default="duration"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+    def validate(self, attrs):
+        if attrs["source"] == attrs["destination"]:
+            raise serializers.ValidationError(
+                "source and destination must be different airports."
+            )
+
+        departure_after = attrs.setdefault("departure_after", timezone.now())
+        departure_before = attrs.setdefault(
+            "departure_before", departure_after + timedelta(days=1)
         )
+        if departure_before < departure_after:
+            raise serializers.ValidationError(
+                "departure_before must not be earlier than departure_after."
+            )
+
+        return attrs
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    route = serializers.CharField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    tickets_available = serializers.IntegerField()
+
+
+class ItinerarySerializer(serializers.Serializer):
+    legs = ItineraryLegSerializer(many=True)
+    connections = serializers.IntegerField()
+    duration = serializers.DurationField()
+    distance = serializers.IntegerField()
+
+
+class OrderSummarySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+    tickets_count = serializers.IntegerField()
+    flights_count = serializers.IntegerField()
+    first_route = serializers.CharField()
+    first_departure_time = serializers.DateTimeField()
+    last_arrival_time = serializers.DateTimeField()
 
 
 class FlightTicketSerializer(FlightSerializer):
@@ -205,13 +430,61 @@ class TicketOrderSerializer(TicketSerializer):
         fields = ["row", "seat", "flight"]
 
 
+class TicketBookingSerializer(serializers.ModelSerializer):
+    flight = serializers.IntegerField(source="flight_id", min_value=1)
+
+    class Meta:
+        model = Ticket
+        fields = ["id", "row", "seat", "flight"]
+        validators = []
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True)
+    tickets = TicketBookingSerializer(many=True, allow_empty=False)
 
     class Meta:
         model = Order
         fields = ["id", "created_at", "tickets"]
 
+    def validate_tickets(self, tickets):
+        flights = Flight.objects.select_related("airplane").in_bulk(
+            {ticket["flight_id"] for ticket in tickets}
+        )
+        seats = set()
+
+        for ticket in tickets:
+            flight = flights.get(ticket["flight_id"])
+            if flight is None:
+                raise serializers.ValidationError(
+                    f"Flight {ticket['flight_id']} does not exist."
+                )
+
+            Ticket.validate_ticket(
+                ticket["row"],
+                ticket["seat"],
+                flight.airplane,
+                serializers.ValidationError,
+            )
+
+            seat = (flight.id, ticket["row"], ticket["seat"])
+            if seat in seats:
+                raise serializers.ValidationError(
+                    f"Seat {ticket['row']}-{ticket['seat']} of flight "
+                    f"{flight.id} is requested more than once."
+                )
+            seats.add(seat)
+
+        return tickets
+
+    def create(self, validated_data):
+        tickets = validated_data.pop("tickets")
+
+        with transaction.atomic():
+            order = Order.objects.create(**validated_data)
+            book_tickets(order, tickets)
+
+        return order
+
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketOrderSerializer(read_only=True, many=True)
@@ -219,3 +492,58 @@ class OrderListSerializer(OrderSerializer):
     class Meta:
         model = Order
         fields = ["id", "created_at", "tickets"]
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ["id", "flight", "row", "seat", "expires_at"]
+        read_only_fields = fields
+
+
+class SeatHoldCreateSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(min_value=1)
+    seats = SeatSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.SEAT_HOLDS["MAX_SEATS"],
+    )
+
+    def validate(self, attrs):
+        flight = (
+            Flight.objects.select_related("airplane")
+            .filter(id=attrs["flight"])
+            .first()
+        )
+        if flight is None:
+            raise serializers.ValidationError(
+                {"flight": f"Flight {attrs['flight']} does not exist."}
+            )
+
+        seats = set()
+        for seat in attrs["seats"]:
+            Ticket.validate_ticket(
+                seat["row"],
+                seat["seat"],
+                flight.airplane,
+                serializers.ValidationError,
+            )
+            if (seat["row"], seat["seat"]) in seats:
+                raise serializers.ValidationError(
+                    {
+                        "seats": f"Seat {seat['row']}-{seat['seat']} is "
+                        "requested more than once."
+                    }
+                )
+            seats.add((seat["row"], seat["seat"]))
+
+        return {"flight": flight, "seats": seats}
+
+
+class SeatHoldCheckoutSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(min_value=1, required=False)
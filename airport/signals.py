@@ -0,0 +1,167 @@
+from django.db import transaction
+from django.db.models.functions import Now
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from airport.boards import invalidate_boards
+from airport.cache import get_response_cache
+from airport.listing import (
+    refresh_changed_flight_listings,
+    refresh_flight_listings,
+)
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightListing,
+    Route,
+    Ticket,
+)
+from airport.route_graph import route_graph
+
+CACHED_RESOURCES = {
+    Airport: ("airports", "routes"),
+    Route: ("routes",),
+    AirplaneType: ("airplane_types", "airplanes"),
+    Airplane: ("airplanes",),
+    Crew: ("crews",),
+}
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_flight(sender, instance, **kwargs):
+    instance._previous_flight_id = None
+
+    if not instance._state.adding and instance.pk:
+        instance._previous_flight_id = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("flight_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def count_saved_ticket(sender, instance, created, **kwargs):
+    previous_flight_id = getattr(instance, "_previous_flight_id", None)
+
+    if created:
+        Flight.update_tickets_sold(instance.flight_id, 1)
+    elif previous_flight_id and previous_flight_id != instance.flight_id:
+        Flight.update_tickets_sold(previous_flight_id, -1)
+        Flight.update_tickets_sold(instance.flight_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, **kwargs):
+    Flight.update_tickets_sold(instance.flight_id, -1)
+
+
+@receiver(post_save, sender=Flight)
+def refresh_flight_listing(sender, instance, **kwargs):
+    refresh_flight_listings(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_save, sender=Airplane)
+@receiver(post_save, sender=Crew)
+def refresh_related_flight_listings(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    if sender is Airport:
+        flights = Flight.objects.filter(
+            Q(route__source=instance) | Q(route__destination=instance)
+        )
+    else:
+        lookup = {
+            Route: "route",
+            AirplaneType: "airplane__airplane_type",
+            Airplane: "airplane",
+            Crew: "crew",
+        }[sender]
+        flights = Flight.objects.filter(**{lookup: instance})
+
+    refresh_changed_flight_listings(flights)
+
+
+@receiver(pre_delete, sender=Crew)
+def remember_crew_flights(sender, instance, **kwargs):
+    instance._flight_ids = list(instance.flights.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Crew)
+def refresh_crew_flight_listings(sender, instance, **kwargs):
+    refresh_flight_listings(
+        Flight.objects.filter(pk__in=getattr(instance, "_flight_ids", []))
+    )
+
+
+@receiver(post_delete, sender=FlightListing)
+def invalidate_deleted_flight_boards(sender, instance, **kwargs):
+    invalidate_boards({instance.source_id, instance.destination_id})
+
+
+@receiver(post_save, sender=Flight)
+def refresh_route_graph_flight(sender, instance, **kwargs):
+    flight_id = instance.pk
+    transaction.on_commit(lambda: route_graph.refresh_flights([flight_id]))
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def touch_flights_on_crew_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear" and reverse:
+        instance._cleared_flight_ids = list(
+            instance.flights.values_list("id", flat=True)
+        )
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        flights = Flight.objects.filter(pk=instance.pk)
+    elif pk_set or action == "post_clear":
+        flights = Flight.objects.filter(
+            pk__in=pk_set or getattr(instance, "_cleared_flight_ids", [])
+        )
+    else:
+        return
+
+    flights.update(updated_at=Now())
+    refresh_flight_listings(flights)
+
+
+@receiver(post_delete, sender=Flight)
+def remove_route_graph_flight(sender, instance, **kwargs):
+    flight_id = instance.pk
+    transaction.on_commit(lambda: route_graph.remove_flight(flight_id))
+
+
+@receiver(post_save, sender=Route)
+def refresh_route_graph_route(sender, instance, created, **kwargs):
+    route_id = instance.pk
+
+    if not created:
+        transaction.on_commit(lambda: route_graph.refresh_route(route_id))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, **kwargs):
+    resources = CACHED_RESOURCES.get(sender)
+
+    if resources:
+        transaction.on_commit(
+            lambda: get_response_cache().invalidate(*resources)
+        )
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+
+PASSWORD = "password"
+
+
+def create_user(email="user@example.com", **kwargs):
+    return get_user_model().objects.create_user(
+        email=email, password=PASSWORD, **kwargs
+    )
+
+
+def create_airport(name, closest_big_city=None):
+    return Airport.objects.create(
+        name=name, closest_big_city=closest_big_city or name
+    )
+
+
+def create_route(source=None, destination=None, distance=500):
+    return Route.objects.create(
+        source=source or create_airport("Boryspil", "Kyiv"),
+        destination=destination or create_airport("Danylo Halytskyi", "Lviv"),
+        distance=distance,
+    )
+
+
+def create_airplane(name="UR-001", rows=3, seats_in_row=4):
+    airplane_type, _ = AirplaneType.objects.get_or_create(name="Boeing 737")
+
+    return Airplane.objects.create(
+        name=name,
+        rows=rows,
+        seats_in_row=seats_in_row,
+        airplane_type=airplane_type,
+    )
+
+
+def create_flight(
+    route=None, airplane=None, departure_time=None, hours=2, crew=()
+):
+    departure_time = departure_time or timezone.now() + timedelta(days=1)
+    flight = Flight.objects.create(
+        route=route or create_route(),
+        airplane=airplane or create_airplane(),
+        departure_time=departure_time,
+        arrival_time=departure_time + timedelta(hours=hours),
+    )
+    if crew:
+        flight.crew.set(crew)
+
+    return flight
@@ -0,0 +1,59 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.tests.factories import create_airport, create_user
+
+
+class AirportSearchTests(APITestCase):
+    def setUp(self):
+        self.boryspil = create_airport("Boryspil", "Kyiv")
+        self.zhuliany = create_airport("Zhuliany", "Kyiv")
+        self.lviv = create_airport("Danylo Halytskyi", "Lviv")
+        self.client.force_authenticate(create_user())
+
+    def autocomplete(self, **params):
+        return self.client.get(
+            reverse("airports:airport-autocomplete"), params
+        )
+
+    def search(self, value):
+        response = self.client.get(
+            reverse("airports:airport-list"), {"search": value}
+        )
+        return [airport["id"] for airport in response.data["results"]]
+
+    def test_autocomplete_matches_name_or_city_prefixes(self):
+        response = self.autocomplete(q="ky")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [airport["id"] for airport in response.data],
+            [self.boryspil.id, self.zhuliany.id],
+        )
+        self.assertEqual(
+            [airport["id"] for airport in self.autocomplete(q="Dan").data],
+            [self.lviv.id],
+        )
+
+    def test_autocomplete_limits_suggestions(self):
+        self.assertEqual(len(self.autocomplete(q="k", limit=1).data), 1)
+        self.assertEqual(len(self.autocomplete(q="k", limit="x").data), 2)
+
+    def test_autocomplete_without_a_prefix_suggests_nothing(self):
+        self.assertEqual(self.autocomplete(q=" ").data, [])
+
+    def test_autocomplete_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self.autocomplete(q="ky").status_code, 401)
+
+    def test_search_matches_names_and_cities(self):
+        self.assertEqual(self.search("lviv"), [self.lviv.id])
+        self.assertEqual(self.search("zhul"), [self.zhuliany.id])
+
+    @skipUnless(connection.vendor == "postgresql", "needs pg_trgm")
+    def test_search_tolerates_typos(self):
+        self.assertEqual(self.search("Lvov")[:1], [self.lviv.id])
@@ -0,0 +1,62 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.tests.factories import create_flight, create_user
+
+
+class AsyncFlightViewTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = create_flight()
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+
+    def get(self, name, *args, **headers):
+        return self.client.get(
+            reverse(f"airports:{name}", args=args),
+            headers={**self.headers, **headers},
+        )
+
+    def test_lists_flights_like_the_sync_view(self):
+        response = self.get("async-flight-list")
+
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(
+            response.json(),
+            self.client.get(reverse("airports:flight-list")).json(),
+        )
+
+    def test_retrieves_a_flight(self):
+        response = self.get("async-flight-detail", self.flight.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], self.flight.id)
+
+    def test_answers_not_modified_for_a_current_seatmap(self):
+        etag = self.get("async-flight-seatmap", self.flight.id)["ETag"]
+
+        response = self.get(
+            "async-flight-seatmap", self.flight.id, If_None_Match=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_flight_is_not_found(self):
+        response = self.get("async-flight-detail", self.flight.id + 1)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_requires_a_token(self):
+        self.headers = {}
+
+        response = self.get("async-flight-list")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(
+            response.json(),
+            {"detail": "Authentication credentials were not provided."},
+        )
@@ -0,0 +1,67 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from airport.models import Airport, Flight, FlightListing, Ticket
+
+SMALL_SEED = (
+    "--airports=4",
+    "--routes-per-airport=2",
+    "--airplanes=3",
+    "--crews=4",
+    "--flights=10",
+    "--users=3",
+    "--start=2099-01-01",
+    "--days=3",
+)
+
+
+class BenchmarkTests(TestCase):
+    def seed(self):
+        call_command("seed_benchmark_data", *SMALL_SEED, stdout=StringIO())
+
+    def test_seeds_a_benchmark_dataset(self):
+        self.seed()
+
+        self.assertEqual(Airport.objects.count(), 4)
+        self.assertEqual(Flight.objects.count(), 10)
+        self.assertEqual(FlightListing.objects.count(), 10)
+        self.assertTrue(Ticket.objects.exists())
+
+    def test_refuses_to_seed_over_existing_flights(self):
+        self.seed()
+
+        with self.assertRaisesMessage(CommandError, "already contains"):
+            self.seed()
+
+    def test_benchmarks_every_endpoint(self):
+        self.seed()
+
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "results.json"
+            call_command(
+                "run_benchmark",
+                "--requests=1",
+                f"--json={json_path}",
+                stdout=StringIO(),
+            )
+            results = json.loads(json_path.read_text())
+
+        endpoints = {result["endpoint"] for result in results}
+        self.assertLessEqual(
+            {
+                "flight-list",
+                "async-flight-list",
+                "user-register",
+                "order-create",
+            },
+            endpoints,
+        )
+
+    def test_benchmark_needs_seeded_orders(self):
+        with self.assertRaisesMessage(CommandError, "seed_benchmark_data"):
+            call_command("run_benchmark", "--requests=1", stdout=StringIO())
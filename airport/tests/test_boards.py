@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from airport.tests.factories import (
+    create_airplane,
+    create_airport,
+    create_flight,
+    create_route,
+    create_user,
+)
+
+
+class AirportBoardTests(APITestCase):
+    def setUp(self):
+        self.kyiv = create_airport("Boryspil", "Kyiv")
+        self.lviv = create_airport("Danylo Halytskyi", "Lviv")
+        self.route = create_route(self.kyiv, self.lviv)
+        self.airplane = create_airplane()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = self.fly(hours=1)
+            # Outside the six hours the boards below cover.
+            self.fly(hours=30)
+        self.client.force_authenticate(create_user())
+
+    def fly(self, hours):
+        return create_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=timezone.now() + timedelta(hours=hours),
+        )
+
+    def board(self, kind, airport, **headers):
+        return self.client.get(
+            reverse(f"airports:airport-{kind}", args=[airport.id]),
+            {"hours": 6},
+            headers=headers,
+        )
+
+    def test_lists_departures_and_arrivals(self):
+        departures = self.board("departures", self.kyiv)
+        arrivals = self.board("arrivals", self.lviv)
+
+        self.assertEqual(departures.status_code, 200)
+        self.assertEqual(
+            [
+                (flight["id"], flight["destination"])
+                for flight in departures.data["flights"]
+            ],
+            [(self.flight.id, "Danylo Halytskyi")],
+        )
+        self.assertEqual(
+            [
+                (flight["id"], flight["source"])
+                for flight in arrivals.data["flights"]
+            ],
+            [(self.flight.id, "Boryspil")],
+        )
+        self.assertEqual(self.board("arrivals", self.kyiv).data["flights"], [])
+
+    def test_serves_the_cached_board_until_its_flights_change(self):
+        first = self.board("departures", self.kyiv)
+        second = self.board(
+            "departures", self.kyiv, If_None_Match=first["ETag"]
+        )
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            later = self.fly(hours=2)
+        response = self.board(
+            "departures", self.kyiv, If_None_Match=first["ETag"]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [flight["id"] for flight in response.data["flights"]],
+            [self.flight.id, later.id],
+        )
+
+    def test_unknown_airport_is_not_found(self):
+        response = self.client.get(
+            reverse("airports:airport-departures", args=[self.lviv.id + 1])
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_rejects_hours_out_of_range(self):
+        response = self.client.get(
+            reverse("airports:airport-departures", args=[self.kyiv.id]),
+            {"hours": 0},
+        )
+
+        self.assertEqual(response.status_code, 400)
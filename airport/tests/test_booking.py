@@ -0,0 +1,90 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.models import Flight, Order, Ticket
+from airport.tests.factories import create_flight, create_user
+
+
+class OrderBookingTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.flight = create_flight()
+        self.url = reverse("airports:order-list")
+        self.client.force_authenticate(self.user)
+
+    def order(self, *seats):
+        return self.client.post(
+            self.url,
+            {
+                "tickets": [
+                    {"flight": self.flight.id, "row": row, "seat": seat}
+                    for row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_books_every_ticket_of_the_order(self):
+        response = self.order((1, 1), (1, 2), (2, 1))
+
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(
+            sorted(order.tickets.values_list("row", "seat")),
+            [(1, 1), (1, 2), (2, 1)],
+        )
+        self.assertEqual(Flight.objects.get(pk=self.flight.pk).tickets_sold, 3)
+
+    def test_taken_seat_conflicts_and_books_nothing(self):
+        self.order((1, 1))
+
+        response = self.order((1, 2), (1, 1))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.data["taken_seats"],
+            [{"flight": self.flight.id, "row": 1, "seat": 1}],
+        )
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertFalse(Ticket.objects.filter(row=1, seat=2).exists())
+        self.assertEqual(Flight.objects.get(pk=self.flight.pk).tickets_sold, 1)
+
+    def test_rejects_a_seat_requested_twice(self):
+        response = self.order((1, 1), (1, 1))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+
+    def test_rejects_seats_outside_the_airplane(self):
+        response = self.order((4, 1))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+
+    def test_rejects_unknown_flights(self):
+        response = self.client.post(
+            self.url,
+            {"tickets": [{"flight": self.flight.id + 1, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_orders_cannot_be_changed_or_deleted(self):
+        order_id = self.order((1, 1)).data["id"]
+        url = reverse("airports:order-detail", args=[order_id])
+
+        self.assertEqual(self.client.patch(url, {}).status_code, 405)
+        self.assertEqual(self.client.delete(url).status_code, 405)
+        self.assertTrue(Order.objects.filter(pk=order_id).exists())
+
+    def test_users_only_see_their_own_orders(self):
+        order_id = self.order((1, 1)).data["id"]
+        self.client.force_authenticate(create_user("other@example.com"))
+
+        response = self.client.get(
+            reverse("airports:order-detail", args=[order_id])
+        )
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from airport.models import Crew, Flight, FlightListing
+from airport.tests.factories import (
+    create_airplane,
+    create_flight,
+    create_route,
+    create_user,
+)
+
+
+class BulkWriteTests(APITestCase):
+    def setUp(self):
+        self.route = create_route()
+        self.airplane = create_airplane()
+        self.crew = Crew.objects.create(first_name="Olena", last_name="Berg")
+        self.departure_time = timezone.now() + timedelta(days=1)
+        self.client.force_authenticate(create_user(is_staff=True))
+
+    def flight_item(self, hours=0, **values):
+        departure_time = self.departure_time + timedelta(hours=hours)
+        return {
+            "route": self.route.id,
+            "airplane": self.airplane.id,
+            "departure_time": departure_time.isoformat(),
+            "arrival_time": (departure_time + timedelta(hours=2)).isoformat(),
+            "crew": [self.crew.id],
+            **values,
+        }
+
+    def bulk(self, basename, method, items):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(
+                reverse(f"airports:{basename}-bulk"), items, format="json"
+            )
+
+    def test_creates_flights_with_their_crew_and_listings(self):
+        response = self.bulk(
+            "flight", "post", [self.flight_item(), self.flight_item(3)]
+        )
+
+        self.assertEqual(response.status_code, 201)
+        flights = Flight.objects.filter(
+            id__in=[item["id"] for item in response.data]
+        )
+        self.assertEqual(len(flights), 2)
+        for flight in flights:
+            self.assertEqual(list(flight.crew.all()), [self.crew])
+        self.assertEqual(FlightListing.objects.count(), 2)
+
+    def test_reports_errors_per_item_and_writes_nothing(self):
+        response = self.bulk(
+            "flight",
+            "post",
+            [self.flight_item(), self.flight_item(airplane=999, crew=[998])],
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(
+            response.data[1],
+            {
+                "airplane": ["Airplane 999 does not exist."],
+                "crew": ["Crew 998 does not exist."],
+            },
+        )
+        self.assertFalse(Flight.objects.exists())
+
+    def test_updates_crews_and_their_flight_listings(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            flight = create_flight(
+                route=self.route, airplane=self.airplane, crew=[self.crew]
+            )
+
+        response = self.bulk(
+            "crew", "patch", [{"id": self.crew.id, "last_name": "Kim"}]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            FlightListing.objects.get(flight=flight).crew, ["Olena Kim"]
+        )
+
+    def test_rejects_updates_of_unknown_objects(self):
+        response = self.bulk("crew", "patch", [{"id": 999, "last_name": "X"}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data, [{"id": ["Object 999 does not exist."]}]
+        )
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+
+from airport.models import Order, Ticket
+from airport.tests.factories import create_flight, create_user
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = create_flight()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, **headers):
+        return self.client.get(url, headers=headers)
+
+    def book(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+
+    def save_flight(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.departure_time += timedelta(minutes=5)
+            self.flight.save()
+
+    def test_answers_not_modified_for_a_current_etag(self):
+        url = reverse("airports:flight-detail", args=[self.flight.id])
+        etag = self.get(url)["ETag"]
+
+        response = self.get(url, If_None_Match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_answers_not_modified_since_last_modified(self):
+        self.book()
+        url = reverse("airports:order-list")
+        last_modified = self.get(url)["Last-Modified"]
+
+        response = self.get(url, If_Modified_Since=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_validators(self):
+        url = reverse("airports:flight-detail", args=[self.flight.id])
+        etag = self.get(url)["ETag"]
+
+        self.save_flight()
+        response = self.get(url, If_None_Match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_stale_last_modified_gets_the_body(self):
+        self.book()
+        url = reverse("airports:order-list")
+
+        response = self.get(url, If_Modified_Since=http_date(0))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_order_validators_follow_their_flights(self):
+        self.book()
+        url = reverse("airports:order-list")
+        etag = self.get(url)["ETag"]
+
+        self.save_flight()
+
+        self.assertNotEqual(self.get(url)["ETag"], etag)
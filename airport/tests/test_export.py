@@ -0,0 +1,75 @@
+import csv
+import json
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.fast_serializers import datetime_field
+from airport.models import Order, Ticket
+from airport.tests.factories import create_flight, create_user
+
+
+class FlightExportTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.flight = create_flight()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=2, seat=1)
+        self.client.force_authenticate(self.user)
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_streams_flights_as_ndjson(self):
+        response, content = self.export(reverse("airports:flight-export"))
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [
+                {
+                    "id": self.flight.id,
+                    "source": "Boryspil",
+                    "destination": "Danylo Halytskyi",
+                    "airplane": "UR-001",
+                    "airplane_type": "Boeing 737",
+                    "departure_time": datetime_field.to_representation(
+                        self.flight.departure_time
+                    ),
+                    "arrival_time": datetime_field.to_representation(
+                        self.flight.arrival_time
+                    ),
+                    "tickets_available": 11,
+                }
+            ],
+        )
+
+    def test_streams_the_manifest_as_csv_for_staff(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        response, content = self.export(
+            reverse("airports:flight-manifest", args=[self.flight.id]),
+            output="csv",
+        )
+
+        self.assertIn(
+            f'filename="flight-{self.flight.id}-manifest.csv"',
+            response["Content-Disposition"],
+        )
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(
+            [(row["row"], row["seat"], row["passenger"]) for row in rows],
+            [("2", "1", self.user.email)],
+        )
+
+    def test_rejects_an_unknown_output(self):
+        response = self.client.get(
+            reverse("airports:flight-export"), {"output": "xml"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("output", response.data)
@@ -0,0 +1,60 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.models import Crew, Order, Ticket
+from airport.tests.factories import create_flight, create_user
+from airport.views import FlightViewSet
+
+
+class FastSerializationTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = create_flight(
+                crew=[
+                    Crew.objects.create(first_name="Olena", last_name="Berg"),
+                    Crew.objects.create(first_name="Taras", last_name="Kim"),
+                ]
+            )
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2):
+            Ticket.objects.create(
+                order=order, flight=self.flight, row=1, seat=seat
+            )
+        self.client.force_authenticate(self.user)
+
+    def assertFastMatchesRegular(self, name, **params):
+        url = reverse(f"airports:{name}")
+        regular = self.client.get(url, params)
+        fast = self.client.get(url, {**params, "fast": 1})
+
+        self.assertEqual(regular.status_code, 200)
+        self.assertEqual(fast.content, regular.content)
+
+    def test_routes_render_the_same_json(self):
+        self.assertFastMatchesRegular("route-list")
+
+    def test_flights_render_the_same_json(self):
+        with mock.patch.object(FlightViewSet, "use_flight_listing", False):
+            self.assertFastMatchesRegular("flight-list")
+
+    def test_orders_with_tickets_render_the_same_json(self):
+        self.assertFastMatchesRegular("order-list", expand="tickets")
+
+    def test_benchmark_compares_both_modes(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark_serializers", "--rows=5", "--repeat=1", stdout=stdout
+        )
+
+        self.assertIn("listings", stdout.getvalue())
+
+    def test_benchmark_needs_orders(self):
+        Order.objects.all().delete()
+
+        with self.assertRaisesMessage(CommandError, "No orders found"):
+            call_command("benchmark_serializers", stdout=StringIO())
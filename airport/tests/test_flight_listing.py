@@ -0,0 +1,86 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from airport.models import Crew, FlightListing, Order, Ticket
+from airport.tests.factories import (
+    create_airport,
+    create_flight,
+    create_route,
+    create_user,
+)
+
+
+class FlightListingTests(TestCase):
+    def setUp(self):
+        self.kyiv = create_airport("Boryspil", "Kyiv")
+        route = create_route(source=self.kyiv)
+        self.crew = Crew.objects.create(first_name="Olena", last_name="Berg")
+        self.upcoming = create_flight(route=route, crew=[self.crew])
+        self.landed = create_flight(
+            route=route,
+            airplane=self.upcoming.airplane,
+            departure_time=timezone.now() - timedelta(days=2),
+        )
+
+    def listing(self, flight):
+        return FlightListing.objects.get(flight=flight)
+
+    def test_mirrors_the_flight(self):
+        listing = self.listing(self.upcoming)
+
+        self.assertEqual(listing.route, "Boryspil - Danylo Halytskyi")
+        self.assertEqual(listing.airplane, "UR-001 Boeing 737")
+        self.assertEqual(listing.crew, ["Olena Berg"])
+        self.assertEqual(listing.capacity, 12)
+
+    def test_counts_booked_tickets(self):
+        order = Order.objects.create(user=create_user())
+        Ticket.objects.create(order=order, flight=self.upcoming, row=1, seat=1)
+
+        self.assertEqual(self.listing(self.upcoming).tickets_sold, 1)
+
+    def test_renames_landed_flights_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.kyiv.name = "Kyiv Boryspil"
+            self.kyiv.save()
+
+        self.assertEqual(
+            self.listing(self.upcoming).source_name, "Kyiv Boryspil"
+        )
+        self.assertEqual(self.listing(self.landed).source_name, "Boryspil")
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(
+            self.listing(self.landed).source_name, "Kyiv Boryspil"
+        )
+
+    def test_crew_changes_rewrite_the_listing(self):
+        self.upcoming.crew.add(
+            Crew.objects.create(first_name="Taras", last_name="Kim")
+        )
+        self.crew.delete()
+
+        self.assertEqual(self.listing(self.upcoming).crew, ["Taras Kim"])
+
+    def test_command_rebuilds_stale_listings(self):
+        FlightListing.objects.filter(flight=self.upcoming).update(
+            route="stale"
+        )
+        FlightListing.objects.filter(flight=self.landed).delete()
+
+        stdout = StringIO()
+        call_command("refresh_flight_listings", stdout=stdout)
+
+        self.assertIn("Rebuilt listings for 2 flights", stdout.getvalue())
+        self.assertEqual(
+            self.listing(self.upcoming).route, "Boryspil - Danylo Halytskyi"
+        )
+        self.assertTrue(
+            FlightListing.objects.filter(flight=self.landed).exists()
+        )
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from airport.management.commands.explain_hot_queries import (
+    HOT_QUERY_INDEXES,
+    without_hot_query_indexes,
+)
+from airport.models import Order, Ticket
+from airport.tests.factories import create_flight, create_user
+
+
+def index_names():
+    with connection.cursor() as cursor:
+        return {
+            name
+            for table in ("airport_flight", "airport_order", "airport_route")
+            for name in connection.introspection.get_constraints(cursor, table)
+        }
+
+
+class ExplainHotQueriesTests(TestCase):
+    def setUp(self):
+        flight = create_flight()
+        order = Order.objects.create(user=create_user())
+        Ticket.objects.create(order=order, flight=flight, row=1, seat=1)
+
+    def explain(self, *args):
+        stdout = StringIO()
+        call_command("explain_hot_queries", "--repeat=1", *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_migrations_create_the_hot_query_indexes(self):
+        self.assertLessEqual(set(HOT_QUERY_INDEXES), index_names())
+
+    def test_explains_every_hot_query(self):
+        output = self.explain()
+
+        for name in (
+            "flights departing after",
+            "flight listings of a route by departure",
+            "orders of a user since a date",
+            "tickets of an order",
+        ):
+            self.assertIn(name, output)
+        self.assertIn("flight_departure_idx", output)
+
+    def test_runs_without_the_indexes_and_restores_them(self):
+        with without_hot_query_indexes():
+            self.assertFalse(set(HOT_QUERY_INDEXES) & index_names())
+
+        self.assertIn("tickets of an order", self.explain("--without-indexes"))
+        self.assertLessEqual(set(HOT_QUERY_INDEXES), index_names())
+
+    def test_rejects_a_repeat_below_one(self):
+        with self.assertRaisesMessage(CommandError, "--repeat"):
+            self.explain("--repeat=0")
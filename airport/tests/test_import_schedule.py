@@ -0,0 +1,94 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from airport.models import Crew, Flight, FlightListing, Route
+from airport.tests.factories import create_airplane, create_airport
+
+
+class ImportScheduleTests(TestCase):
+    def setUp(self):
+        self.kyiv = create_airport("Boryspil", "Kyiv")
+        self.lviv = create_airport("Danylo Halytskyi", "Lviv")
+        self.airplane = create_airplane()
+        self.crew = Crew.objects.create(first_name="Olena", last_name="Berg")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def row(self, **values):
+        return {
+            "source": "Boryspil",
+            "destination": "Danylo Halytskyi",
+            "distance": 470,
+            "airplane": "UR-001",
+            "departure_time": "2030-01-01T08:00:00Z",
+            "arrival_time": "2030-01-01T09:10:00Z",
+            "crew": [self.crew.id],
+            **values,
+        }
+
+    def import_schedule(self, name, content):
+        path = self.directory / name
+        path.write_text(content)
+        call_command("import_schedule", str(path), stdout=StringIO())
+
+        with open(self.directory / f"{name}.errors.csv") as errors_file:
+            return list(csv.DictReader(errors_file))
+
+    def test_imports_csv_rows_and_creates_routes(self):
+        content = StringIO()
+        writer = csv.DictWriter(content, fieldnames=list(self.row()))
+        writer.writeheader()
+        writer.writerow(self.row(crew=str(self.crew.id)))
+        writer.writerow(
+            self.row(
+                crew="",
+                departure_time="2030-01-02T08:00:00Z",
+                arrival_time="2030-01-02T09:10:00Z",
+            )
+        )
+
+        errors = self.import_schedule("schedule.csv", content.getvalue())
+
+        self.assertEqual(errors, [])
+        route = Route.objects.get()
+        self.assertEqual(
+            (route.source, route.destination, route.distance),
+            (self.kyiv, self.lviv, 470),
+        )
+        flight = Flight.objects.order_by("departure_time").first()
+        self.assertEqual(list(flight.crew.all()), [self.crew])
+        self.assertEqual(FlightListing.objects.count(), 2)
+
+    def test_rejects_bad_ndjson_lines_row_by_row(self):
+        lines = [
+            json.dumps(self.row()),
+            "{not json",
+            "[1, 2]",
+            json.dumps(self.row(source="Heathrow")),
+            json.dumps(self.row(arrival_time="2029-12-31T00:00:00Z")),
+        ]
+
+        errors = self.import_schedule("schedule.ndjson", "\n".join(lines))
+
+        self.assertEqual(Flight.objects.count(), 1)
+        self.assertEqual(
+            [(error["row"], error["error"][:20]) for error in errors],
+            [
+                ("2", "Invalid JSON: Expect"),
+                ("3", "The row is not an ob"),
+                ("4", "Unknown source airpo"),
+                ("5", "arrival_time must be"),
+            ],
+        )
+        self.assertEqual(errors[2]["source"], "Heathrow")
+
+    def test_refuses_a_json_file_without_a_list(self):
+        with self.assertRaisesMessage(CommandError, "does not hold a JSON"):
+            self.import_schedule("schedule.json", json.dumps(self.row()))
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from airport.tests.factories import (
+    create_airplane,
+    create_flight,
+    create_route,
+    create_user,
+)
+
+
+class FlightKeysetPaginationTests(APITestCase):
+    def setUp(self):
+        route = create_route()
+        airplane = create_airplane()
+        departure_time = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            # Ties on departure time must neither repeat nor skip flights.
+            self.flights = [
+                create_flight(
+                    route=route,
+                    airplane=airplane,
+                    departure_time=departure_time + timedelta(hours=i // 2),
+                )
+                for i in range(5)
+            ]
+        self.client.force_authenticate(create_user())
+
+    def get(self, url=None, **params):
+        if url is None:
+            url = reverse("airports:flight-list")
+            params = {"pagination": "cursor", "page_size": 2, **params}
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        return response.data
+
+    def ids(self, page):
+        return [flight["id"] for flight in page["results"]]
+
+    def test_walks_pages_forward_and_back(self):
+        pages = [self.get()]
+        while pages[-1]["next"]:
+            pages.append(self.get(pages[-1]["next"]))
+
+        self.assertEqual(
+            [self.ids(page) for page in pages],
+            [
+                [self.flights[0].id, self.flights[1].id],
+                [self.flights[2].id, self.flights[3].id],
+                [self.flights[4].id],
+            ],
+        )
+        self.assertIsNone(pages[0]["previous"])
+        self.assertEqual(
+            self.ids(self.get(pages[-1]["previous"])), self.ids(pages[1])
+        )
+        self.assertEqual(
+            self.ids(self.get(pages[1]["previous"])), self.ids(pages[0])
+        )
+
+    def test_rejects_an_invalid_cursor(self):
+        response = self.client.get(
+            reverse("airports:flight-list"), {"cursor": "not-a-cursor"}
+        )
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.fast_serializers import datetime_field
+from airport.models import Order, Ticket
+from airport.tests.factories import (
+    create_airplane,
+    create_airport,
+    create_flight,
+    create_route,
+    create_user,
+)
+
+
+class OrderHistoryTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        kyiv = create_airport("Boryspil", "Kyiv")
+        warsaw = create_airport("Chopin", "Warsaw")
+        lviv = create_airport("Danylo Halytskyi", "Lviv")
+        airplane = create_airplane()
+        self.first_leg = create_flight(
+            route=create_route(kyiv, warsaw), airplane=airplane
+        )
+        self.second_leg = create_flight(
+            route=create_route(warsaw, lviv),
+            airplane=airplane,
+            departure_time=self.first_leg.arrival_time + timedelta(hours=2),
+        )
+        self.client.force_authenticate(self.user)
+
+    def order(self, user, *tickets):
+        order = Order.objects.create(user=user)
+        for flight, row, seat in tickets:
+            Ticket.objects.create(
+                order=order, flight=flight, row=row, seat=seat
+            )
+
+        return order
+
+    def test_lists_order_summaries(self):
+        order = self.order(
+            self.user,
+            (self.first_leg, 1, 1),
+            (self.first_leg, 1, 2),
+            (self.second_leg, 1, 1),
+        )
+
+        response = self.client.get(reverse("airports:order-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "id": order.id,
+                    "created_at": datetime_field.to_representation(
+                        order.created_at
+                    ),
+                    "tickets_count": 3,
+                    "flights_count": 2,
+                    "first_route": "Boryspil - Chopin",
+                    "first_departure_time": datetime_field.to_representation(
+                        self.first_leg.departure_time
+                    ),
+                    "last_arrival_time": datetime_field.to_representation(
+                        self.second_leg.arrival_time
+                    ),
+                }
+            ],
+        )
+
+    def test_query_count_does_not_grow_with_orders(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("airports:order-list"))
+
+            return len(queries)
+
+        self.order(self.user, (self.first_leg, 1, 1))
+        one_order = count_queries()
+        for seat in range(2, 5):
+            self.order(
+                self.user,
+                (self.first_leg, 2, seat),
+                (self.second_leg, 2, seat),
+            )
+
+        self.assertEqual(count_queries(), one_order)
+
+    def test_lists_only_the_users_orders_with_tickets(self):
+        self.order(create_user("other@example.com"), (self.first_leg, 1, 1))
+        self.order(self.user)
+
+        response = self.client.get(reverse("airports:order-list"))
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(reverse("airports:order-list"))
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,45 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from airport.models import Airport, Flight
+from airport.tests.factories import create_flight
+from airport.views import AirportViewSet
+
+airport_list = AirportViewSet.list
+
+
+def list_airports_one_by_one(self, request, *args, **kwargs):
+    response = airport_list(self, request, *args, **kwargs)
+    for airport in response.data["results"]:
+        Airport.objects.get(pk=airport["id"])
+
+    return response
+
+
+class CheckQueryCountsTests(TestCase):
+    def check_query_counts(self):
+        stdout = StringIO()
+        call_command("check_query_counts", stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_passes_on_a_seeded_dataset_it_rolls_back(self):
+        output = self.check_query_counts()
+
+        self.assertIn("flight-list (cursor)", output)
+        self.assertFalse(Flight.objects.exists())
+
+    def test_fails_on_queries_per_row(self):
+        with mock.patch.object(
+            AirportViewSet, "list", list_airports_one_by_one
+        ), self.assertRaisesMessage(CommandError, "airport-list"):
+            self.check_query_counts()
+
+    def test_needs_an_order_to_request_as(self):
+        create_flight()
+
+        with self.assertRaisesMessage(CommandError, "No orders found"):
+            self.check_query_counts()
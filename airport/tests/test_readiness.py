@@ -0,0 +1,68 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db.utils import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+
+DATABASE_DOWN = OperationalError('connection to "db" failed for user "api"')
+
+
+class ProbeTests(TestCase):
+    def test_health_touches_no_backend(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("health"))
+
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_ready_when_the_database_is_migrated(self):
+        response = self.client.get(reverse("ready"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"status": "ok", "checks": {"database": "ok", "migrations": "ok"}},
+        )
+
+    def test_unavailable_database_is_not_ready(self):
+        with mock.patch(
+            "airport.views.check_database", side_effect=DATABASE_DOWN
+        ), self.assertLogs("airport", "ERROR"):
+            response = self.client.get(reverse("ready"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json(),
+            {
+                "status": "unavailable",
+                "checks": {"database": "unavailable", "migrations": "unknown"},
+            },
+        )
+
+
+@mock.patch("airport.readiness.time.sleep")
+class WaitForDbTests(TestCase):
+    def wait_for_db(self, *args):
+        stdout = StringIO()
+        call_command("wait_for_db", *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_retries_until_the_database_answers(self, sleep):
+        with mock.patch(
+            "airport.readiness.check_database",
+            side_effect=[DATABASE_DOWN, DATABASE_DOWN, None],
+        ):
+            output = self.wait_for_db("--migrations")
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIn("Database available after 3 attempt(s)", output)
+
+    def test_gives_up_after_the_timeout(self, sleep):
+        with mock.patch(
+            "airport.readiness.check_database", side_effect=DATABASE_DOWN
+        ), self.assertRaisesMessage(CommandError, "Database unavailable"):
+            self.wait_for_db("--timeout=0")
+
+        sleep.assert_not_called()
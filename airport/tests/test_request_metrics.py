@@ -0,0 +1,44 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.tests.factories import create_airport, create_user
+
+
+@override_settings(
+    REQUEST_METRICS={"SERVER_TIMING": True, "TOKEN": "scraper-token"}
+)
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        create_airport("Boryspil", "Kyiv")
+        self.client.force_authenticate(create_user())
+
+    def test_sends_server_timing(self):
+        response = self.client.get(reverse("airports:airport-list"))
+
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "serialize;dur=", "render;dur=", "total"):
+            self.assertIn(metric, timing)
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+
+    def test_exposes_request_histograms_with_a_token(self):
+        self.client.get(reverse("airports:airport-list"))
+
+        response = self.client.get(
+            reverse("metrics"),
+            headers={"Authorization": "Bearer scraper-token"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'airport_request_db_queries_count{view="airports:airport-list",'
+            'method="GET"} 1',
+            response.content.decode(),
+        )
+
+    def test_metrics_need_the_token_or_staff(self):
+        response = self.client.get(
+            reverse("metrics"), headers={"Authorization": "Bearer wrong"}
+        )
+
+        self.assertEqual(response.status_code, 401)
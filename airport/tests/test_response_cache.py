@@ -0,0 +1,74 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.cache import LocMemLRUBackend
+from airport.tests.factories import create_airport, create_user
+
+
+class CachedResponseTests(APITestCase):
+    def setUp(self):
+        self.airport = create_airport("Boryspil", "Kyiv")
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+
+    def get_airports(self):
+        return self.client.get(reverse("airports:airport-list"))
+
+    def test_serves_repeated_requests_from_the_cache(self):
+        first, second = self.get_airports(), self.get_airports()
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+
+    def test_writes_invalidate_cached_responses(self):
+        self.get_airports()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_airport("Danylo Halytskyi", "Lviv")
+
+        response = self.get_airports()
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_stats_count_hits_and_misses(self):
+        self.get_airports()
+        self.get_airports()
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(reverse("airports:response-cache-stats"))
+
+        self.assertEqual(response.data["airports"], {"hits": 1, "misses": 1})
+
+    def test_stats_are_for_staff_only(self):
+        response = self.client.get(reverse("airports:response-cache-stats"))
+
+        self.assertEqual(response.status_code, 403)
+
+
+class LocMemLRUBackendTests(TestCase):
+    def test_evicts_the_least_recently_used_entry(self):
+        backend = LocMemLRUBackend(max_entries=2)
+        backend.set("a", 1, None)
+        backend.set("b", 2, None)
+        backend.get("a")
+        backend.set("c", 3, None)
+
+        self.assertEqual([backend.get(key) for key in "abc"], [1, None, 3])
+
+    def test_shared_versions_are_seen_by_every_worker(self):
+        worker, other_worker = (
+            LocMemLRUBackend(versions_alias="shared"),
+            LocMemLRUBackend(versions_alias="shared"),
+        )
+        version = other_worker.get_version("airports")
+
+        worker.bump_version("airports")
+
+        self.assertNotEqual(other_worker.get_version("airports"), version)
+        self.assertEqual(
+            other_worker.get_version("airports"),
+            worker.get_version("airports"),
+        )
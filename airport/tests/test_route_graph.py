@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from airport.route_graph import RouteGraph, route_graph
+from airport.tests.factories import (
+    create_airplane,
+    create_airport,
+    create_flight,
+    create_route,
+    create_user,
+)
+
+
+class ConnectingFlightsMixin:
+    def setUp(self):
+        self.kyiv = create_airport("Boryspil", "Kyiv")
+        self.warsaw = create_airport("Chopin", "Warsaw")
+        self.lviv = create_airport("Danylo Halytskyi", "Lviv")
+        self.airplane = create_airplane(rows=1, seats_in_row=2)
+        self.start = (timezone.now() + timedelta(days=1)).replace(
+            microsecond=0
+        )
+
+        self.direct = self.fly(self.kyiv, self.lviv, 1, 5, distance=500)
+        self.first_leg = self.fly(self.kyiv, self.warsaw, 0, 1)
+        self.second_leg = self.fly(self.warsaw, self.lviv, 2, 1)
+        # Leaves 10 minutes after the first leg lands: too short to make.
+        self.fly(self.warsaw, self.lviv, 1 + 1 / 6, 1)
+
+    def fly(self, source, destination, after_hours, hours, distance=300):
+        route = create_route(source, destination, distance)
+        return create_flight(
+            route=route,
+            airplane=self.airplane,
+            departure_time=self.start + timedelta(hours=after_hours),
+            hours=hours,
+        )
+
+    def search(self, graph, **kwargs):
+        return [
+            [leg.id for leg in itinerary.legs]
+            for itinerary in graph.search(
+                self.kyiv.id,
+                self.lviv.id,
+                self.start,
+                self.start + timedelta(hours=2),
+                **kwargs,
+            )
+        ]
+
+
+class RouteGraphSearchTests(ConnectingFlightsMixin, APITestCase):
+    def test_yields_itineraries_shortest_first(self):
+        self.assertEqual(
+            self.search(RouteGraph()),
+            [[self.first_leg.id, self.second_leg.id], [self.direct.id]],
+        )
+
+    def test_orders_by_distance(self):
+        self.assertEqual(
+            self.search(RouteGraph(), ordering="distance"),
+            [[self.direct.id], [self.first_leg.id, self.second_leg.id]],
+        )
+
+    def test_without_connections_only_direct_flights_are_found(self):
+        self.assertEqual(
+            self.search(RouteGraph(), max_connections=0), [[self.direct.id]]
+        )
+
+    def test_max_paths_bounds_the_search(self):
+        self.assertEqual(self.search(RouteGraph(), max_paths=1), [])
+
+    def test_departed_flights_are_not_loaded(self):
+        graph = RouteGraph()
+        graph.build()
+
+        departed = self.fly(self.kyiv, self.lviv, -48, 1)
+        graph.build()
+
+        self.assertNotIn(
+            departed.id,
+            [
+                leg.id
+                for leg in graph.departures(
+                    self.kyiv.id,
+                    departed.departure_time,
+                    departed.departure_time,
+                )
+            ],
+        )
+
+    def test_saved_flights_are_added_once_committed(self):
+        route_graph.build()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faster = self.fly(self.kyiv, self.lviv, 1, 1)
+
+        self.assertEqual(self.search(route_graph)[0], [faster.id])
+
+
+class FlightSearchViewTests(ConnectingFlightsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(create_user())
+
+    def get(self, **params):
+        return self.client.get(
+            reverse("airports:flight-search"),
+            {
+                "source": self.kyiv.id,
+                "destination": self.lviv.id,
+                "departure_after": self.start.isoformat(),
+                "departure_before": (
+                    self.start + timedelta(hours=2)
+                ).isoformat(),
+                **params,
+            },
+        )
+
+    def test_returns_itineraries_with_their_legs(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                [leg["id"] for leg in itinerary["legs"]]
+                for itinerary in response.data
+            ],
+            [[self.first_leg.id, self.second_leg.id], [self.direct.id]],
+        )
+        self.assertEqual(response.data[0]["connections"], 1)
+        self.assertEqual(response.data[0]["distance"], 600)
+
+    def test_skips_itineraries_without_enough_seats(self):
+        self.assertEqual(self.get(passengers=3).data, [])
+
+    def test_rejects_the_same_source_and_destination(self):
+        response = self.get(destination=self.kyiv.id)
+
+        self.assertEqual(response.status_code, 400)
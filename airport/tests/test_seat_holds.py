@@ -0,0 +1,95 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from airport.models import Order, SeatHold
+from airport.tests.factories import create_flight, create_user
+
+
+class SeatHoldTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.other_user = create_user("other@example.com")
+        self.flight = create_flight()
+        self.client.force_authenticate(self.user)
+
+    def hold(self, *seats):
+        return self.client.post(
+            reverse("airports:seat-hold-list"),
+            {
+                "flight": self.flight.id,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+            },
+            format="json",
+        )
+
+    def checkout(self):
+        return self.client.post(
+            reverse("airports:seat-hold-checkout"),
+            {"flight": self.flight.id},
+            format="json",
+        )
+
+    def taken_seats(self):
+        response = self.client.get(
+            reverse("airports:flight-detail", args=[self.flight.id])
+        )
+        return [tuple(seat) for seat in response.data["taken_seats"]]
+
+    def test_held_seats_count_as_taken(self):
+        response = self.hold((1, 1), (1, 2))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.taken_seats(), [(1, 1), (1, 2)])
+
+    def test_seat_held_by_someone_else_conflicts(self):
+        self.hold((1, 1))
+        self.client.force_authenticate(self.other_user)
+
+        response = self.hold((1, 2), (1, 1))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(SeatHold.objects.filter(row=1, seat=2).exists())
+
+    def test_expired_holds_free_their_seats(self):
+        self.hold((1, 1))
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(1))
+        self.assertEqual(self.taken_seats(), [])
+
+        self.client.force_authenticate(self.other_user)
+        self.assertEqual(self.hold((1, 1)).status_code, 201)
+
+    def test_sweeps_expired_holds(self):
+        self.hold((1, 1), (1, 2))
+        SeatHold.objects.filter(seat=1).update(
+            expires_at=timezone.now() - timedelta(1)
+        )
+
+        call_command("expire_seat_holds", stdout=StringIO())
+
+        self.assertEqual(
+            list(SeatHold.objects.values_list("row", "seat")), [(1, 2)]
+        )
+
+    def test_checkout_books_the_held_seats(self):
+        self.hold((1, 1), (2, 3))
+
+        response = self.checkout()
+
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(
+            sorted(order.tickets.values_list("row", "seat")),
+            [(1, 1), (2, 3)],
+        )
+        self.assertEqual(self.taken_seats(), [(1, 1), (2, 3)])
+
+    def test_checkout_without_holds_is_rejected(self):
+        response = self.checkout()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,102 @@
+import base64
+from datetime import timedelta
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from airport.models import Airplane, Order, SeatHold, Ticket
+from airport.seatmap import build_seat_bitmap
+from airport.tests.factories import create_flight, create_user
+
+
+class BuildSeatBitmapTests(SimpleTestCase):
+    def test_sets_one_bit_per_taken_seat_row_by_row(self):
+        bitmap = build_seat_bitmap(2, 3, [(1, 1), (2, 3)])
+
+        self.assertEqual(bitmap, bytes([0b10000100]))
+
+    def test_skips_seats_outside_the_layout(self):
+        bitmap = build_seat_bitmap(2, 3, [(1, 1), (3, 1), (1, 4), (0, 1)])
+
+        self.assertEqual(bitmap, bytes([0b10000000]))
+
+
+class SeatmapViewTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.flight = create_flight()
+        self.url = reverse("airports:flight-seatmap", args=[self.flight.id])
+        self.client.force_authenticate(self.user)
+
+    def book(self, row, seat):
+        Ticket.objects.create(
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+            row=row,
+            seat=seat,
+        )
+
+    def test_marks_sold_and_held_seats(self):
+        self.book(1, 1)
+        SeatHold.objects.create(
+            flight=self.flight,
+            user=self.user,
+            row=3,
+            seat=4,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rows"], 3)
+        self.assertEqual(response.data["seats_in_row"], 4)
+        self.assertEqual(
+            base64.b64decode(response.data["bitmap"]),
+            bytes([0b10000000, 0b00010000]),
+        )
+
+    def test_binary_encoding_returns_the_raw_bitmap(self):
+        self.book(1, 2)
+
+        response = self.client.get(self.url, {"encoding": "binary"})
+
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertEqual(response["X-Seatmap-Rows"], "3")
+        self.assertEqual(response.content, bytes([0b01000000, 0]))
+
+    def test_unchanged_seatmap_answers_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code,
+            304,
+        )
+        self.book(2, 2)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code,
+            200,
+        )
+
+    def test_seats_sold_before_the_airplane_shrank_are_ignored(self):
+        self.book(3, 4)
+        Airplane.objects.filter(pk=self.flight.airplane_id).update(rows=2)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(base64.b64decode(response.data["bitmap"]), bytes(1))
+
+    def test_unknown_flight_is_not_found(self):
+        response = self.client.get(
+            reverse("airports:flight-seatmap", args=[self.flight.id + 1])
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+SETTINGS_SCRIPT = """
+import json
+from airport_service_api import settings
+print(json.dumps({
+    "DEBUG": settings.DEBUG,
+    "ALLOWED_HOSTS": settings.ALLOWED_HOSTS,
+    "debug_toolbar": "debug_toolbar" in settings.INSTALLED_APPS,
+    "DATABASE": {
+        key: settings.DATABASES["default"][key]
+        for key in ("ENGINE", "CONN_MAX_AGE", "OPTIONS")
+        if key in settings.DATABASES["default"]
+    },
+}))
+"""
+
+
+def load_settings(**environ):
+    """Import the project settings in a fresh process with ``environ``."""
+
+    env = {
+        **os.environ,
+        "DJANGO_SECRET_KEY": "tests",
+        "DJANGO_DEBUG": "",
+        "DJANGO_ALLOWED_HOSTS": "",
+        "POSTGRES_DB": "",
+        **environ,
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", SETTINGS_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    return json.loads(result.stdout)
+
+
+class EnvironmentSettingsTests(SimpleTestCase):
+    def test_production_defaults(self):
+        loaded = load_settings(
+            DJANGO_ALLOWED_HOSTS=" api.example.com, localhost ,"
+        )
+
+        self.assertIs(loaded["DEBUG"], False)
+        self.assertFalse(loaded["debug_toolbar"])
+        self.assertEqual(
+            loaded["ALLOWED_HOSTS"], ["api.example.com", "localhost"]
+        )
+        self.assertEqual(
+            loaded["DATABASE"]["ENGINE"], "django.db.backends.sqlite3"
+        )
+
+    def test_debug_loads_the_toolbar(self):
+        loaded = load_settings(DJANGO_DEBUG="True")
+
+        self.assertIs(loaded["DEBUG"], True)
+        self.assertTrue(loaded["debug_toolbar"])
+
+    def test_postgres_pools_connections_when_sized(self):
+        database = load_settings(
+            POSTGRES_DB="airport", POSTGRES_POOL_MAX_SIZE="8"
+        )["DATABASE"]
+
+        self.assertEqual(database["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(database["OPTIONS"]["pool"]["max_size"], 8)
+
+    @override_settings(DEBUG=False, ALLOWED_HOSTS=["api.example.com"])
+    def test_rejects_hosts_not_allowed(self):
+        self.assertEqual(
+            self.client.get(
+                reverse("health"), HTTP_HOST="api.example.com"
+            ).status_code,
+            200,
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("health"), HTTP_HOST="evil.example.com"
+            ).status_code,
+            400,
+        )
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.tests.factories import create_user
+from airport.throttling import (
+    ScopedSlidingWindowThrottle,
+    SlidingWindowRateThrottle,
+)
+
+
+class SearchThrottleTests(APITestCase):
+    def setUp(self):
+        rates = mock.patch.dict(
+            SlidingWindowRateThrottle.THROTTLE_RATES, {"search": "2/min"}
+        )
+        rates.start()
+        self.addCleanup(rates.stop)
+        self.client.force_authenticate(create_user())
+
+    def autocomplete(self):
+        return self.client.get(
+            reverse("airports:airport-autocomplete"), {"q": "Ky"}
+        )
+
+    def test_rejects_requests_over_the_scope_rate(self):
+        self.assertEqual(
+            [self.autocomplete().status_code for _ in range(3)],
+            [200, 200, 429],
+        )
+
+        response = self.autocomplete()
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_counts_each_user_separately(self):
+        self.autocomplete()
+        self.autocomplete()
+        self.client.force_authenticate(create_user("other@example.com"))
+
+        self.assertEqual(self.autocomplete().status_code, 200)
+
+    def test_scope_only_limits_its_views(self):
+        for _ in range(3):
+            self.autocomplete()
+
+        response = self.client.get(reverse("airports:airport-list"))
+
+        self.assertEqual(response.status_code, 200)
+
+
+class SlidingWindowTests(SimpleTestCase):
+    def allow(self, throttle, at):
+        request = SimpleNamespace(
+            user=SimpleNamespace(is_authenticated=True, pk=1)
+        )
+        view = SimpleNamespace(throttle_scope="search")
+        with mock.patch.object(throttle, "timer", return_value=at):
+            return throttle.allow_request(request, view)
+
+    @mock.patch.dict(
+        SlidingWindowRateThrottle.THROTTLE_RATES, {"search": "4/min"}
+    )
+    def test_weights_the_previous_window_by_its_overlap(self):
+        throttle = ScopedSlidingWindowThrottle()
+        self.assertEqual(
+            [self.allow(throttle, 6000 + second) for second in range(5)],
+            [True] * 4 + [False],
+        )
+
+        # Half of the previous window's 5 requests still count.
+        self.assertTrue(self.allow(throttle, 6090))
+        self.assertFalse(self.allow(throttle, 6090))
+        # 4.5 drops to 4 once 6 more seconds of that window slide out.
+        self.assertEqual(throttle.wait(), 6)
@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from airport.models import Flight, FlightListing, Order, Ticket
+from airport.tests.factories import create_flight, create_user
+
+
+class TicketsSoldCounterTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.flight = create_flight()
+        self.order = Order.objects.create(user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def assert_tickets_sold(self, flight, count):
+        self.assertEqual(Flight.objects.get(pk=flight.pk).tickets_sold, count)
+        self.assertEqual(
+            FlightListing.objects.get(pk=flight.pk).tickets_sold, count
+        )
+
+    def test_saving_and_deleting_tickets_updates_the_counter(self):
+        ticket = Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=2
+        )
+        self.assert_tickets_sold(self.flight, 2)
+
+        ticket.delete()
+        self.assert_tickets_sold(self.flight, 1)
+
+    def test_moving_a_ticket_moves_its_count(self):
+        other_flight = create_flight(
+            route=self.flight.route, airplane=self.flight.airplane
+        )
+        ticket = Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+
+        ticket.flight = other_flight
+        ticket.save()
+
+        self.assert_tickets_sold(self.flight, 0)
+        self.assert_tickets_sold(other_flight, 1)
+
+    def test_flight_list_subtracts_tickets_sold_from_capacity(self):
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=2, seat=3
+        )
+
+        response = self.client.get(reverse("airports:flight-list"))
+
+        self.assertEqual(response.status_code, 200)
+        [flight] = response.data["results"]
+        self.assertEqual(flight["tickets_available"], 3 * 4 - 1)
+
+    def test_invalid_ticket_is_not_counted(self):
+        with self.assertRaises(ValidationError):
+            Ticket.objects.create(
+                flight=self.flight, order=self.order, row=4, seat=1
+            )
+
+        self.assert_tickets_sold(self.flight, 0)
+
+    def test_rebuild_flight_counters_repairs_drift(self):
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        Flight.objects.update(tickets_sold=7)
+        FlightListing.objects.update(tickets_sold=7)
+
+        call_command("rebuild_flight_counters", stdout=StringIO())
+
+        self.assert_tickets_sold(self.flight, 1)
@@ -0,0 +1,193 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocMemCounterStore:
+    """
+    Per-process counters, for development and tests.
+
+    Each worker enforces the limits on its own share of the traffic.
+    Expired counters are pruned every ``prune_every`` increments, so
+    memory stays bounded by the number of active clients.
+    """
+
+    def __init__(self, prune_every=1000):
+        self.prune_every = prune_every
+        self._counters = {}
+        self._increments = 0
+        self._lock = threading.Lock()
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+
+        with self._lock:
+            self._increments += 1
+            if self._increments % self.prune_every == 0:
+                self._counters = {
+                    counter_key: entry
+                    for counter_key, entry in self._counters.items()
+                    if entry[1] > now
+                }
+
+            value, expires_at = self._counters.get(key, (0, 0))
+            if expires_at <= now:
+                value, expires_at = 0, now + timeout
+            self._counters[key] = (value + 1, expires_at)
+
+            return value + 1
+
+    def get(self, key):
+        with self._lock:
+            value, expires_at = self._counters.get(key, (0, 0))
+
+        return value if expires_at > time.monotonic() else 0
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class DjangoCacheCounterStore:
+    """
+    Counters in a configured Django cache shared by all workers, e.g.
+    Redis, incremented with the backend's atomic ``incr``.
+    """
+
+    def __init__(self, alias="default"):
+        self.cache = caches[alias]
+
+    def incr(self, key, timeout):
+        if self.cache.add(key, 1, timeout):
+            return 1
+
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def clear(self):
+        self.cache.clear()
+
+
+_throttle_store = None
+
+
+def get_throttle_store():
+    global _throttle_store
+
+    if _throttle_store is None:
+        config = settings.THROTTLE_STORE
+        _throttle_store = import_string(config["BACKEND"])(
+            **config.get("OPTIONS", {})
+        )
+
+    return _throttle_store
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window counter throttle.
+
+    Instead of DRF's list of request timestamps, every client has one
+    counter per fixed window in the shared store. The request rate is
+    estimated from the current window's count plus the previous window's
+    count weighted by how much of it still overlaps the sliding window.
+    That is two keys per client whatever the rate, and one atomic
+    increment plus one read per request. Rejected requests are counted
+    too, so clients that keep hammering stay throttled.
+    """
+
+    def __init__(self):
+        # The rate is resolved in allow_request() once the view is known.
+        pass
+
+    def get_scope(self, view):
+        return self.scope
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(view)
+        if self.scope is None:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        store = get_throttle_store()
+        now = self.timer()
+        window = int(now // self.duration)
+        self.elapsed = now - window * self.duration
+
+        self.current = store.incr(
+            f"{self.key}:{window}", timeout=self.duration * 2
+        )
+        self.previous = store.get(f"{self.key}:{window - 1}")
+
+        return self.estimate(self.elapsed) <= self.num_requests
+
+    def estimate(self, elapsed):
+        overlap = (self.duration - elapsed) / self.duration
+        return self.previous * overlap + self.current
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current > self.num_requests or not self.previous:
+            return remaining
+
+        # Time until the previous window's weight drops enough.
+        excess = self.estimate(self.elapsed) - self.num_requests
+        return min(remaining, excess * self.duration / self.previous)
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle):
+    scope = "anon"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle):
+    scope = "user"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class ScopedSlidingWindowThrottle(UserSlidingWindowThrottle):
+    """
+    Extra limit for views or viewset actions naming a scope, through
+    ``throttle_scope`` or ``throttle_scopes = {"<action>": "<scope>"}``.
+    Each scope is tuned in ``DEFAULT_THROTTLE_RATES`` separately from
+    the global ``anon`` and ``user`` rates.
+    """
+
+    def get_scope(self, view):
+        scopes = getattr(view, "throttle_scopes", {})
+        action = getattr(view, "action", None)
+
+        return scopes.get(action, getattr(view, "throttle_scope", None))
@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from airport import async_views
 from airport.views import (
     AirportViewSet,
     RouteViewSet,
@@ -10,6 +11,8 @@ from airport.views import (
     FlightViewSet,
     OrderViewSet,
     TicketViewSet,
+    SeatHoldViewSet,
+    ResponseCacheStatsView,
 )
 
 router = DefaultRouter()
@@ -24,7 +27,40 @@ router.register(r"crews", CrewViewSet, basename="crew")
 router.register(r"flights", FlightViewSet, basename="flight")
 router.register(r"orders", OrderViewSet, basename="order")
 router.register(r"tickets", TicketViewSet, basename="ticket")
+router.register(r"holds", SeatHoldViewSet, basename="seat-hold")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path(
+        "cache/stats/",
+        ResponseCacheStatsView.as_view(),
+        name="response-cache-stats",
+    ),
+    path(
+        "async/flights/",
+        async_views.flight_list,
+        name="async-flight-list",
+    ),
+    path(
+        "async/flights/search/",
+        async_views.flight_search,
+        name="async-flight-search",
+    ),
+    path(
+        "async/flights/<int:pk>/",
+        async_views.flight_detail,
+        name="async-flight-detail",
+    ),
+    path(
+        "async/flights/<int:pk>/seatmap/",
+        async_views.flight_seatmap,
+        name="async-flight-seatmap",
+    ),
+    path(
+        "async/airports/autocomplete/",
+        async_views.airport_autocomplete,
+        name="async-airport-autocomplete",
+    ),
+]
 
 app_name = "airports"
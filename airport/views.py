@@ -1,10 +1,58 @@
+import hashlib
+import logging
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch, Q
+from django.db.utils import OperationalError
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.http import parse_etags
+from django.views import View
 from django_filters import rest_framework as filters
-from django.db.models import F, Count
-from rest_framework import viewsets, mixins
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
-from airport.filters import AirportFilter, OrderFilter, FlightFilter
+from airport.boards import get_board, get_time_bucket
+from airport.booking import checkout_holds
+from airport.bulk import BulkWriteMixin
+from airport.cache import CachedResponseMixin, get_response_cache
+from airport.conditional import ConditionalGetMixin
+from airport.metrics import request_metrics
+from airport.export import (
+    FLIGHT_EXPORT_COLUMNS,
+    MANIFEST_EXPORT_COLUMNS,
+    get_export_output,
+    streaming_export,
+)
+from airport.fast_serializers import (
+    FlightListingValuesSerializer,
+    FlightValuesSerializer,
+    OrderSummaryValuesSerializer,
+    OrderValuesSerializer,
+    RouteValuesSerializer,
+    ValuesListMixin,
+)
+from airport.filters import (
+    AirportFilter,
+    OrderFilter,
+    FlightFilter,
+    FlightListingFilter,
+)
+from airport.readiness import check_database, pending_migrations
+from airport.holds import active_holds, get_taken_seats, place_holds
+from airport.pagination import (
+    FlightKeysetPagination,
+    KeysetPaginationMixin,
+    OrderKeysetPagination,
+)
 from airport.models import (
     Airport,
     Route,
@@ -12,8 +60,10 @@ from airport.models import (
     Airplane,
     Crew,
     Flight,
+    FlightListing,
     Order,
     Ticket,
+    SeatHold,
 )
 from airport.schemas.airport_schemas import (
     airplane_type_schema,
@@ -22,9 +72,15 @@ from airport.schemas.airport_schemas import (
     flight_schema,
     order_schema,
     ticket_schema,
+    seat_hold_schema,
     airport_schema,
     route_schema,
 )
+from airport.seatmap import (
+    build_seat_bitmap,
+    encode_seat_bitmap,
+    seat_bitmap_etag,
+)
 from airport.serializers import (
     AirportSerializer,
     RouteSerializer,
@@ -41,19 +97,225 @@ from airport.serializers import (
     FlightListSerializer,
     FlightRetrieveSerializer,
     OrderListSerializer,
+    FlightSearchSerializer,
+    ItinerarySerializer,
+    CrewBulkSerializer,
+    FlightBulkSerializer,
+    SeatHoldSerializer,
+    SeatHoldCreateSerializer,
+    SeatHoldCheckoutSerializer,
+    AirportBoardSerializer,
 )
+from airport.route_graph import route_graph
+from airport.throttling import ScopedSlidingWindowThrottle
+
+logger = logging.getLogger(__name__)
+
+
+def airport_suggestions(query_params):
+    prefix = query_params.get("q", "").strip()
+    try:
+        limit = min(int(query_params.get("limit", 10)), 50)
+    except ValueError:
+        limit = 10
+
+    if not prefix or limit < 1:
+        return Airport.objects.none()
+
+    return (
+        Airport.objects.filter(
+            Q(name__istartswith=prefix)
+            | Q(closest_big_city__istartswith=prefix)
+        )
+        .order_by("name")
+        .values("id", "name", "closest_big_city")[:limit]
+    )
+
+
+SEARCH_SEAT_CHECKS = 5
+
+
+def search_itineraries(params):
+    """
+    Return the ``limit`` best itineraries with enough free seats on every
+    leg, and their flights. The route graph yields candidates best first;
+    they are checked against the database ``limit`` at a time, at most
+    ``SEARCH_SEAT_CHECKS`` times, so a search of mostly full flights
+    returns fewer itineraries rather than query on.
+    """
+
+    candidates = route_graph.search(
+        params["source"],
+        params["destination"],
+        params["departure_after"],
+        params["departure_before"],
+        max_connections=params["max_connections"],
+        min_connection=timedelta(minutes=params["min_connection_minutes"]),
+        max_connection=timedelta(hours=params["max_connection_hours"]),
+        ordering=params["ordering"],
+    )
+
+    def has_seats(leg):
+        return (
+            leg.id in flights
+            and flights[leg.id]["tickets_available"] >= params["passengers"]
+        )
+
+    itineraries, flights = [], {}
+    for _ in range(SEARCH_SEAT_CHECKS):
+        batch = list(islice(candidates, params["limit"]))
+        if not batch:
+            break
+
+        flights.update(
+            (flight["id"], flight)
+            for flight in itinerary_flights(batch).exclude(
+                id__in=flights.keys()
+            )
+        )
+        itineraries += [
+            itinerary
+            for itinerary in batch
+            if all(has_seats(leg) for leg in itinerary.legs)
+        ]
+        if len(itineraries) >= params["limit"]:
+            break
+
+    return itineraries[: params["limit"]], flights
+
+
+def itinerary_flights(itineraries):
+    return (
+        Flight.objects.filter(
+            id__in={
+                leg.id for itinerary in itineraries for leg in itinerary.legs
+            }
+        )
+        .with_tickets_available()
+        .values(
+            "id",
+            "tickets_available",
+            "route__source__name",
+            "route__destination__name",
+        )
+    )
+
+
+def serialize_itineraries(itineraries, flights):
+    def serialize_leg(leg):
+        flight = flights[leg.id]
+        return {
+            "id": leg.id,
+            "route": f"{flight['route__source__name']} - "
+            f"{flight['route__destination__name']}",
+            "departure_time": leg.departure_time,
+            "arrival_time": leg.arrival_time,
+            "tickets_available": flight["tickets_available"],
+        }
+
+    return ItinerarySerializer(
+        [
+            {
+                "legs": [serialize_leg(leg) for leg in itinerary.legs],
+                "connections": len(itinerary.legs) - 1,
+                "duration": itinerary.duration,
+                "distance": itinerary.distance,
+            }
+            for itinerary in itineraries
+        ],
+        many=True,
+    ).data
 
 
 @airport_schema
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet
+):
+    cache_resource = "airports"
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = AirportFilter
+    throttle_scopes = {
+        "autocomplete": "search",
+        "departures": "boards",
+        "arrivals": "boards",
+    }
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        return self.cached_response(self.suggest_airports, request)
+
+    def suggest_airports(self, request):
+        return Response(list(airport_suggestions(request.query_params)))
+
+    def board_response(self, request, pk, kind):
+        """
+        Serve a board without touching the database while it is cached,
+        with an ETag and a max-age running to the end of the bucket.
+        """
+
+        params = AirportBoardSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        try:
+            airport_id = int(pk)
+        except ValueError:
+            raise NotFound("No Airport matches the given query.")
+
+        entry, hit = get_board(
+            airport_id, kind, params.validated_data["hours"]
+        )
+        if entry is None:
+            raise NotFound("No Airport matches the given query.")
+
+        fingerprint = f"{request.accepted_renderer.format}|{entry['digest']}"
+        etag = hashlib.blake2b(fingerprint.encode(), digest_size=8)
+        headers = {
+            "ETag": f'W/"{etag.hexdigest()}"',
+            "Cache-Control": f"max-age={get_time_bucket()[1]}",
+            "X-Cache": "HIT" if hit else "MISS",
+        }
+
+        if self.is_not_modified(headers["ETag"], None):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+
+        return Response(entry["board"], headers=headers)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        throttle_classes=[ScopedSlidingWindowThrottle],
+    )
+    def departures(self, request, pk=None):
+        return self.board_response(request, pk, "departures")
+
+    @action(
+        detail=True,
+        methods=["get"],
+        throttle_classes=[ScopedSlidingWindowThrottle],
+    )
+    def arrivals(self, request, pk=None):
+        return self.board_response(request, pk, "arrivals")
 
 
 @route_schema
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
+    cache_resource = "routes"
+    values_serializer_class = RouteValuesSerializer
+    last_modified_fields = (
+        "updated_at",
+        "source__updated_at",
+        "destination__updated_at",
+    )
+
     def get_queryset(self):
         queryset = Route.objects.all()
 
@@ -72,13 +334,21 @@ class RouteViewSet(viewsets.ModelViewSet):
 
 
 @airplane_type_schema
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(
+    CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet
+):
+    cache_resource = "airplane_types"
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
 
 
 @airplane_schema
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(
+    CachedResponseMixin, ConditionalGetMixin, viewsets.ModelViewSet
+):
+    cache_resource = "airplanes"
+    last_modified_fields = ("updated_at", "airplane_type__updated_at")
+
     def get_queryset(self):
         queryset = Airplane.objects.all()
 
@@ -97,39 +367,111 @@ class AirplaneViewSet(viewsets.ModelViewSet):
 
 
 @crew_schema
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    BulkWriteMixin,
+    viewsets.ModelViewSet,
+):
+    cache_resource = "crews"
+    bulk_serializer_class = CrewBulkSerializer
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
 
 
 @flight_schema
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    ValuesListMixin,
+    BulkWriteMixin,
+    viewsets.ModelViewSet,
+):
     filter_backends = (filters.DjangoFilterBackend,)
-    filterset_class = FlightFilter
+    bulk_serializer_class = FlightBulkSerializer
+    keyset_pagination_class = FlightKeysetPagination
+    values_serializer_class = FlightValuesSerializer
+    flight_last_modified_fields = (
+        "updated_at",
+        "route__updated_at",
+        "route__source__updated_at",
+        "route__destination__updated_at",
+        "airplane__updated_at",
+        "airplane__airplane_type__updated_at",
+        # Crew edits rewrite the listings of upcoming flights.
+        "listing__updated_at",
+    )
+    throttle_scopes = {"search": "search"}
+    use_flight_listing = settings.FLIGHT_LISTING_READ_MODEL
+
+    def uses_flight_listing(self):
+        """
+        Serve the list, with its filters and both pagination modes, from
+        the ``FlightListing`` read model instead of joining six tables.
+        """
+
+        return self.use_flight_listing and self.action == "list"
+
+    @property
+    def filterset_class(self):
+        if self.uses_flight_listing():
+            return FlightListingFilter
+
+        return FlightFilter
+
+    def uses_values_serializer(self):
+        return self.uses_flight_listing() or super().uses_values_serializer()
+
+    def get_values_serializer_class(self):
+        if self.uses_flight_listing():
+            return FlightListingValuesSerializer
+
+        return super().get_values_serializer_class()
+
+    @property
+    def last_modified_fields(self):
+        # Listings are rewritten whenever any of the flight's rows change.
+        if self.uses_flight_listing():
+            return ("updated_at",)
+
+        return self.flight_last_modified_fields
+
+    def get_extra_validators(self):
+        """
+        Seats held or lapsing change ``tickets_available`` and the taken
+        seats without writing to flights or listings.
+        """
+
+        holds = active_holds()
+        if self.action == "retrieve":
+            holds = holds.filter(flight_id=self.kwargs["pk"])
+
+        return tuple(
+            holds.aggregate(
+                count=Count("pk"), latest=Max("created_at")
+            ).values()
+        )
 
     def get_queryset(self):
+        if self.uses_flight_listing():
+            return FlightListing.objects.with_tickets_available().order_by(
+                "pk"
+            )
+
         queryset = Flight.objects.all()
 
-        if self.action == "list":
-            queryset = queryset.prefetch_related(
-                "route__source",
-                "route__destination",
-                "airplane__airplane_type",
-                "crew",
-            ).annotate(
-                tickets_available=(
-                    F("airplane__rows") * F("airplane__seats_in_row")
-                    - Count("tickets")
-                )
-            )
-        if self.action == "retrieve":
+        if self.action in ["list", "retrieve"]:
             queryset = queryset.select_related(
                 "route__source",
                 "route__destination",
                 "airplane__airplane_type",
             ).prefetch_related(
-                "crew",
+                Prefetch("crew", queryset=Crew.objects.order_by("id"))
             )
+        if self.action in ["list", "export"]:
+            queryset = queryset.with_tickets_available()
+        if self.action == "seatmap":
+            queryset = queryset.select_related("airplane")
 
         return queryset
 
@@ -141,19 +483,157 @@ class FlightViewSet(viewsets.ModelViewSet):
 
         return FlightSerializer
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        params = FlightSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        itineraries, flights = search_itineraries(params)
+
+        return Response(serialize_itineraries(itineraries, flights))
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        output = get_export_output(request)
+        queryset = self.filter_queryset(self.get_queryset()).order_by(
+            "departure_time", "id"
+        )
+
+        return streaming_export(
+            request, queryset, FLIGHT_EXPORT_COLUMNS, output, "flights"
+        )
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAdminUser])
+    def manifest(self, request, pk=None):
+        output = get_export_output(request)
+        flight = self.get_object()
+
+        return streaming_export(
+            request,
+            flight.tickets.order_by("row", "seat"),
+            MANIFEST_EXPORT_COLUMNS,
+            output,
+            f"flight-{flight.id}-manifest",
+        )
+
+    @action(detail=True, methods=["get"])
+    def seatmap(self, request, pk=None):
+        flight = self.get_object()
+        airplane = flight.airplane
+        bitmap = build_seat_bitmap(
+            airplane.rows,
+            airplane.seats_in_row,
+            get_taken_seats(flight.id),
+        )
+        etag = seat_bitmap_etag(flight.id, bitmap)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+
+        if request.query_params.get("encoding") == "binary":
+            return HttpResponse(
+                bitmap,
+                content_type="application/octet-stream",
+                headers={
+                    **headers,
+                    "X-Seatmap-Rows": airplane.rows,
+                    "X-Seatmap-Seats-In-Row": airplane.seats_in_row,
+                },
+            )
+
+        return Response(
+            {
+                "flight": flight.id,
+                "rows": airplane.rows,
+                "seats_in_row": airplane.seats_in_row,
+                "encoding": "base64",
+                "bitmap": encode_seat_bitmap(bitmap),
+            },
+            headers=headers,
+        )
+
 
 @order_schema
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    ValuesListMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
+    permission_classes = (IsAuthenticated,)
+    keyset_pagination_class = OrderKeysetPagination
+    values_serializer_class = OrderValuesSerializer
+    # Orders never change once placed; their tickets' flights may.
+    last_modified_fields = ("created_at",)
+    throttle_scopes = {"create": "booking"}
+
+    def get_related_last_modified(self, queryset):
+        """
+        The latest listing update of the orders' flights, in a query of its
+        own so that the order aggregate does not join the tickets.
+        """
+
+        return tuple(
+            Ticket.objects.filter(order__in=queryset.order_by().values("pk"))
+            .aggregate(latest=Max("flight__listing__updated_at"))
+            .values()
+        )
+
     def get_queryset(self):
         if isinstance(self.request.user, AnonymousUser):
             return Order.objects.none()
 
-        return (
-            Order.objects.prefetch_related("tickets")
-            .filter(user=self.request.user, tickets__isnull=False)
-            .distinct()
+        queryset = Order.objects.filter(
+            Exists(Ticket.objects.filter(order=OuterRef("pk"))),
+            user_id=self.request.user.id,
         )
 
+        if self.action != "list":
+            return queryset.prefetch_related("tickets")
+        if not self.expands_tickets():
+            return queryset
+
+        return queryset.prefetch_related(
+            Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "flight__route__source",
+                    "flight__route__destination",
+                    "flight__airplane__airplane_type",
+                ),
+            ),
+            Prefetch(
+                "tickets__flight__crew",
+                queryset=Crew.objects.order_by("id"),
+            ),
+        )
+
+    def expands_tickets(self):
+        """
+        ``?expand=tickets`` lists orders with every ticket and its flight;
+        otherwise the list is the order summaries of
+        ``OrderSummaryValuesSerializer``.
+        """
+
+        expand = self.request.query_params.get("expand", "")
+        return "tickets" in expand.split(",")
+
+    def uses_values_serializer(self):
+        return not self.expands_tickets() or super().uses_values_serializer()
+
+    def get_values_serializer_class(self):
+        if not self.expands_tickets():
+            return OrderSummaryValuesSerializer
+
+        return super().get_values_serializer_class()
+
     def get_serializer_class(self):
         if self.action == "list":
             return OrderListSerializer
@@ -161,7 +641,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         return OrderSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
 
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = OrderFilter
@@ -169,16 +649,142 @@ class OrderViewSet(viewsets.ModelViewSet):
 
 @ticket_schema
 class TicketViewSet(
-    mixins.RetrieveModelMixin, mixins.ListModelMixin, GenericViewSet
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
 ):
+    last_modified_fields = ("order__created_at", "flight__listing__updated_at")
     serializer_class = TicketSerializer
 
     def get_queryset(self):
         if isinstance(self.request.user, AnonymousUser):
             return Ticket.objects.none()
 
-        queryset = Ticket.objects.select_related("flight", "order").filter(
-            order__user=self.request.user
+        return (
+            Ticket.objects.select_related(
+                "flight__route__source",
+                "flight__route__destination",
+                "flight__airplane__airplane_type",
+            )
+            .prefetch_related("flight__crew")
+            .filter(order__user_id=self.request.user.id)
         )
 
-        return queryset
+
+@seat_hold_schema
+class SeatHoldViewSet(
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    permission_classes = (IsAuthenticated,)
+    pagination_class = None
+    throttle_scopes = {"create": "booking", "checkout": "booking"}
+
+    def get_queryset(self):
+        if isinstance(self.request.user, AnonymousUser):
+            return SeatHold.objects.none()
+
+        return active_holds().filter(user_id=self.request.user.id)
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return SeatHoldCreateSerializer
+        if self.action == "checkout":
+            return SeatHoldCheckoutSerializer
+
+        return SeatHoldSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        holds = place_holds(request.user.id, **serializer.validated_data)
+
+        return Response(
+            SeatHoldSerializer(holds, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["post"])
+    def checkout(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = checkout_holds(
+            request.user.id, serializer.validated_data.get("flight")
+        )
+
+        return Response(
+            OrderSerializer(order).data, status=status.HTTP_201_CREATED
+        )
+
+
+class ResponseCacheStatsView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(get_response_cache().stats())
+
+
+class MetricsView(View):
+    """
+    Request metrics of this process in the Prometheus text format.
+
+    Scrapers have to send ``REQUEST_METRICS["TOKEN"]`` as
+    ``Authorization: Bearer <token>``; staff signed in to the admin
+    site may read it too. Without a token only staff get through.
+    """
+
+    def get(self, request):
+        token = settings.REQUEST_METRICS["TOKEN"]
+        has_token = token and constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        )
+        if not (has_token or request.user.is_staff):
+            return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+
+        return HttpResponse(
+            request_metrics.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+class HealthView(View):
+    """Liveness probe: the process serves requests. Touches no backend."""
+
+    def get(self, request):
+        return JsonResponse({"status": "ok"})
+
+
+class ReadinessView(View):
+    """
+    Readiness probe: the database accepts connections and every migration
+    is applied. Answers 503 with the failing check otherwise.
+    """
+
+    def get(self, request):
+        checks = {"database": "ok", "migrations": "ok"}
+
+        try:
+            check_database()
+            pending = pending_migrations()
+            if pending:
+                checks["migrations"] = f"{len(pending)} unapplied"
+        except OperationalError:
+            # The error names hosts and users; keep it out of the response.
+            logger.exception("Readiness check failed")
+            checks["database"] = "unavailable"
+            checks["migrations"] = "unknown"
+
+        ready = all(value == "ok" for value in checks.values())
+
+        return JsonResponse(
+            {"status": "ok" if ready else "unavailable", "checks": checks},
+            status=(
+                status.HTTP_200_OK
+                if ready
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+        )
@@ -27,9 +27,13 @@ load_dotenv()
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DJANGO_DEBUG", "False").lower() in ("1", "true", "yes")
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
 
 
 # Application definition
@@ -41,9 +45,9 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # 3rd party
     "rest_framework",
-    "debug_toolbar",
     "rest_framework_simplejwt",
     "drf_spectacular",
     "django_filters",
@@ -53,6 +57,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "airport.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,9 +65,14 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+# The debug toolbar keeps every SQL query of a request in memory and its
+# middleware is sync-only, so it is only loaded in development.
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "airport_service_api.urls"
 
 TEMPLATES = [
@@ -88,14 +98,19 @@ WSGI_APPLICATION = "airport_service_api.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-if DEBUG:
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
-        }
-    }
-else:
+# PostgreSQL is used when POSTGRES_DB is set, SQLite otherwise.
+#
+# Connections are either pooled (POSTGRES_POOL_MAX_SIZE > 0, psycopg's
+# pool shared by the threads of a worker; use it under ASGI, where every
+# request runs in a new thread) or kept open per thread for
+# POSTGRES_CONN_MAX_AGE seconds (WSGI workers). Set
+# POSTGRES_DISABLE_SERVER_SIDE_CURSORS when connecting through a
+# transaction-pooling PgBouncer, which cannot hold the cursors that
+# .iterator() opens.
+
+if os.getenv("POSTGRES_DB"):
+    POSTGRES_POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", 0))
+
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.postgresql",
@@ -104,6 +119,34 @@ else:
             "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
             "HOST": os.getenv("POSTGRES_HOST"),
             "PORT": os.getenv("POSTGRES_PORT"),
+            "CONN_MAX_AGE": (
+                0
+                if POSTGRES_POOL_MAX_SIZE
+                else int(os.getenv("POSTGRES_CONN_MAX_AGE", 60))
+            ),
+            "CONN_HEALTH_CHECKS": True,
+            "DISABLE_SERVER_SIDE_CURSORS": (
+                os.getenv("POSTGRES_DISABLE_SERVER_SIDE_CURSORS", "0") == "1"
+            ),
+            "OPTIONS": {
+                "connect_timeout": int(
+                    os.getenv("POSTGRES_CONNECT_TIMEOUT", 5)
+                ),
+            },
+        }
+    }
+
+    if POSTGRES_POOL_MAX_SIZE:
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 2)),
+            "max_size": POSTGRES_POOL_MAX_SIZE,
+            "timeout": int(os.getenv("POSTGRES_POOL_TIMEOUT", 10)),
+        }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
         }
     }
 
@@ -155,20 +198,72 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# Stateless JWT authentication trusts the user id and is_staff claims
+# signed into the access token instead of loading the user row on every
+# request. Set JWT_STATELESS_AUTHENTICATION=0 to load the user again,
+# e.g. to make deactivation take effect before access tokens expire.
+JWT_STATELESS_AUTHENTICATION = (
+    os.getenv("JWT_STATELESS_AUTHENTICATION", "1") == "1"
+)
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "airport.permissions.IsAdminOrIfAuthenticatedReadOnly"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        (
+            "rest_framework_simplejwt.authentication."
+            "JWTStatelessUserAuthentication"
+            if JWT_STATELESS_AUTHENTICATION
+            else "rest_framework_simplejwt.authentication.JWTAuthentication"
+        ),
     ],
     "DEFAULT_PAGINATION_CLASS": "airport.pagination.CustomPagination",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport.throttling.AnonSlidingWindowThrottle",
+        "airport.throttling.UserSlidingWindowThrottle",
+        "airport.throttling.ScopedSlidingWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "1000/day"},
+    # "booking" limits seat holds, checkouts and orders, "search" limits
+    # flight search and airport autocomplete, on top of anon and user.
+    # "boards" alone limits the airport departure and arrival boards,
+    # which displays poll all day long.
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.getenv("THROTTLE_RATE_ANON", "100/day"),
+        "user": os.getenv("THROTTLE_RATE_USER", "1000/day"),
+        "booking": os.getenv("THROTTLE_RATE_BOOKING", "30/min"),
+        "search": os.getenv("THROTTLE_RATE_SEARCH", "60/min"),
+        "boards": os.getenv("THROTTLE_RATE_BOARDS", "120/min"),
+    },
+}
+
+# Counters of the throttles above. The default keeps them per process;
+# use "airport.throttling.DjangoCacheCounterStore" with OPTIONS
+# {"alias": "<cache alias>"} to enforce the rates across all workers
+# through a Redis cache configured in CACHES.
+THROTTLE_STORE = {
+    "BACKEND": os.getenv(
+        "THROTTLE_STORE_BACKEND", "airport.throttling.LocMemCounterStore"
+    ),
+    "OPTIONS": (
+        {"alias": os.environ["THROTTLE_STORE_CACHE_ALIAS"]}
+        if os.getenv("THROTTLE_STORE_CACHE_ALIAS")
+        else {}
+    ),
+}
+
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.ClaimsTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "user.authentication.ClaimsUser",
+}
+
+# Users loaded for the few endpoints that need the full model under
+# stateless authentication (/users/me/) are cached for TIMEOUT seconds.
+USER_CACHE = {
+    "ALIAS": os.getenv("USER_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.getenv("USER_CACHE_TIMEOUT", 60)),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -177,3 +272,94 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+
+# Seconds before the in-memory flight graph used by /flights/search/ is
+# rebuilt from the database, in a background thread; changes made in this
+# process apply at once. A search queues at most ROUTE_GRAPH_MAX_PATHS
+# partial itineraries.
+ROUTE_GRAPH_MAX_AGE = int(os.getenv("ROUTE_GRAPH_MAX_AGE", 300))
+ROUTE_GRAPH_MAX_PATHS = int(os.getenv("ROUTE_GRAPH_MAX_PATHS", 20000))
+
+# Cursor pagination, enabled per request with ?pagination=cursor on
+# flights, orders and tickets.
+KEYSET_PAGINATION = {
+    "PAGE_SIZE": int(os.getenv("KEYSET_PAGINATION_PAGE_SIZE", 100)),
+    "MAX_PAGE_SIZE": int(os.getenv("KEYSET_PAGINATION_MAX_PAGE_SIZE", 1000)),
+}
+
+# Rows fetched per round trip by the streaming flight export and
+# manifest endpoints; memory use is bounded by this, not the row count.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# Serve the flight list and its filters from the FlightListing read
+# model, one flattened row per flight kept up to date on writes. Set
+# FLIGHT_LISTING_READ_MODEL=0 to join the source tables instead.
+FLIGHT_LISTING_READ_MODEL = os.getenv("FLIGHT_LISTING_READ_MODEL", "1") == "1"
+
+# Airport departure and arrival boards cover HOURS (up to MAX_HOURS)
+# from the start of the current BUCKET_SECONDS time bucket and are
+# cached for the rest of the bucket, or until a flight of the airport
+# changes.
+AIRPORT_BOARDS = {
+    "BUCKET_SECONDS": int(os.getenv("AIRPORT_BOARDS_BUCKET_SECONDS", 30)),
+    "HOURS": int(os.getenv("AIRPORT_BOARDS_HOURS", 6)),
+    "MAX_HOURS": int(os.getenv("AIRPORT_BOARDS_MAX_HOURS", 48)),
+}
+
+# Largest list accepted by the flights/bulk/ and crews/bulk/ endpoints.
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 1000))
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# "shared" is seen by every worker process of the host: files by default,
+# or e.g. SHARED_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# with SHARED_CACHE_LOCATION=redis://redis:6379/0 across hosts.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": os.getenv(
+            "SHARED_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "SHARED_CACHE_LOCATION", "/tmp/airport_service_api_cache"
+        ),
+    },
+}
+
+# Response cache of the reference endpoints (airports, routes, airplane
+# types, airplanes, crews). Entries are kept in each worker; with more
+# than one worker (WEB_CONCURRENCY) their versions are kept in the
+# "shared" cache, so a write invalidates the entries of every worker.
+# Use "airport.cache.DjangoCacheBackend" with OPTIONS {"alias": "shared"}
+# to share the entries too.
+RESPONSE_CACHE = {
+    "BACKEND": os.getenv(
+        "RESPONSE_CACHE_BACKEND", "airport.cache.LocMemLRUBackend"
+    ),
+    "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60)),
+    "OPTIONS": {},
+}
+if RESPONSE_CACHE["BACKEND"] == "airport.cache.DjangoCacheBackend":
+    RESPONSE_CACHE["OPTIONS"] = {"alias": "shared"}
+elif WEB_CONCURRENCY > 1:
+    RESPONSE_CACHE["OPTIONS"] = {"versions_alias": "shared"}
+
+# Per-request instrumentation: query count, SQL, serialization and render
+# time and response size, sent as Server-Timing headers and aggregated
+# per view at /metrics/. Scrapers send METRICS_TOKEN as "Authorization:
+# Bearer <token>"; without it only staff can read /metrics/.
+REQUEST_METRICS = {
+    "SERVER_TIMING": os.getenv("REQUEST_METRICS_SERVER_TIMING", "1") == "1",
+    "TOKEN": os.getenv("METRICS_TOKEN", ""),
+}
+
+# Seat holds placed through /holds/: seconds a hold lasts and how many
+# seats one user may hold on a flight at a time. Expired holds stop
+# counting at once and are deleted by the expire_seat_holds command.
+SEAT_HOLDS = {
+    "TTL": int(os.getenv("SEAT_HOLD_TTL", 600)),
+    "MAX_SEATS": int(os.getenv("SEAT_HOLD_MAX_SEATS", 10)),
+}
@@ -0,0 +1,14 @@
+import os
+
+# The test run needs no real secret; everything else comes from the
+# environment as in production.
+os.environ.setdefault("DJANGO_SECRET_KEY", "tests")
+
+from airport_service_api.settings import *  # noqa: E402,F401,F403
+
+# Keep the shared cache inside the test process, and hash passwords fast.
+CACHES["shared"] = {  # noqa: F405
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "shared",
+}
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
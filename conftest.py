@@ -0,0 +1,26 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_process_state():
+    """
+    Drop what the API keeps in the process between requests (response
+    cache, throttle counters, Django caches, request metrics, the route
+    graph), so that each test only sees its own database.
+    """
+
+    from django.core.cache import caches
+
+    from airport.cache import get_response_cache
+    from airport.metrics import request_metrics
+    from airport.route_graph import route_graph
+    from airport.throttling import get_throttle_store
+
+    yield
+
+    get_response_cache().clear()
+    get_throttle_store().clear()
+    for cache in caches.all():
+        cache.clear()
+    request_metrics.clear()
+    route_graph.clear()
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+
+
+def user_cache_key(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    Load a user row, keeping it in the ``USER_CACHE`` cache for
+    ``USER_CACHE["TIMEOUT"]`` seconds. Saving or deleting the user drops
+    the entry.
+    """
+
+    cache = caches[settings.USER_CACHE["ALIAS"]]
+    user = cache.get(user_cache_key(user_id))
+
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(
+                user_cache_key(user_id), user, settings.USER_CACHE["TIMEOUT"]
+            )
+
+    return user
+
+
+def invalidate_cached_user(user_id):
+    caches[settings.USER_CACHE["ALIAS"]].delete(user_cache_key(user_id))
+
+
+def get_full_user(user, fresh: bool = False):
+    """
+    The ``user.User`` instance behind ``request.user``: returned as is
+    when authentication already loaded it, otherwise read from the user
+    cache, or from the database when ``fresh`` (before updating it).
+    """
+
+    if isinstance(user, get_user_model()):
+        return user
+    if fresh:
+        return get_user_model().objects.filter(pk=user.id).first()
+
+    return get_cached_user(user.id)
+
+
+class ClaimsUser(TokenUser):
+    """
+    ``request.user`` of stateless JWT authentication: the id and
+    ``is_staff`` come from the signed access token claims. Tokens issued
+    before the claim existed fall back to the cached user row.
+    """
+
+    @cached_property
+    def is_staff(self) -> bool:
+        if "is_staff" in self.token:
+            return self.token["is_staff"]
+
+        user = get_cached_user(self.id)
+        return bool(user and user.is_staff)
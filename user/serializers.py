@@ -1,5 +1,12 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -25,3 +32,47 @@ class UserSerializer(serializers.ModelSerializer):
 
         return user
 
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Sign ``is_staff`` into the tokens for stateless authentication."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["is_staff"] = user.is_staff
+
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-read ``is_staff`` when refreshing, so that role changes and
+    deactivation take effect within one access token lifetime instead of
+    lasting as long as the refresh token.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{
+                    api_settings.USER_ID_FIELD: access[
+                        api_settings.USER_ID_CLAIM
+                    ]
+                }
+            )
+            .values("is_active", "is_staff")
+            .first()
+        )
+        if user is None or not user["is_active"]:
+            raise AuthenticationFailed(
+                "User not found or inactive.", code="user_inactive"
+            )
+
+        access["is_staff"] = user["is_staff"]
+        data["access"] = str(access)
+
+        return data
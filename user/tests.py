@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+PASSWORD = "password"
+
+
+class JWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password=PASSWORD
+        )
+
+    def obtain_tokens(self):
+        response = self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": self.user.email, "password": PASSWORD},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        return response.data
+
+    def refresh(self, tokens):
+        return self.client.post(
+            reverse("users:token_refresh"), {"refresh": tokens["refresh"]}
+        )
+
+    def authenticate(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_authenticates_from_claims_without_loading_the_user(self):
+        tokens = self.obtain_tokens()
+        self.assertIs(AccessToken(tokens["access"])["is_staff"], False)
+        self.authenticate(tokens["access"])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("airports:seat-hold-list"))
+
+        self.assertEqual(response.status_code, 200)
+        user_table = get_user_model()._meta.db_table
+        self.assertFalse(
+            [query for query in queries if user_table in query["sql"]]
+        )
+
+    def test_refresh_picks_up_role_changes(self):
+        tokens = self.obtain_tokens()
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.refresh(tokens)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(AccessToken(response.data["access"])["is_staff"], True)
+
+    def test_refresh_rejects_inactive_users(self):
+        tokens = self.obtain_tokens()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.refresh(tokens)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["detail"].code, "user_inactive")
+
+    def test_staff_endpoints_follow_the_claim(self):
+        self.authenticate(self.obtain_tokens()["access"])
+
+        response = self.client.get(reverse("airports:response-cache-stats"))
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ManageUserTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password=PASSWORD
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_reads_and_updates_the_current_user(self):
+        url = reverse("users:user_me")
+        self.assertEqual(self.client.get(url).data["email"], self.user.email)
+
+        response = self.client.patch(url, {"email": "new@example.com"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).data["email"], "new@example.com")
+
+    def test_requires_a_valid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+
+        response = self.client.get(reverse("users:user_me"))
+
+        self.assertEqual(response.status_code, 401)
@@ -1,8 +1,10 @@
+from django.http import Http404
 from rest_framework import generics
 from rest_framework.authtoken.views import ObtainAuthToken
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from rest_framework.settings import api_settings
 
+from user.authentication import get_full_user
 from user.schemas import user_schemas as schemas
 from user.serializers import UserSerializer
 
@@ -23,4 +25,10 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        user = get_full_user(
+            self.request.user, fresh=self.request.method not in SAFE_METHODS
+        )
+        if user is None:
+            raise Http404
+
+        return user